@@ -0,0 +1,210 @@
+"""
+Google Apps Script WebApp Asynchronous Fleet Sender (v2.0.0)
+Sends one reporting cycle for a whole fleet concurrently with a bounded
+number of in-flight requests per endpoint.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
+
+from telemetry_record import TelemetryBatch, TelemetryRecord
+from test_sender import GASTestSender
+
+
+class AsyncFleetSender(GASTestSender):
+    def __init__(self, webapp_url: str, max_in_flight: int = 8,
+                 endpoint_limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize asynchronous fleet sender
+
+        Apps Script caps simultaneous executions per script (about 30), so
+        raising max_in_flight beyond that only adds queueing on the backend.
+
+        Args:
+            webapp_url: Google Apps Script WebApp URL
+            max_in_flight: Default in-flight request limit per endpoint
+            endpoint_limits: Optional per-endpoint overrides {url: limit}
+        """
+        super().__init__(webapp_url)
+        self.max_in_flight = max_in_flight
+        self.endpoint_limits = dict(endpoint_limits or {})
+        self._executor = None
+        self._pool_limits = None
+        self._semaphores = {}
+
+    def _ensure_pool(self):
+        """
+        Size the worker pool and HTTP connection pool to the current limits
+        (kept across rounds so keep-alive connections are reused)
+        """
+        pool_limits = (self.max_in_flight, tuple(sorted(self.endpoint_limits.items())))
+        if self._executor is not None and self._pool_limits == pool_limits:
+            return
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+        pool_size = max([self.max_in_flight] + list(self.endpoint_limits.values()))
+        total_workers = self.max_in_flight + sum(self.endpoint_limits.values())
+
+        self.client.resize_pool(pool_size)
+
+        self._executor = ThreadPoolExecutor(max_workers=total_workers)
+        self._pool_limits = pool_limits
+
+    def _semaphore_for(self, url: str) -> asyncio.Semaphore:
+        """
+        Get the in-flight limiter for an endpoint (created inside the running loop)
+        """
+        if url not in self._semaphores:
+            limit = self.endpoint_limits.get(url, self.max_in_flight)
+            self._semaphores[url] = asyncio.Semaphore(limit)
+        return self._semaphores[url]
+
+    async def send_data_async(self, data: Union[Dict[str, Any], TelemetryRecord],
+                              url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send data without blocking the event loop
+
+        Args:
+            data: Data to send (a TelemetryRecord is converted once it may be sent,
+                  so only in-flight records exist as payload dicts)
+            url: Endpoint override (defaults to webapp_url)
+
+        Returns:
+            Response dictionary
+        """
+        url = url or self.webapp_url
+        loop = asyncio.get_running_loop()
+        async with self._semaphore_for(url):
+            if isinstance(data, TelemetryRecord):
+                data = data.to_wire()
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(self.post_data, data, url=url)
+            )
+
+    async def send_fleet(self, payloads: Union[List[Dict[str, Any]], TelemetryBatch],
+                         url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send all payloads concurrently and measure aggregate throughput
+
+        Args:
+            payloads: Telemetry payloads (same format as create_test_data) or a TelemetryBatch
+            url: Endpoint override (defaults to webapp_url)
+
+        Returns:
+            Summary dictionary with per-payload results and rows/sec
+        """
+        self._semaphores = {}
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(self.send_data_async(p, url) for p in payloads))
+        elapsed = time.perf_counter() - start_time
+
+        success_count = sum(1 for r in results if r.get("status") == "success")
+
+        return {
+            "results": list(results),
+            "total": len(payloads),
+            "success": success_count,
+            "failed": len(payloads) - success_count,
+            "elapsed": elapsed,
+            "rows_per_sec": success_count / elapsed if elapsed > 0 else 0.0,
+            "max_in_flight": self.endpoint_limits.get(url or self.webapp_url, self.max_in_flight)
+        }
+
+    def run_fleet_cycle(self, machine_ids: List[str]) -> Dict[str, Any]:
+        """
+        Send one reporting cycle (one record per machine)
+
+        Args:
+            machine_ids: List of machine IDs
+
+        Returns:
+            Summary dictionary from send_fleet
+        """
+        self._ensure_pool()
+        batch = TelemetryBatch()
+        for machine_id in machine_ids:
+            batch.append(self.create_machine_test_record(machine_id))
+        return asyncio.run(self.send_fleet(batch))
+
+    def test_fleet_send(self, machine_ids: List[str], rounds: int = 1):
+        """
+        Fleet send test with bounded concurrency
+
+        Args:
+            machine_ids: List of machine IDs
+            rounds: Number of reporting cycles
+        """
+        print(f"\n=== Fleet Send Test (Machines: {len(machine_ids)}, "
+              f"{rounds} rounds, max in-flight: {self.max_in_flight}) ===")
+
+        total_rows = 0
+        total_elapsed = 0.0
+
+        for i in range(rounds):
+            summary = self.run_fleet_cycle(machine_ids)
+            total_rows += summary["success"]
+            total_elapsed += summary["elapsed"]
+
+            print(f"Round {i+1}/{rounds}: {summary['success']}/{summary['total']} success, "
+                  f"{summary['elapsed']:.2f}s, {summary['rows_per_sec']:.1f} rows/sec")
+
+            for machine_id, result in zip(machine_ids, summary["results"]):
+                if result.get("status") != "success":
+                    print(f"  ✗ Machine {machine_id} send failed: {result.get('message')}")
+
+        print(f"\n=== Fleet Send Results ===")
+        print(f"Rows: {total_rows}/{len(machine_ids) * rounds}")
+        print(f"Elapsed: {total_elapsed:.2f}s")
+        print(f"Throughput: {total_rows / total_elapsed if total_elapsed > 0 else 0.0:.1f} rows/sec")
+
+    def test_concurrency_sweep(self, machine_ids: List[str], limits: Optional[List[int]] = None):
+        """
+        Measure rows/sec at increasing in-flight limits to find where the WebApp throttles
+
+        Args:
+            machine_ids: List of machine IDs
+            limits: In-flight limits to try
+        """
+        if limits is None:
+            limits = [1, 2, 4, 8, 16, 32]
+
+        print(f"\n=== Concurrency Sweep (Machines: {len(machine_ids)}) ===")
+        print(f"{'In-flight':>10} {'Success':>10} {'Elapsed(s)':>12} {'Rows/sec':>10}")
+
+        original_limit = self.max_in_flight
+        try:
+            for limit in limits:
+                self.max_in_flight = limit
+                summary = self.run_fleet_cycle(machine_ids)
+                success = f"{summary['success']}/{summary['total']}"
+                print(f"{limit:>10} {success:>10} {summary['elapsed']:>12.2f} {summary['rows_per_sec']:>10.1f}")
+        finally:
+            self.max_in_flight = original_limit
+
+    def close(self):
+        """
+        Release worker threads (pooled connections stay with the shared session)
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._pool_limits = None
+
+
+def fleet_machine_ids(count: int, start: int = 453) -> List[str]:
+    """
+    Generate sequential machine IDs (00453, 00454, ...)
+
+    Args:
+        count: Number of machines
+        start: First numeric ID
+
+    Returns:
+        List of machine IDs
+    """
+    return [f"{start + i:05d}" for i in range(count)]
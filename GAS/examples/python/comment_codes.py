@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Interned CMT Status Parser (v2.0.0)
+Turns CMT comment columns ("MODE:NORMAL,COMM:GOOD,GPS:LOCKED,...") into
+dictionary-encoded categorical columns: one integer code column per key,
+with keys and values interned in a shared vocabulary. Each distinct
+comment string is parsed once, so a whole track (or the cache's already
+dictionary-encoded comment column) is decoded in one pass, and filters
+such as ERROR:LOW_BAT or GPS:WEAK across the fleet are integer
+comparisons instead of string work.
+
+Parsing follows parseComment in vehicle-tracker/src/utils/export.ts:
+pairs are split on "," and ":", trimmed, keys are lower-cased, pairs
+without a key or value are ignored and a repeated key keeps its last value.
+
+Usage:
+    python3 comment_codes.py <GAS_WEBAPP_URL> --filter ERROR:LOW_BAT
+    python3 comment_codes.py --cache ./cache --filter GPS:WEAK
+
+    from comment_codes import CommentColumns
+    columns = CommentColumns.from_records(result["data"])
+    columns.where("ERROR", "LOW_BAT")   # row indices
+"""
+
+import argparse
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from telemetry_cache import StringColumn, TelemetryCache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; filters fall back to list comprehensions
+    np = None
+
+# Code of a key that is absent from a comment
+MISSING = -1
+
+
+def parse_comment(comment: Any) -> Dict[str, str]:
+    """
+    Parse one CMT string exactly like parseComment in export.ts
+
+    Returns:
+        {lower-cased key: value}
+    """
+    if not comment or not isinstance(comment, str):
+        return {}
+    status = {}
+    for pair in comment.split(","):
+        parts = [part.strip() for part in pair.strip().split(":")]
+        key = parts[0]
+        value = parts[1] if len(parts) > 1 else ""
+        if key and value:
+            status[key.lower()] = value
+    return status
+
+
+def parse_condition(condition: str) -> Tuple[str, str]:
+    """
+    Split a "KEY:VALUE" filter (e.g. "ERROR:LOW_BAT") into (key, value)
+    """
+    key, _, value = condition.partition(":")
+    key, value = key.strip(), value.strip()
+    if not key or not value:
+        raise ValueError(f"Invalid condition (expected KEY:VALUE): {condition}")
+    return key, value
+
+
+class CommentVocabulary:
+    def __init__(self):
+        """
+        Interned keys and values shared by any number of comment columns
+
+        Keys are stored lower-cased (as parseComment returns them); values
+        keep their case. Parsed comment strings are memoized, so each
+        distinct comment is split only once.
+        """
+        self.keys: List[str] = []
+        self.values: List[str] = []
+        self._key_index: Dict[str, int] = {}
+        self._value_index: Dict[str, int] = {}
+        # comment string -> {key code: value code}
+        self._parsed: Dict[str, Dict[int, int]] = {}
+
+    @property
+    def distinct_comments(self) -> int:
+        """
+        Distinct comment strings parsed so far
+        """
+        return len(self._parsed)
+
+    def key_code(self, key: str, add: bool = False) -> Optional[int]:
+        """
+        Code of a key (case-insensitive), or None if unknown and add is False
+        """
+        key = key.lower()
+        code = self._key_index.get(key)
+        if code is None and add:
+            code = self._key_index[key] = len(self.keys)
+            self.keys.append(key)
+        return code
+
+    def value_code(self, value: str, add: bool = False) -> Optional[int]:
+        """
+        Code of a value, or None if unknown and add is False
+        """
+        code = self._value_index.get(value)
+        if code is None and add:
+            code = self._value_index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def parse(self, comment: Any) -> Dict[int, int]:
+        """
+        {key code: value code} of a comment (memoized; do not modify the result)
+        """
+        key = comment if isinstance(comment, str) else ""
+        codes = self._parsed.get(key)
+        if codes is None:
+            codes = {self.key_code(k, add=True): self.value_code(v, add=True)
+                     for k, v in parse_comment(key).items()}
+            self._parsed[key] = codes
+        return codes
+
+    def decode(self, codes: Dict[int, int]) -> Dict[str, str]:
+        """
+        {key: value} of a code mapping
+        """
+        return {self.keys[k]: self.values[v] for k, v in codes.items()}
+
+
+class CommentColumns:
+    def __init__(self, vocabulary: Optional[CommentVocabulary] = None):
+        """
+        Categorical columns parsed from one comment column
+
+        columns[key code] holds one value code per row (MISSING when the
+        row's comment has no such key).
+
+        Args:
+            vocabulary: Vocabulary to share with other columns (fleet-wide
+                filters need one shared vocabulary)
+        """
+        self.vocabulary = vocabulary or CommentVocabulary()
+        self.columns: Dict[int, array] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _extend_codes(self, rows: List[Dict[int, int]]):
+        # New keys start with MISSING for every earlier row
+        for codes in rows:
+            for key_code in codes:
+                if key_code not in self.columns:
+                    self.columns[key_code] = array("i", [MISSING]) * self.count
+        for key_code, column in self.columns.items():
+            column.extend([codes.get(key_code, MISSING) for codes in rows])
+        self.count += len(rows)
+
+    def append(self, comment: Any):
+        """
+        Append one comment
+        """
+        self._extend_codes([self.vocabulary.parse(comment)])
+
+    def extend(self, comments: Iterable[Any]):
+        """
+        Append comments (each distinct string is parsed once)
+        """
+        parse = self.vocabulary.parse
+        self._extend_codes([parse(comment) for comment in comments])
+
+    def extend_string_column(self, column: StringColumn):
+        """
+        Append an already dictionary-encoded comment column
+
+        Only the column's distinct values are parsed; rows are mapped
+        code to code without touching any string.
+        """
+        parsed = [self.vocabulary.parse(value) for value in column.values]
+        for codes in parsed:
+            for key_code in codes:
+                if key_code not in self.columns:
+                    self.columns[key_code] = array("i", [MISSING]) * self.count
+        for key_code, target in self.columns.items():
+            table = [codes.get(key_code, MISSING) for codes in parsed]
+            target.extend([table[c] for c in column.codes])
+        self.count += len(column.codes)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]],
+                     vocabulary: Optional[CommentVocabulary] = None) -> "CommentColumns":
+        """
+        Columns from read-schema data points (their "comment" field)
+        """
+        columns = cls(vocabulary)
+        columns.extend(record.get("comment") for record in records)
+        return columns
+
+    @classmethod
+    def from_string_column(cls, column: StringColumn,
+                           vocabulary: Optional[CommentVocabulary] = None) -> "CommentColumns":
+        """
+        Columns from a cache track's or TelemetryBatch's comment column
+        """
+        columns = cls(vocabulary)
+        columns.extend_string_column(column)
+        return columns
+
+    def column(self, key: str) -> array:
+        """
+        Value codes of a key (all MISSING if the key never occurs)
+        """
+        key_code = self.vocabulary.key_code(key)
+        if key_code is None or key_code not in self.columns:
+            return array("i", [MISSING]) * self.count
+        return self.columns[key_code]
+
+    def where(self, key: str, value: str) -> List[int]:
+        """
+        Row indices whose comment has key:value (e.g. "ERROR", "LOW_BAT")
+
+        Returns:
+            Ascending row indices (a NumPy array when NumPy is installed)
+        """
+        key_code = self.vocabulary.key_code(key)
+        value_code = self.vocabulary.value_code(value)
+        if key_code is None or value_code is None or key_code not in self.columns:
+            return np.empty(0, dtype=np.intp) if np is not None else []
+
+        column = self.columns[key_code]
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(column, dtype=np.intc) == value_code)
+        return [i for i, code in enumerate(column) if code == value_code]
+
+    def counts(self, key: str) -> Dict[str, int]:
+        """
+        {value: rows} for a key (rows without the key are not counted)
+        """
+        totals: Dict[int, int] = {}
+        for code in self.column(key):
+            if code != MISSING:
+                totals[code] = totals.get(code, 0) + 1
+        return {self.vocabulary.values[code]: n for code, n in totals.items()}
+
+    def row(self, i: int) -> Dict[str, str]:
+        """
+        {key: value} of row i, as parseComment would return it
+        """
+        vocabulary = self.vocabulary
+        return {vocabulary.keys[k]: vocabulary.values[column[i]]
+                for k, column in self.columns.items() if column[i] != MISSING}
+
+
+class FleetComments:
+    def __init__(self):
+        """
+        CommentColumns for every machine over one shared vocabulary
+        """
+        self.vocabulary = CommentVocabulary()
+        self.machines: Dict[str, CommentColumns] = {}
+
+    def machine(self, machine_id: str) -> CommentColumns:
+        """
+        A machine's columns (created empty on first access)
+        """
+        columns = self.machines.get(machine_id)
+        if columns is None:
+            columns = self.machines[machine_id] = CommentColumns(self.vocabulary)
+        return columns
+
+    def add_records(self, machine_id: str, records: Iterable[Dict[str, Any]]):
+        """
+        Append a machine's data points (a full history or a sinceRow delta)
+        """
+        self.machine(machine_id).extend(record.get("comment") for record in records)
+
+    def add_response(self, result: Dict[str, Any]):
+        """
+        Append a getMachine or getAllMachines response
+        """
+        if isinstance(result.get("data"), list):
+            self.add_records(result.get("machineId"), result["data"])
+            return
+        for machine in result.get("machines") or []:
+            self.add_records(machine["machineId"], machine.get("data", []))
+
+    def add_cache(self, cache: TelemetryCache):
+        """
+        Append every machine of a local telemetry cache (codes mapped directly)
+        """
+        for machine_id, track in cache.load_all().items():
+            self.machine(machine_id).extend_string_column(track.column("comment"))
+
+    def where(self, key: str, value: str) -> Dict[str, Any]:
+        """
+        {machine_id: row indices} of machines with at least one key:value row
+        """
+        result = {}
+        for machine_id, columns in self.machines.items():
+            rows = columns.where(key, value)
+            if len(rows):
+                result[machine_id] = rows
+        return result
+
+    def latest(self, key: str) -> Dict[str, Optional[str]]:
+        """
+        {machine_id: value of key in the machine's last row (None if absent)}
+        """
+        result = {}
+        for machine_id, columns in self.machines.items():
+            code = columns.column(key)[-1] if len(columns) else MISSING
+            result[machine_id] = None if code == MISSING else self.vocabulary.values[code]
+        return result
+
+
+def main():
+    import time
+
+    from gas_client import GASClient
+
+    parser = argparse.ArgumentParser(description="Fleet-wide CMT status columns and filters")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL (getAllMachines)")
+    parser.add_argument("--cache", help="Read comments from a local telemetry cache instead")
+    parser.add_argument("--filter", action="append", default=[],
+                        help="KEY:VALUE condition, e.g. ERROR:LOW_BAT (repeatable)")
+
+    args = parser.parse_args()
+    try:
+        conditions = [parse_condition(c) for c in args.filter]
+    except ValueError as e:
+        parser.error(str(e))
+
+    fleet = FleetComments()
+    start_time = time.perf_counter()
+    if args.cache:
+        fleet.add_cache(TelemetryCache(args.cache))
+    elif args.url:
+        result = GASClient(args.url, user_agent="GAS-Comment-Codes/1.0").get_json("getAllMachines")
+        if result.get("status") != "success":
+            print(f"failed: {result.get('message')}")
+            return
+        fleet.add_response(result)
+    else:
+        parser.error("url or --cache is required")
+    elapsed = time.perf_counter() - start_time
+
+    rows = sum(len(c) for c in fleet.machines.values())
+    print(f"Parsed {rows} comments from {len(fleet.machines)} machines in {elapsed * 1000:.1f}ms "
+          f"({fleet.vocabulary.distinct_comments} distinct strings)")
+
+    totals: Dict[str, Dict[str, int]] = {}
+    for columns in fleet.machines.values():
+        for key in fleet.vocabulary.keys:
+            for value, n in columns.counts(key).items():
+                totals.setdefault(key, {})
+                totals[key][value] = totals[key].get(value, 0) + n
+    for key, counts in totals.items():
+        print(f"  {key.upper():<10} " + "  ".join(f"{v}={n}" for v, n in sorted(counts.items(), key=lambda x: -x[1])))
+
+    for key, value in conditions:
+        start_time = time.perf_counter()
+        hits = fleet.where(key, value)
+        elapsed = time.perf_counter() - start_time
+        print(f"\n{key.upper()}:{value}: {sum(len(r) for r in hits.values())} rows "
+              f"on {len(hits)} machines ({elapsed * 1000:.2f}ms)")
+        for machine_id, machine_rows in hits.items():
+            print(f"  {machine_id:<12} {len(machine_rows):>7} rows (last at row {int(machine_rows[-1])})")
+
+
+if __name__ == "__main__":
+    main()
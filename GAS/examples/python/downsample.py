@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+LTTB Track Downsampling (v2.0.0)
+Reduces long tracks to a fixed point budget with Largest-Triangle-Three-
+Buckets, so sensor graphs and track polylines stay cheap to draw however
+long a mission runs. Each series (altitude, battery, satellites and the
+lat/lng track itself) picks its own visually important points, peaks
+included, and the union of those points is kept.
+
+Can be used directly on getter results or run as a local proxy in front
+of the WebApp that downsamples GET responses (?maxPoints=N).
+
+Usage:
+    python3 downsample.py <GAS_WEBAPP_URL> --port 8081 --max-points 2000
+    curl "http://127.0.0.1:8081/exec?action=getAllMachines&maxPoints=500"
+
+    from downsample import downsample_records
+    points = downsample_records(result["data"], max_points=2000)
+"""
+
+import argparse
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from gas_client import GASClient
+from telemetry_cache import parse_timestamp
+
+DEFAULT_SERIES = ("altitude", "battery", "satellites")
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> List[int]:
+    """
+    Indices kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previously kept
+    point and the average of the next bucket.
+
+    Args:
+        x: X values (time, or longitude for a track), in drawing order
+        y: Y values
+        threshold: Points to keep (all points are kept if len(x) <= threshold)
+
+    Returns:
+        Ascending indices into x / y
+    """
+    n = len(x)
+    if threshold >= n or n <= 2:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1]
+
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_count = avg_end - avg_start
+        avg_x = sum(x[avg_start:avg_end]) / avg_count
+        avg_y = sum(y[avg_start:avg_end]) / avg_count
+
+        ax, ay = x[a], y[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        max_area = -1.0
+        next_a = int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            # Twice the triangle area (the factor does not change the argmax)
+            area = abs(dx * (y[j] - ay) - (ax - x[j]) * dy)
+            if area > max_area:
+                max_area = area
+                next_a = j
+        indices.append(next_a)
+        a = next_a
+
+    indices.append(n - 1)
+    return indices
+
+
+def _numbers(records: List[Dict[str, Any]], key: str) -> List[float]:
+    values = []
+    for record in records:
+        value = record.get(key)
+        values.append(float(value) if isinstance(value, (int, float)) else 0.0)
+    return values
+
+
+def downsample_records(records: List[Dict[str, Any]], max_points: int = DEFAULT_MAX_POINTS,
+                       series: Sequence[str] = DEFAULT_SERIES, track: bool = True) -> List[Dict[str, Any]]:
+    """
+    Downsample read-schema data points to a point budget
+
+    The budget is split evenly between the series (and the lat/lng track),
+    each series runs LTTB over time, and the union of the kept points is
+    returned in the original order, so the result never exceeds max_points
+    (except for the minimum of 3 points per series).
+
+    Args:
+        records: Data points in time order (getMachine data)
+        max_points: Point budget
+        series: Numeric read-schema keys to preserve
+        track: Also preserve the lat/lng track shape
+
+    Returns:
+        Subset of records (the list itself if it is within budget)
+    """
+    n = len(records)
+    if n <= max_points:
+        return records
+
+    selectors = len(series) + (1 if track else 0)
+    per_selector = max(max_points // max(selectors, 1), 3)
+
+    x = [parse_timestamp(record.get("timestamp")) for record in records]
+    if any(math.isnan(t) for t in x):
+        x = [float(i) for i in range(n)]
+
+    keep = set()
+    for key in series:
+        keep.update(lttb_indices(x, _numbers(records, key), per_selector))
+    if track:
+        keep.update(lttb_indices(_numbers(records, "longitude"), _numbers(records, "latitude"), per_selector))
+
+    return [records[i] for i in sorted(keep)]
+
+
+def downsample_response(result: Dict[str, Any], max_points: int = DEFAULT_MAX_POINTS,
+                        **kwargs) -> Dict[str, Any]:
+    """
+    Downsample a getMachine or getAllMachines response in place
+
+    Downsampled machines get originalCount (and getMachine responses an
+    updated dataCount).
+
+    Args:
+        result: Response dictionary
+        max_points: Point budget per machine
+        **kwargs: Passed to downsample_records
+
+    Returns:
+        The same response dictionary
+    """
+    if result.get("status") != "success":
+        return result
+
+    if isinstance(result.get("data"), list):
+        original = len(result["data"])
+        result["data"] = downsample_records(result["data"], max_points, **kwargs)
+        if len(result["data"]) != original:
+            result["originalCount"] = original
+            result["dataCount"] = len(result["data"])
+
+    for machine in result.get("machines") or []:
+        if isinstance(machine.get("data"), list):
+            original = len(machine["data"])
+            machine["data"] = downsample_records(machine["data"], max_points, **kwargs)
+            if len(machine["data"]) != original:
+                machine["originalCount"] = original
+
+    return result
+
+
+class DownsampleProxyHandler(BaseHTTPRequestHandler):
+    server_version = "GASDownsampleProxy/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        try:
+            max_points = int(params.pop("maxPoints", server.max_points))
+        except ValueError:
+            self._send_json(200, {"status": "error", "message": "Invalid maxPoints"})
+            return
+
+        action = params.pop("action", None)
+        result = server.client.get_json(action, params)
+        if max_points > 0:
+            downsample_response(result, max_points)
+        self._send_json(200, result)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"")
+        except ValueError as e:
+            self._send_json(200, {"status": "error", "message": f"SyntaxError: {e}"})
+            return
+        self._send_json(200, self.server.client.post_json(payload))
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._send_cors_headers()
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_cors_headers(self):
+        # The dashboard calls the proxy from the browser
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Accept")
+
+    def _send_json(self, status_code: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self._send_cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class DownsampleProxy(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], webapp_url: str,
+                 max_points: int = DEFAULT_MAX_POINTS, verbose: bool = False):
+        """
+        Proxy that forwards requests to the WebApp and downsamples GET responses
+
+        Args:
+            address: (host, port); port 0 picks a free port
+            webapp_url: Google Apps Script WebApp URL
+            max_points: Default point budget per machine (0 = pass through)
+            verbose: Log every request
+        """
+        super().__init__(address, DownsampleProxyHandler)
+        self.client = GASClient(webapp_url, user_agent="GAS-Downsample-Proxy/1.0")
+        self.max_points = max_points
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/exec"
+
+
+def start_downsample_proxy(webapp_url: str, max_points: int = DEFAULT_MAX_POINTS,
+                           host: str = "127.0.0.1", port: int = 0) -> DownsampleProxy:
+    """
+    Start a downsampling proxy on a background thread
+
+    Returns:
+        Running proxy; use proxy.url as the WebApp URL and proxy.shutdown() to stop
+    """
+    proxy = DownsampleProxy((host, port), webapp_url, max_points)
+    thread = threading.Thread(target=proxy.serve_forever, daemon=True)
+    thread.start()
+    return proxy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Downsampling proxy in front of the GAS WebApp")
+    parser.add_argument("url", help="GAS WebApp URL")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8081, help="Bind port")
+    parser.add_argument("--max-points", type=int, default=DEFAULT_MAX_POINTS,
+                        help="Default point budget per machine (overridden by ?maxPoints=, 0 = pass through)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+
+    proxy = DownsampleProxy((args.host, args.port), args.url, args.max_points, args.verbose)
+
+    print("GAS Downsampling Proxy")
+    print("=" * 30)
+    print(f"URL: {proxy.url}")
+    print(f"Upstream: {args.url}")
+    print(f"Max points per machine: {args.max_points}")
+    print()
+
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        print("\nProxy stopped")
+    finally:
+        proxy.server_close()
+
+
+if __name__ == "__main__":
+    main()
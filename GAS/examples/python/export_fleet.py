@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Streaming Fleet Exporter (v2.0.0)
+Exports telemetry to CSV, JSON Lines or Parquet by streaming rows
+straight to the file: machines are read page by page (or from the local
+cache in chunks), so memory stays bounded however large the fleet is.
+CSV output has the same columns, order and formatting as exportToCSV in
+vehicle-tracker/src/utils/export.ts (Papa.unparse defaults).
+
+A single file is time-ordered across machines like
+exportAllMachinesToCSV (k-way merge, see fleet_merge.py); --split writes
+one file per machine, exported in parallel.
+
+Usage:
+    python3 export_fleet.py <GAS_WEBAPP_URL> all-machines-data.csv
+    python3 export_fleet.py <GAS_WEBAPP_URL> export/ --split --format jsonl --max-workers 8
+    python3 export_fleet.py --cache ./cache fleet.parquet
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from fleet_merge import iter_cache_track, merge_tracks
+from telemetry_cache import TelemetryCache, parse_timestamp
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only needed for Parquet output
+    pa = None
+    pq = None
+
+# exportToCSV column order
+COLUMNS = ("timestamp", "machineTime", "machineId", "dataType", "latitude", "longitude",
+           "altitude", "satellites", "battery", "comment")
+FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+DEFAULT_ROW_GROUP_SIZE = 65536
+
+# Papa.unparse quotes fields containing these (BAD_DELIMITERS plus the delimiter)
+_QUOTE_TRIGGERS = ("\r", "\n", '"', "\ufeff", "\x1e", "\x1f", ",")
+
+
+def js_string(value: Any) -> str:
+    """
+    String conversion as JavaScript's String() does for JSON values
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value == 0:
+            return "0"
+        # Both use the shortest round-trip digits; only the layout differs
+        text = repr(value)
+        if "e" in text:
+            mantissa, exponent = text.split("e")
+            exponent = int(exponent)
+            if -7 < exponent < 21:
+                return format(Decimal(text), "f")
+            return f"{mantissa}e{'+' if exponent > 0 else '-'}{abs(exponent)}"
+        return text[:-2] if text.endswith(".0") else text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return str(value)
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    number = _float_or_none(value)
+    if number is None or not math.isfinite(number):
+        return None
+    return int(number)
+
+
+def _string_or_none(value: Any) -> Optional[str]:
+    return None if value is None else js_string(value)
+
+
+# Parquet column coercion: sheet values and cached rows may hold "", "8.0" or 8.0
+_PARQUET_COERCE = {
+    "machineTime": _string_or_none,
+    "machineId": _string_or_none,
+    "dataType": _string_or_none,
+    "latitude": _float_or_none,
+    "longitude": _float_or_none,
+    "altitude": _float_or_none,
+    "satellites": _int_or_none,
+    "battery": _float_or_none,
+    "comment": _string_or_none,
+}
+
+
+def csv_field(value: Any) -> str:
+    """
+    One CSV field, quoted and escaped like Papa.unparse
+    """
+    text = js_string(value).replace('"', '""')
+    if text and (any(c in text for c in _QUOTE_TRIGGERS) or text[0] == " " or text[-1] == " "):
+        return f'"{text}"'
+    return text
+
+
+class CsvExportWriter:
+    def __init__(self, path: str):
+        """
+        CSV file with the exportToCSV header (rows joined by CRLF, no trailing newline)
+        """
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.file.write(",".join(csv_field(c) for c in COLUMNS))
+        self.rows = 0
+
+    def write(self, record: Dict[str, Any]):
+        self.file.write("\r\n" + ",".join([csv_field(record.get(c)) for c in COLUMNS]))
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesExportWriter:
+    def __init__(self, path: str):
+        """
+        One JSON object per line (each data point as returned by the WebApp)
+        """
+        self.file = open(path, "w", encoding="utf-8")
+        self.rows = 0
+
+    def write(self, record: Dict[str, Any]):
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.file.write("\n")
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetExportWriter:
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """
+        Parquet file with typed columns, written one row group at a time
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet export")
+        self.schema = pa.schema([
+            ("timestamp", pa.timestamp("ms", tz="UTC")),
+            ("machineTime", pa.string()),
+            ("machineId", pa.dictionary(pa.int32(), pa.string())),
+            ("dataType", pa.dictionary(pa.int32(), pa.string())),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("altitude", pa.float64()),
+            ("satellites", pa.int32()),
+            ("battery", pa.float64()),
+            ("comment", pa.dictionary(pa.int32(), pa.string())),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.row_group_size = row_group_size
+        self.buffer: Dict[str, List[Any]] = {c: [] for c in COLUMNS}
+        self.rows = 0
+
+    def write(self, record: Dict[str, Any]):
+        timestamp = parse_timestamp(record.get("timestamp"))
+        self.buffer["timestamp"].append(None if math.isnan(timestamp) else int(round(timestamp * 1000)))
+        for column in COLUMNS[1:]:
+            # Values that do not fit the column type are written as null
+            self.buffer[column].append(_PARQUET_COERCE[column](record.get(column)))
+        self.rows += 1
+        if len(self.buffer["timestamp"]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer["timestamp"]:
+            return
+        arrays = [pa.array(self.buffer[field.name], type=field.type) for field in self.schema]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.buffer = {c: [] for c in COLUMNS}
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def open_writer(path: str, fmt: str):
+    """
+    Writer for a format ("csv", "jsonl" or "parquet")
+    """
+    if fmt == "csv":
+        return CsvExportWriter(path)
+    if fmt == "jsonl":
+        return JsonLinesExportWriter(path)
+    if fmt == "parquet":
+        return ParquetExportWriter(path)
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def export_records(records: Iterable[Dict[str, Any]], path: str, fmt: str = "csv") -> int:
+    """
+    Stream records into a file
+
+    The file is written under a temporary name and renamed when complete,
+    so a failed export never leaves a truncated file behind.
+
+    Returns:
+        Rows written
+    """
+    partial = path + ".part"
+    writer = open_writer(partial, fmt)
+    try:
+        for record in records:
+            writer.write(record)
+    except BaseException:
+        writer.close()
+        os.remove(partial)
+        raise
+    writer.close()
+    os.replace(partial, path)
+    return writer.rows
+
+
+def export_fleet(streams: Dict[str, Iterable[Dict[str, Any]]], path: str, fmt: str = "csv",
+                 time_ordered: bool = True) -> int:
+    """
+    Export every machine into one file
+
+    Args:
+        streams: {machine_id: rows in time order}
+        path: Output file
+        fmt: "csv", "jsonl" or "parquet"
+        time_ordered: Merge machines by timestamp (like exportAllMachinesToCSV);
+            False writes machine after machine
+
+    Returns:
+        Rows written
+    """
+    if time_ordered:
+        records = merge_tracks(streams)
+    else:
+        records = (record for rows in streams.values() for record in rows)
+    return export_records(records, path, fmt)
+
+
+def export_split(open_stream: Callable[[str], Iterator[Dict[str, Any]]], machine_ids: List[str],
+                 directory: str, fmt: str = "csv", max_workers: int = 4) -> Dict[str, Any]:
+    """
+    Export one file per machine, machines in parallel
+
+    Args:
+        open_stream: Returns a machine's rows (called on a worker thread)
+        machine_ids: Machines to export
+        directory: Output directory (files are <machine_id><extension>)
+        fmt: "csv", "jsonl" or "parquet"
+        max_workers: Machines exported at the same time
+
+    Returns:
+        {machine_id: rows written, or the error message}
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    def export_one(machine_id: str):
+        path = os.path.join(directory, f"{machine_id}{FORMATS[fmt]}")
+        try:
+            return export_records(open_stream(machine_id), path, fmt)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(machine_ids, executor.map(export_one, machine_ids)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream fleet telemetry to CSV, JSON Lines or Parquet")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL")
+    parser.add_argument("output", help="Output file (or directory with --split)")
+    parser.add_argument("--cache", help="Export from a local telemetry cache instead of the WebApp")
+    parser.add_argument("--format", choices=sorted(FORMATS), help="Output format (default: from the file extension)")
+    parser.add_argument("--machines", help="Comma separated machine IDs (default: all)")
+    parser.add_argument("--split", action="store_true", help="One file per machine, exported in parallel")
+    parser.add_argument("--max-workers", type=int, default=4, help="Machines exported in parallel with --split")
+    parser.add_argument("--by-machine", action="store_true",
+                        help="Single file ordered machine by machine instead of by time")
+    parser.add_argument("--page-size", type=int, default=1000, help="Rows per getMachine page")
+
+    args = parser.parse_args()
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.output)[1].lower()
+        fmt = next((f for f, ext in FORMATS.items() if ext == extension), "csv")
+    if fmt == "parquet" and pa is None:
+        parser.error("pyarrow is required for Parquet export (pip install pyarrow)")
+
+    machine_ids = args.machines.split(",") if args.machines else None
+    if args.cache:
+        cache = TelemetryCache(args.cache)
+        machine_ids = machine_ids or cache.machine_ids()
+
+        def open_stream(machine_id: str) -> Iterator[Dict[str, Any]]:
+            # A fresh track per export so finished machines are not kept in memory
+            return iter_cache_track(cache.open_track(machine_id))
+    elif args.url:
+        from gas_client import GASClient
+        from machine_pages import MachinePages
+
+        client = GASClient(args.url, user_agent="GAS-Fleet-Exporter/1.0")
+        client.resize_pool(max(args.max_workers * 2, 10))
+        if machine_ids is None:
+            machine_list = client.get_json("getMachineList")
+            if machine_list.get("status") != "success":
+                print(f"failed: {machine_list.get('message')}")
+                return
+            machine_ids = [m["machineId"] for m in machine_list.get("machines", []) if m.get("dataCount")]
+
+        def open_stream(machine_id: str) -> Iterator[Dict[str, Any]]:
+            return iter(MachinePages(client, machine_id, args.page_size))
+    else:
+        parser.error("url or --cache is required")
+
+    start_time = time.perf_counter()
+    if args.split:
+        results = export_split(open_stream, machine_ids, args.output, fmt, args.max_workers)
+        for machine_id, rows in results.items():
+            print(f"  {machine_id:<12} {rows if isinstance(rows, int) else 'failed: ' + rows}")
+        total = sum(r for r in results.values() if isinstance(r, int))
+        print(f"\nExported {total} rows from {len(results)} machines to {args.output}/ "
+              f"({fmt}) in {time.perf_counter() - start_time:.2f}s")
+    else:
+        # Streams are lazy: each machine's first page is read when the merge starts
+        streams = {machine_id: open_stream(machine_id) for machine_id in machine_ids}
+        total = export_fleet(streams, args.output, fmt, time_ordered=not args.by_machine)
+        print(f"Exported {total} rows from {len(streams)} machines to {args.output} "
+              f"({fmt}) in {time.perf_counter() - start_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
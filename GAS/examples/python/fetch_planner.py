@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Adaptive Fleet Fetch Planner (v2.0.0)
+Fetches every machine's data either with one getAllMachines request or
+with getMachineList followed by concurrent getMachine requests, measures
+both, and keeps using whichever is faster for the current fleet size and
+history depth. The decision and timings are exposed for tuning the
+refresh cadence.
+
+Usage:
+    python3 fetch_planner.py <GAS_WEBAPP_URL> --rounds 10 --max-workers 8
+    python3 fetch_planner.py --local --machines 50 --rows 20000 --latency-ms 300 --per-row-us 20
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from gas_client import GASClient
+
+MONOLITHIC = "monolithic"
+FANOUT = "fanout"
+STRATEGIES = (MONOLITHIC, FANOUT)
+
+
+class FetchPlanner:
+    def __init__(self, client: GASClient, max_workers: int = 8, reprobe_every: int = 20,
+                 smoothing: float = 0.3, history_size: int = 100):
+        """
+        Initialize fetch planner
+
+        Timings are kept per (fleet size, history depth) bucket, both rounded
+        to powers of two, so a growing fleet is re-measured instead of being
+        served by a stale decision.
+
+        Args:
+            client: WebApp client
+            max_workers: Concurrent getMachine requests in fan-out mode
+            reprobe_every: Re-measure the slower strategy every N fetches (0 = never)
+            smoothing: Weight of the newest timing in the moving average
+            history_size: Decisions kept in history
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.reprobe_every = reprobe_every
+        self.smoothing = smoothing
+        self.timings: Dict[Tuple[int, int], Dict[str, float]] = {}
+        self.shape: Optional[Tuple[int, int]] = None
+        self.fetch_count = 0
+        self.last_decision: Optional[Dict[str, Any]] = None
+        self.history = deque(maxlen=history_size)
+
+    @staticmethod
+    def bucket(machines: int, rows: int) -> Tuple[int, int]:
+        """
+        Timing bucket for a fleet shape (powers of two)
+        """
+        return machines.bit_length(), rows.bit_length()
+
+    def choose(self) -> Tuple[str, str]:
+        """
+        Pick the strategy for the next fetch
+
+        Returns:
+            (strategy, reason)
+        """
+        if self.shape is None:
+            return MONOLITHIC, "no measurements yet"
+
+        timings = self.timings.get(self.bucket(*self.shape), {})
+        for strategy in STRATEGIES:
+            if strategy not in timings:
+                return strategy, "not measured for this fleet size yet"
+
+        best = min(STRATEGIES, key=lambda s: timings[s])
+        if self.reprobe_every and self.fetch_count % self.reprobe_every == 0:
+            other = FANOUT if best == MONOLITHIC else MONOLITHIC
+            return other, "periodic re-measurement"
+        return best, "faster on average"
+
+    def fetch(self, strategy: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch all machine data with the planned (or the given) strategy
+
+        Args:
+            strategy: Force MONOLITHIC or FANOUT instead of planning
+
+        Returns:
+            getAllMachines-shaped response (status, machines, totalMachines,
+            timestamp) with the decision under "plan"
+        """
+        if strategy is None:
+            strategy, reason = self.choose()
+        else:
+            reason = "forced"
+
+        start_time = time.perf_counter()
+        if strategy == MONOLITHIC:
+            result = self.fetch_monolithic()
+        else:
+            result = self.fetch_fanout()
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.fetch_count += 1
+
+        decision = {
+            "strategy": strategy,
+            "reason": reason,
+            "elapsedMs": round(elapsed_ms, 2),
+            "status": result.get("status"),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        if result.get("status") == "success":
+            machines = result.get("machines", [])
+            self.shape = (len(machines), sum(len(m.get("data", [])) for m in machines))
+            self._record(strategy, elapsed_ms)
+            decision["machines"], decision["rows"] = self.shape
+        decision["averagesMs"] = self.averages()
+
+        self.last_decision = decision
+        self.history.append(decision)
+        result["plan"] = decision
+        return result
+
+    def probe(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run both strategies back to back and record their timings
+
+        Returns:
+            {strategy: decision}
+        """
+        return {strategy: self.fetch(strategy)["plan"] for strategy in STRATEGIES}
+
+    def averages(self) -> Dict[str, float]:
+        """
+        Moving-average milliseconds per strategy for the current fleet shape
+        """
+        if self.shape is None:
+            return {}
+        timings = self.timings.get(self.bucket(*self.shape), {})
+        return {strategy: round(ms, 2) for strategy, ms in timings.items()}
+
+    def _record(self, strategy: str, elapsed_ms: float):
+        timings = self.timings.setdefault(self.bucket(*self.shape), {})
+        previous = timings.get(strategy)
+        if previous is None:
+            timings[strategy] = elapsed_ms
+        else:
+            timings[strategy] = previous + self.smoothing * (elapsed_ms - previous)
+
+    # ---- strategies ----------------------------------------------------
+
+    def fetch_monolithic(self) -> Dict[str, Any]:
+        """
+        One getAllMachines request
+        """
+        return self.client.get_json("getAllMachines")
+
+    def fetch_fanout(self) -> Dict[str, Any]:
+        """
+        getMachineList, then concurrent getMachine for machines that have data
+
+        Returns:
+            getAllMachines-shaped response (error if any request failed)
+        """
+        machine_list = self.client.get_json("getMachineList")
+        if machine_list.get("status") != "success":
+            return machine_list
+
+        machine_ids = [m["machineId"] for m in machine_list.get("machines", []) if m.get("dataCount")]
+        self.client.resize_pool(self.max_workers)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda machine_id: self.client.get_json("getMachine", {"machineId": machine_id}),
+                machine_ids
+            ))
+
+        machines = []
+        for machine_id, result in zip(machine_ids, results):
+            if result.get("status") != "success":
+                return {"status": "error", "message": f"getMachine {machine_id}: {result.get('message')}"}
+            if result.get("data"):
+                machines.append({
+                    "machineId": machine_id,
+                    "data": result["data"],
+                    "isActive": result.get("isActive")
+                })
+
+        return {
+            "status": "success",
+            "machines": machines,
+            "totalMachines": len(machines),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+
+
+def print_decision(decision: Dict[str, Any]):
+    """
+    Print one planner decision
+    """
+    averages = "  ".join(f"{s}: {ms:.0f}ms" for s, ms in decision.get("averagesMs", {}).items())
+    print(f"{decision['strategy']:<10} {decision['elapsedMs']:>9.1f}ms  "
+          f"machines={decision.get('machines')} rows={decision.get('rows')}  "
+          f"[{averages}]  ({decision['reason']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive getAllMachines vs fan-out fetch planner")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL")
+    parser.add_argument("--rounds", type=int, default=10, help="Fetches to run")
+    parser.add_argument("--max-workers", type=int, default=8, help="Concurrent getMachine requests")
+    parser.add_argument("--reprobe-every", type=int, default=20, help="Re-measure the slower strategy every N fetches")
+    parser.add_argument("--output", help="Save the decision history to this JSON file")
+    parser.add_argument("--local", action="store_true", help="Plan against a local stand-in server")
+    parser.add_argument("--machines", type=int, default=20, help="Machines seeded on the stand-in")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows seeded on the stand-in")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in fixed latency")
+    parser.add_argument("--per-row-us", type=float, default=0.0, help="Stand-in latency per row")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Stand-in simultaneous request limit")
+
+    args = parser.parse_args()
+
+    server = None
+    if args.local:
+        from async_sender import fleet_machine_ids
+        from latency_benchmark import LatencyBenchmark
+        from local_gas_server import LatencyModel, start_stand_in
+        server = start_stand_in(LatencyModel(args.latency_ms, 0.0, args.per_row_us),
+                                max_concurrent=args.max_concurrent)
+        args.url = server.url
+        LatencyBenchmark(GASClient(args.url)).seed_rows(args.rows, fleet_machine_ids(args.machines))
+    elif not args.url:
+        parser.error("url is required unless --local is given")
+
+    planner = FetchPlanner(GASClient(args.url, user_agent="GAS-Fetch-Planner/1.0"),
+                           max_workers=args.max_workers, reprobe_every=args.reprobe_every)
+
+    print("Adaptive Fetch Planner")
+    print("=" * 30)
+    print(f"Target: {args.url}\n")
+
+    try:
+        for _ in range(args.rounds):
+            print_decision(planner.fetch()["plan"])
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(list(planner.history), f, indent=2, ensure_ascii=False)
+            print(f"\nDecisions saved: {args.output}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
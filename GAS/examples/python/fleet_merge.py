@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+K-way Merge of Per-machine Streams (v2.0.0)
+Merges per-machine tracks, each already in time order (sheet rows are
+appended in GAS Time order), into one fleet-wide time-ordered stream
+with a heap of per-machine iterators: O(N log k) for N rows from k
+machines, holding only one pending row per machine. This replaces
+concatenating every track and re-sorting everything, as
+exportAllMachinesToCSV does in the dashboard.
+
+Rows with equal timestamps keep machine order, so the output matches a
+stable sort of the concatenated tracks.
+
+Usage:
+    python3 fleet_merge.py <GAS_WEBAPP_URL> --page-size 1000 --head 20
+    python3 fleet_merge.py --cache ./cache --head 20
+
+    from fleet_merge import merge_tracks
+    for record in merge_tracks({"00453": track_a, "00454": track_b}):
+        ...
+"""
+
+import argparse
+import heapq
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from telemetry_cache import MachineTrack, TelemetryCache, parse_timestamp
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class UnsortedTrackError(ValueError):
+    """Raised by merge_tracks(check=True) when a track goes back in time"""
+
+
+def timestamp_key(record: Dict[str, Any]) -> str:
+    """
+    Merge key for read-schema rows
+
+    The WebApp writes timestamps with toISOString (fixed width, UTC), so
+    comparing the strings orders them chronologically without parsing.
+    """
+    return record.get("timestamp") or ""
+
+
+def epoch_key(record: Dict[str, Any]) -> float:
+    """
+    Merge key for rows whose timestamps may mix formats (parsed to epoch seconds)
+    """
+    value = parse_timestamp(record.get("timestamp"))
+    return float("-inf") if value != value else value
+
+
+def _checked(machine_id: str, records: Iterable[Dict[str, Any]],
+             key: Callable[[Dict[str, Any]], Any]) -> Iterator[Dict[str, Any]]:
+    previous = None
+    for i, record in enumerate(records):
+        current = key(record)
+        if previous is not None and current < previous:
+            raise UnsortedTrackError(f"Track {machine_id} goes back in time at row {i}: {current} < {previous}")
+        previous = current
+        yield record
+
+
+def merge_tracks(tracks: Dict[str, Iterable[Dict[str, Any]]],
+                 key: Callable[[Dict[str, Any]], Any] = timestamp_key,
+                 check: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Merge time-ordered per-machine tracks into one time-ordered stream
+
+    Tracks are consumed lazily, so generators (pages, cache chunks) keep
+    memory bounded by one pending row per machine.
+
+    Args:
+        tracks: {machine_id: rows in time order} (lists or iterators)
+        key: Sort key of a row
+        check: Raise UnsortedTrackError if a track is not in order
+
+    Returns:
+        Iterator over all rows, ordered by key (ties in machine order)
+    """
+    if check:
+        streams = [_checked(machine_id, rows, key) for machine_id, rows in tracks.items()]
+    else:
+        streams = list(tracks.values())
+    return heapq.merge(*streams, key=key)
+
+
+def iter_cache_track(track: MachineTrack, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield a cached track's rows as read-schema records, chunk by chunk
+    """
+    count = len(track)
+    for start in range(0, count, chunk_size):
+        yield from track.to_records(start, min(start + chunk_size, count))
+
+
+def cache_streams(cache: TelemetryCache, machine_ids: Optional[List[str]] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Iterator[Dict[str, Any]]]:
+    """
+    {machine_id: lazy row iterator} for machines of a local cache
+    """
+    machine_ids = machine_ids if machine_ids is not None else cache.machine_ids()
+    return {machine_id: iter_cache_track(cache.track(machine_id), chunk_size) for machine_id in machine_ids}
+
+
+def page_streams(client, machine_ids: Optional[List[str]] = None,
+                 page_size: int = 1000, prefetch: int = 1) -> Dict[str, Iterator[Dict[str, Any]]]:
+    """
+    {machine_id: lazy row iterator} reading each machine page by page from the WebApp
+
+    Args:
+        client: GASClient
+        machine_ids: Machines to read (all machines from getMachineList by default)
+        page_size: Rows per getMachine page
+        prefetch: Pages requested ahead per machine
+    """
+    from machine_pages import MachinePages
+
+    if machine_ids is None:
+        machine_list = client.get_json("getMachineList")
+        if machine_list.get("status") != "success":
+            raise RuntimeError(f"getMachineList failed: {machine_list.get('message')}")
+        machine_ids = [m["machineId"] for m in machine_list.get("machines", []) if m.get("dataCount")]
+    return {machine_id: iter(MachinePages(client, machine_id, page_size, prefetch)) for machine_id in machine_ids}
+
+
+def main():
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Fleet-wide time-ordered stream (k-way merge)")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL")
+    parser.add_argument("--cache", help="Merge tracks from a local telemetry cache instead")
+    parser.add_argument("--machines", help="Comma separated machine IDs (default: all)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Rows per getMachine page")
+    parser.add_argument("--head", type=int, default=0, help="Print the first N merged rows as JSON lines")
+    parser.add_argument("--check", action="store_true", help="Fail if a track is not in time order")
+
+    args = parser.parse_args()
+    machine_ids = args.machines.split(",") if args.machines else None
+
+    if args.cache:
+        streams = cache_streams(TelemetryCache(args.cache), machine_ids)
+    elif args.url:
+        from gas_client import GASClient
+        streams = page_streams(GASClient(args.url, user_agent="GAS-Fleet-Merge/1.0"), machine_ids, args.page_size)
+    else:
+        parser.error("url or --cache is required")
+
+    start_time = time.perf_counter()
+    count = 0
+    first = last = None
+    try:
+        for record in merge_tracks(streams, check=args.check):
+            if count < args.head:
+                print(json.dumps(record, ensure_ascii=False))
+            if first is None:
+                first = record.get("timestamp")
+            last = record.get("timestamp")
+            count += 1
+    except UnsortedTrackError as e:
+        print(f"failed: {e}")
+        return
+
+    print(f"\nMerged {count} rows from {len(streams)} machines in {time.perf_counter() - start_time:.2f}s "
+          f"({first} .. {last})")
+
+
+if __name__ == "__main__":
+    main()
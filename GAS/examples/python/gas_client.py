@@ -0,0 +1,355 @@
+"""
+Shared HTTP Client for GAS WebApp Scripts (v2.0.0)
+All scripts share one pooled requests.Session per process, so TLS
+handshakes to script.google.com are paid once per process, not per record.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds; Apps Script executions can take up to ~30 s to answer
+DEFAULT_TIMEOUT = (5.0, 30.0)
+# Connections kept alive per host (WebApp POSTs redirect to script.googleusercontent.com)
+DEFAULT_POOL_SIZE = 16
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_USER_AGENT = "GAS-Telemetry-Client/2.0"
+# Acknowledged idempotency keys remembered per client
+DEFAULT_ACKED_KEYS = 4096
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request"""
+
+    def __init__(self, *args, timeout: Timeout = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_retry(retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR) -> Retry:
+    """
+    Build the retry policy for pooled connections
+
+    Connection failures are retried for every method (the request never
+    reached the WebApp). Read errors and 429/5xx responses are retried for
+    GET only, because a retried telemetry POST would append a duplicate row.
+
+    Args:
+        retries: Maximum retries per request
+        backoff_factor: Exponential backoff factor in seconds
+
+    Returns:
+        urllib3 Retry policy
+    """
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+        respect_retry_after_header=True
+    )
+
+
+def get_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Get the process-wide pooled session
+
+    The connection pool only grows: asking for a larger pool than the current
+    one remounts the adapters with the new size.
+
+    Args:
+        pool_size: Minimum number of keep-alive connections per host
+
+    Returns:
+        Shared requests.Session
+    """
+    global _session, _session_pool_size
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+
+        if pool_size > _session_pool_size:
+            adapter = TimeoutHTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=pool_size,
+                max_retries=build_retry()
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session_pool_size = pool_size
+
+        return _session
+
+
+def make_idempotency_key(machine_id: str, machine_time: str, sequence: int) -> str:
+    """
+    Build the idempotency key for one telemetry record
+
+    Args:
+        machine_id: MachineID
+        machine_time: MachineTime
+        sequence: Per-machine send sequence number
+
+    Returns:
+        Key "MachineID:MachineTime:sequence"
+    """
+    return f"{machine_id}:{machine_time}:{sequence}"
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 8.0):
+        """
+        Exponential backoff with full jitter for idempotent telemetry POSTs
+
+        Args:
+            max_attempts: Attempts including the first one
+            base_delay: Backoff before the first retry (seconds)
+            max_delay: Upper bound of a single backoff (seconds)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Seconds to wait after a failed attempt (0-based)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class AckedKeys:
+    def __init__(self, capacity: int = DEFAULT_ACKED_KEYS):
+        """
+        Bounded LRU of idempotency keys the WebApp has acknowledged
+
+        Args:
+            capacity: Keys kept before the least recently used is evicted
+        """
+        self.capacity = capacity
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def add(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.capacity:
+                self._results.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._results
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+
+class GASClient:
+    def __init__(self, webapp_url: str, user_agent: Optional[str] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: Optional[Timeout] = None):
+        """
+        Initialize WebApp client on top of the shared session
+
+        Args:
+            webapp_url: Google Apps Script WebApp URL
+            user_agent: User-Agent sent with this client's requests
+            pool_size: Minimum keep-alive connections per host
+            timeout: Default timeout for this client (connect, read)
+        """
+        self.webapp_url = webapp_url
+        self.session = get_session(pool_size)
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.headers = {"User-Agent": user_agent} if user_agent else {}
+        self.retry_policy = RetryPolicy()
+        self.acked_keys = AckedKeys()
+
+    def resize_pool(self, pool_size: int):
+        """
+        Grow the shared connection pool (e.g. before running concurrent requests)
+
+        Args:
+            pool_size: Minimum keep-alive connections per host
+        """
+        self.session = get_session(pool_size)
+
+    def get(self, action: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[Timeout] = None, url: Optional[str] = None,
+            **kwargs) -> requests.Response:
+        """
+        Send GET request for an action
+
+        Args:
+            action: WebApp action (getAllMachines, getMachine, ...)
+            params: Additional query parameters
+            timeout: Per-call timeout override
+            url: Endpoint override (defaults to webapp_url)
+
+        Returns:
+            HTTP response
+        """
+        query = {"action": action}
+        if params:
+            query.update(params)
+        return self.session.get(
+            url or self.webapp_url,
+            params=query,
+            headers=self.headers,
+            timeout=timeout or self.timeout,
+            **kwargs
+        )
+
+    def post(self, payload: Any, timeout: Optional[Timeout] = None,
+             url: Optional[str] = None, **kwargs) -> requests.Response:
+        """
+        Send JSON POST request
+
+        Args:
+            payload: JSON-serializable payload
+            timeout: Per-call timeout override
+            url: Endpoint override (defaults to webapp_url)
+
+        Returns:
+            HTTP response
+        """
+        return self.session.post(
+            url or self.webapp_url,
+            json=payload,
+            headers=self.headers,
+            timeout=timeout or self.timeout,
+            **kwargs
+        )
+
+    def get_json(self, action: str, params: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        """
+        GET an action and normalize the result to a response dictionary
+
+        Returns:
+            Parsed response, or {"status": "error", "message": ...}
+        """
+        return self._request_json(lambda: self.get(action, params, timeout))
+
+    def post_json(self, payload: Any, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        """
+        POST a payload and normalize the result to a response dictionary
+
+        Returns:
+            Parsed response, or {"status": "error", "message": ...}
+        """
+        return self._request_json(lambda: self.post(payload, timeout))
+
+    def post_idempotent(self, payload: Dict[str, Any], timeout: Optional[Timeout] = None,
+                        url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        POST a telemetry record carrying an IdempotencyKey, retrying with backoff
+
+        Timeouts, connection errors, 429/5xx responses and lock timeouts
+        (errors flagged retryable) are retried; the WebApp answers a retried
+        key with the original row instead of appending a duplicate. Keys
+        already acknowledged are answered from the local LRU without a request.
+
+        Args:
+            payload: Telemetry payload with "IdempotencyKey"
+            timeout: Per-attempt timeout override
+            url: Endpoint override (defaults to webapp_url)
+
+        Returns:
+            Parsed response, or {"status": "error", "message": ...}
+        """
+        key = payload.get("IdempotencyKey")
+        if key:
+            acked = self.acked_keys.get(key)
+            if acked is not None:
+                return dict(acked, duplicate=True)
+
+        policy = self.retry_policy
+        result = {"status": "error", "message": "No attempt made"}
+        for attempt in range(policy.max_attempts):
+            result = self._request_json(lambda: self.post(payload, timeout, url))
+            if not self._is_retryable(result):
+                break
+            if attempt + 1 < policy.max_attempts:
+                time.sleep(policy.backoff(attempt))
+
+        if key and result.get("status") == "success":
+            self.acked_keys.add(key, result)
+        return result
+
+    @staticmethod
+    def _is_retryable(result: Dict[str, Any]) -> bool:
+        """
+        Whether a normalized result is a transport failure worth retrying
+
+        A WebApp error flagged retryable (the sheet write lock was busy, so
+        nothing was written) is retried as well.
+        """
+        if result.get("status") != "error":
+            return False
+        if result.get("retryable") is True:
+            return True
+        message = result.get("message", "")
+        if message in ("Request timeout", "Connection error"):
+            return True
+        return any(message.startswith(f"HTTP {code}") for code in RETRY_STATUS_CODES)
+
+    @staticmethod
+    def _request_json(send) -> Dict[str, Any]:
+        try:
+            response = send()
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {
+                    "status": "error",
+                    "message": f"HTTP {response.status_code}: {response.text}"
+                }
+
+        except requests.exceptions.Timeout:
+            return {
+                "status": "error",
+                "message": "Request timeout"
+            }
+        except requests.exceptions.ConnectionError:
+            return {
+                "status": "error",
+                "message": "Connection error"
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"Unexpected error: {str(e)}"
+            }
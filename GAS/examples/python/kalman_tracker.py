@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Streaming Kalman Track Smoother (v2.0.0)
+Runs a constant-velocity Kalman filter per machine over fixes as they
+arrive, so smoothed positions, speed, heading and short-horizon
+predictions (with covariance) are always current without recomputing
+anything over the track. Each new fix costs O(1).
+
+Positions are filtered in metres on a local east/north plane anchored at
+each machine's first fix. The east and north axes are independent under
+this model, so each is a 2-state (position, velocity) filter.
+
+Usage:
+    python3 kalman_tracker.py <GAS_WEBAPP_URL> --interval 10 --horizon 60
+
+    from kalman_tracker import FleetKalmanTracker
+    tracker = FleetKalmanTracker(measurement_noise_m=8)
+    for machine_id, record in stream:
+        tracker.update(machine_id, record)
+    tracker.predict("00453", 60)
+"""
+
+import argparse
+import math
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from telemetry_cache import format_timestamp, parse_timestamp
+
+EARTH_RADIUS_M = 6371000.0
+
+DEFAULT_MEASUREMENT_NOISE_M = 10.0
+# Standard deviation of unmodelled acceleration (m/s^2)
+DEFAULT_ACCELERATION_NOISE = 1.0
+# Initial velocity standard deviation (m/s) for a new track
+INITIAL_VELOCITY_SIGMA = 30.0
+# Start a new track after this long without fixes
+DEFAULT_MAX_GAP_SECONDS = 600.0
+
+
+class _Axis:
+    __slots__ = ("position", "velocity", "p_pp", "p_pv", "p_vv")
+
+    def __init__(self, position: float, position_var: float, velocity_var: float):
+        self.position = position
+        self.velocity = 0.0
+        self.p_pp = position_var
+        self.p_pv = 0.0
+        self.p_vv = velocity_var
+
+    def predicted(self, dt: float, q: float) -> Tuple[float, float, float, float, float]:
+        """
+        (position, velocity, P_pp, P_pv, P_vv) after dt seconds, without changing the state
+        """
+        dt2 = dt * dt
+        p_pp = self.p_pp + 2 * dt * self.p_pv + dt2 * self.p_vv + q * dt2 * dt / 3
+        p_pv = self.p_pv + dt * self.p_vv + q * dt2 / 2
+        p_vv = self.p_vv + q * dt
+        return self.position + self.velocity * dt, self.velocity, p_pp, p_pv, p_vv
+
+    def step(self, dt: float, q: float, measurement: float, r: float):
+        """
+        Predict dt seconds ahead, then correct with a position measurement (variance r)
+        """
+        position, velocity, p_pp, p_pv, p_vv = self.predicted(dt, q)
+        s = p_pp + r
+        k_p = p_pp / s
+        k_v = p_pv / s
+        innovation = measurement - position
+        self.position = position + k_p * innovation
+        self.velocity = velocity + k_v * innovation
+        self.p_pp = (1 - k_p) * p_pp
+        self.p_pv = (1 - k_p) * p_pv
+        self.p_vv = p_vv - k_v * p_pv
+
+
+class KalmanTrack:
+    __slots__ = ("origin_lat", "origin_lng", "_cos_lat", "east", "north", "timestamp", "fixes")
+
+    def __init__(self, timestamp: float, latitude: float, longitude: float,
+                 measurement_noise_m: float = DEFAULT_MEASUREMENT_NOISE_M):
+        """
+        Constant-velocity filter for one machine, started at its first fix
+
+        Args:
+            timestamp: Epoch seconds of the first fix
+            latitude, longitude: First fix (also the plane's origin)
+            measurement_noise_m: GPS position standard deviation (m)
+        """
+        self.origin_lat = latitude
+        self.origin_lng = longitude
+        self._cos_lat = math.cos(math.radians(latitude))
+        r = measurement_noise_m ** 2
+        v = INITIAL_VELOCITY_SIGMA ** 2
+        self.east = _Axis(0.0, r, v)
+        self.north = _Axis(0.0, r, v)
+        self.timestamp = timestamp
+        self.fixes = 1
+
+    def to_plane(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """
+        (east, north) metres from the origin (equirectangular)
+        """
+        east = math.radians(longitude - self.origin_lng) * self._cos_lat * EARTH_RADIUS_M
+        north = math.radians(latitude - self.origin_lat) * EARTH_RADIUS_M
+        return east, north
+
+    def to_geo(self, east: float, north: float) -> Tuple[float, float]:
+        """
+        (latitude, longitude) of a plane position
+        """
+        latitude = self.origin_lat + math.degrees(north / EARTH_RADIUS_M)
+        longitude = self.origin_lng + math.degrees(east / (EARTH_RADIUS_M * self._cos_lat))
+        return latitude, longitude
+
+    def update(self, timestamp: float, latitude: float, longitude: float,
+               measurement_noise_m: float = DEFAULT_MEASUREMENT_NOISE_M,
+               acceleration_noise: float = DEFAULT_ACCELERATION_NOISE) -> bool:
+        """
+        Fold in one fix
+
+        Returns:
+            False if the fix is older than the current state and was ignored
+        """
+        dt = timestamp - self.timestamp
+        if dt < 0:
+            return False
+        east, north = self.to_plane(latitude, longitude)
+        q = acceleration_noise ** 2
+        r = measurement_noise_m ** 2
+        self.east.step(dt, q, east, r)
+        self.north.step(dt, q, north, r)
+        self.timestamp = timestamp
+        self.fixes += 1
+        return True
+
+    def estimate(self, seconds_ahead: float = 0.0,
+                 acceleration_noise: float = DEFAULT_ACCELERATION_NOISE) -> Dict[str, Any]:
+        """
+        Filtered state, or its prediction seconds_ahead after the last fix
+
+        Returns:
+            {latitude, longitude, timestamp, speed (km/h), heading (degrees from north),
+             covariance ([[east, cross], [cross, north]] position variance in m^2),
+             positionSigma (m), velocitySigma (m/s), fixes}
+        """
+        q = acceleration_noise ** 2
+        if seconds_ahead > 0:
+            east, v_east, pe, _, ve = self.east.predicted(seconds_ahead, q)
+            north, v_north, pn, _, vn = self.north.predicted(seconds_ahead, q)
+        else:
+            east, v_east, pe, ve = self.east.position, self.east.velocity, self.east.p_pp, self.east.p_vv
+            north, v_north, pn, vn = self.north.position, self.north.velocity, self.north.p_pp, self.north.p_vv
+
+        latitude, longitude = self.to_geo(east, north)
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timestamp": format_timestamp(self.timestamp + max(seconds_ahead, 0.0)),
+            "speed": math.hypot(v_east, v_north) * 3.6,
+            "heading": (math.degrees(math.atan2(v_east, v_north)) + 360) % 360,
+            "covariance": [[pe, 0.0], [0.0, pn]],
+            "positionSigma": math.sqrt((pe + pn) / 2),
+            "velocitySigma": math.sqrt((ve + vn) / 2),
+            "fixes": self.fixes
+        }
+
+
+class FleetKalmanTracker:
+    def __init__(self, measurement_noise_m: float = DEFAULT_MEASUREMENT_NOISE_M,
+                 acceleration_noise: float = DEFAULT_ACCELERATION_NOISE,
+                 max_gap_s: float = DEFAULT_MAX_GAP_SECONDS, history_size: int = 0):
+        """
+        One Kalman track per machine, updated fix by fix
+
+        Args:
+            measurement_noise_m: GPS position standard deviation (m)
+            acceleration_noise: Unmodelled acceleration standard deviation (m/s^2)
+            max_gap_s: Restart a machine's track after a gap longer than this (0 = never)
+            history_size: Smoothed estimates kept per machine (0 = none)
+        """
+        self.measurement_noise_m = measurement_noise_m
+        self.acceleration_noise = acceleration_noise
+        self.max_gap_s = max_gap_s
+        self.history_size = history_size
+        self.tracks: Dict[str, KalmanTrack] = {}
+        self.history: Dict[str, deque] = {}
+        self.skipped = 0
+
+    def update(self, machine_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fold in one read-schema data point
+
+        Points with a gps_error other than GPS_ERROR:NONE, without a
+        timestamp, or at (0, 0) (the backend's value for a missing
+        coordinate), and points older than the machine's last fix, are
+        skipped.
+
+        Returns:
+            Smoothed estimate after the fix, or None if it was skipped
+        """
+        if record.get("gps_error") not in (None, "GPS_ERROR:NONE"):
+            self.skipped += 1
+            return None
+        latitude = record.get("latitude") or 0.0
+        longitude = record.get("longitude") or 0.0
+        timestamp = parse_timestamp(record.get("timestamp"))
+        if math.isnan(timestamp) or (latitude == 0.0 and longitude == 0.0):
+            self.skipped += 1
+            return None
+        return self.update_fix(machine_id, timestamp, latitude, longitude)
+
+    def update_fix(self, machine_id: str, timestamp: float, latitude: float,
+                   longitude: float) -> Optional[Dict[str, Any]]:
+        """
+        Fold in one fix given as epoch seconds and degrees
+
+        Returns:
+            Smoothed estimate after the fix, or None if it was older than the last one
+        """
+        track = self.tracks.get(machine_id)
+        if track is None or (self.max_gap_s and timestamp - track.timestamp > self.max_gap_s):
+            track = KalmanTrack(timestamp, latitude, longitude, self.measurement_noise_m)
+            self.tracks[machine_id] = track
+        elif not track.update(timestamp, latitude, longitude, self.measurement_noise_m, self.acceleration_noise):
+            self.skipped += 1
+            return None
+
+        estimate = track.estimate(0.0, self.acceleration_noise)
+        if self.history_size:
+            history = self.history.get(machine_id)
+            if history is None:
+                history = self.history[machine_id] = deque(maxlen=self.history_size)
+            history.append(estimate)
+        return estimate
+
+    def update_records(self, machine_id: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Fold in a machine's data points in order
+
+        Returns:
+            Number of fixes used
+        """
+        return sum(1 for record in records if self.update(machine_id, record) is not None)
+
+    def update_response(self, result: Dict[str, Any]) -> int:
+        """
+        Fold in a getMachine or getAllMachines response
+
+        Returns:
+            Number of fixes used
+        """
+        if isinstance(result.get("data"), list):
+            return self.update_records(result.get("machineId"), result["data"])
+        return sum(self.update_records(m["machineId"], m.get("data", [])) for m in result.get("machines") or [])
+
+    def estimate(self, machine_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current smoothed state of a machine (None if it has no fixes)
+        """
+        track = self.tracks.get(machine_id)
+        return track.estimate(0.0, self.acceleration_noise) if track else None
+
+    def predict(self, machine_id: str, seconds_ahead: float) -> Optional[Dict[str, Any]]:
+        """
+        Predicted state seconds_ahead after the machine's last fix, with grown covariance
+        """
+        track = self.tracks.get(machine_id)
+        return track.estimate(seconds_ahead, self.acceleration_noise) if track else None
+
+    def smoothed(self, machine_id: str) -> List[Dict[str, Any]]:
+        """
+        Recent filtered estimates of a machine, oldest first (needs history_size)
+        """
+        return list(self.history.get(machine_id, ()))
+
+    def machine_ids(self) -> List[str]:
+        """
+        Machines with a track
+        """
+        return list(self.tracks)
+
+
+def main():
+    from gas_client import GASClient
+
+    parser = argparse.ArgumentParser(description="Streaming Kalman smoothing of machine tracks")
+    parser.add_argument("url", help="GAS WebApp URL")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between polls (0 = once)")
+    parser.add_argument("--horizon", type=float, default=60.0, help="Prediction horizon in seconds")
+    parser.add_argument("--noise-m", type=float, default=DEFAULT_MEASUREMENT_NOISE_M,
+                        help="GPS position standard deviation (m)")
+    parser.add_argument("--accel", type=float, default=DEFAULT_ACCELERATION_NOISE,
+                        help="Acceleration noise standard deviation (m/s^2)")
+
+    args = parser.parse_args()
+    client = GASClient(args.url, user_agent="GAS-Kalman-Tracker/1.0")
+    tracker = FleetKalmanTracker(args.noise_m, args.accel)
+    cursors: Dict[str, int] = {}
+
+    try:
+        while True:
+            machine_list = client.get_json("getMachineList")
+            if machine_list.get("status") != "success":
+                print(f"failed: {machine_list.get('message')}")
+            else:
+                start_time = time.perf_counter()
+                used = 0
+                for machine in machine_list.get("machines", []):
+                    machine_id = machine["machineId"]
+                    params = {"machineId": machine_id}
+                    if cursors.get(machine_id):
+                        params["sinceRow"] = cursors[machine_id]
+                    result = client.get_json("getMachine", params)
+                    if result.get("status") != "success":
+                        continue
+                    used += tracker.update_response(result)
+                    if result.get("lastRow") is not None:
+                        cursors[machine_id] = result["lastRow"]
+
+                print(f"{used} new fixes in {time.perf_counter() - start_time:.2f}s "
+                      f"(prediction +{args.horizon:.0f}s)")
+                for machine_id in tracker.machine_ids():
+                    p = tracker.predict(machine_id, args.horizon)
+                    print(f"  {machine_id:<12} {p['latitude']:>11.6f} {p['longitude']:>12.6f} "
+                          f"{p['speed']:>7.1f}km/h {p['heading']:>6.1f}° ±{p['positionSigma']:.0f}m")
+
+            if args.interval <= 0:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nTracking stopped")
+
+
+if __name__ == "__main__":
+    main()
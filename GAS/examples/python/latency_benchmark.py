@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+WebApp Latency Benchmark (v2.0.0)
+Runs N timed iterations per GET action after a warmup, records
+p50/p90/p99/max, saves the results as JSON and compares them against a
+stored baseline so regressions fail the run.
+
+Usage:
+    python3 latency_benchmark.py <GAS_WEBAPP_URL> --iterations 50 --output results.json
+    python3 latency_benchmark.py <GAS_WEBAPP_URL> --baseline baseline.json
+    python3 latency_benchmark.py --local --latency-ms 300 --per-row-us 20 --row-steps 1000,5000,20000
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from gas_client import GASClient
+
+DEFAULT_ACTIONS = ["getAllMachines", "getMachineList", "getMachine"]
+DEFAULT_METRICS = ("p50", "p90", "p99")
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks
+
+    Args:
+        sorted_samples: Samples in ascending order
+        q: Percentile (0-100)
+
+    Returns:
+        Percentile value (0.0 for no samples)
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * q / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return sorted_samples[lower]
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (rank - lower)
+
+
+def summarize(samples_ms: List[float], errors: int = 0) -> Dict[str, Any]:
+    """
+    Summarize latency samples
+
+    Args:
+        samples_ms: Latencies of successful requests in milliseconds
+        errors: Number of failed requests
+
+    Returns:
+        {count, errors, mean, p50, p90, p95, p99, max} (milliseconds)
+    """
+    ordered = sorted(samples_ms)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "mean": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        "p50": round(percentile(ordered, 50), 2),
+        "p90": round(percentile(ordered, 90), 2),
+        "p95": round(percentile(ordered, 95), 2),
+        "p99": round(percentile(ordered, 99), 2),
+        "max": round(ordered[-1], 2) if ordered else 0.0
+    }
+
+
+class LatencyBenchmark:
+    def __init__(self, client: GASClient, iterations: int = 50, warmup: int = 5):
+        """
+        Initialize latency benchmark
+
+        Args:
+            client: WebApp client
+            iterations: Timed requests per action
+            warmup: Untimed requests per action (connection setup, GAS cold start)
+        """
+        self.client = client
+        self.iterations = iterations
+        self.warmup = warmup
+
+    def _timed_get(self, action: str, params: Dict[str, Any]) -> Tuple[bool, float]:
+        start_time = time.perf_counter()
+        result = self.client.get_json(action, params)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        return result.get("status") == "success", elapsed_ms
+
+    def run_action(self, action: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Benchmark one GET action
+
+        Args:
+            action: WebApp action
+            params: Additional query parameters
+
+        Returns:
+            Latency summary (see summarize)
+        """
+        params = params or {}
+        for _ in range(self.warmup):
+            self._timed_get(action, params)
+
+        samples = []
+        errors = 0
+        for _ in range(self.iterations):
+            ok, elapsed_ms = self._timed_get(action, params)
+            if ok:
+                samples.append(elapsed_ms)
+            else:
+                errors += 1
+        return summarize(samples, errors)
+
+    def default_params(self, action: str) -> Optional[Dict[str, Any]]:
+        """
+        Parameters for actions that need them (None if the action cannot run)
+        """
+        if action != "getMachine":
+            return {}
+        machine_list = self.client.get_json("getMachineList")
+        machines = machine_list.get("machines") or []
+        if not machines:
+            return None
+        return {"machineId": machines[0]["machineId"]}
+
+    def data_points(self) -> Optional[int]:
+        """
+        Total rows across machine sheets (labels results as sheets grow)
+        """
+        stats = self.client.get_json("getMachineStats")
+        return stats.get("total_data_points") if stats.get("status") == "success" else None
+
+    def run(self, actions: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Benchmark several GET actions
+
+        Args:
+            actions: Actions to benchmark (defaults to DEFAULT_ACTIONS)
+
+        Returns:
+            Results dictionary (JSON-serializable)
+        """
+        results = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "endpoint": self.client.webapp_url,
+            "iterations": self.iterations,
+            "warmup": self.warmup,
+            "dataPoints": self.data_points(),
+            "actions": {}
+        }
+        for action in actions or DEFAULT_ACTIONS:
+            params = self.default_params(action)
+            if params is None:
+                continue
+            results["actions"][action] = self.run_action(action, params)
+        return results
+
+    def run_row_growth(self, row_steps: List[int], machine_ids: List[str],
+                       actions: Optional[List[str]] = None, batch_size: int = 500) -> List[Dict[str, Any]]:
+        """
+        Benchmark while growing the sheets to each row count
+
+        Rows are appended through batched POSTs, so only use this against a
+        test deployment or the local stand-in server.
+
+        Args:
+            row_steps: Total row counts to reach (ascending)
+            machine_ids: Machines the rows are spread across
+            actions: Actions to benchmark at each step
+            batch_size: Records per batched POST while seeding
+
+        Returns:
+            One results dictionary per step
+        """
+        steps = []
+        for target in row_steps:
+            current = self.data_points() or 0
+            self.seed_rows(target - current, machine_ids, batch_size)
+            steps.append(self.run(actions))
+        return steps
+
+    def seed_rows(self, count: int, machine_ids: List[str], batch_size: int = 500):
+        """
+        Append count synthetic telemetry rows spread across machine_ids
+        """
+        records = []
+        for i in range(max(count, 0)):
+            machine_id = machine_ids[i % len(machine_ids)]
+            records.append({
+                "MachineID": machine_id,
+                "MachineTime": datetime.now().strftime("%Y/%m/%d %H:%M:%S"),
+                "DataType": "HK",
+                "GPS": {"LAT": 35.681236 + i * 1e-6, "LNG": 139.767125 + i * 1e-6, "ALT": 10.0, "SAT": 8},
+                "BAT": 3.7,
+                "CMT": "Benchmark seed"
+            })
+            if len(records) >= batch_size:
+                self.client.post_json(records)
+                records = []
+        if records:
+            self.client.post_json(records)
+
+
+def save_results(results: Any, path: str):
+    """
+    Save benchmark results as JSON
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Any:
+    """
+    Load benchmark results (or a baseline) from JSON
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """
+    Load a baseline for compare_to_baseline
+
+    Row-growth runs save a list of steps; the last (largest) step is used.
+    """
+    baseline = load_results(path)
+    if isinstance(baseline, list):
+        baseline = baseline[-1] if baseline else {}
+    return baseline
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = 0.2, min_delta_ms: float = 50.0,
+                        metrics: Tuple[str, ...] = DEFAULT_METRICS) -> List[Dict[str, Any]]:
+    """
+    Find latency regressions against a baseline
+
+    A metric regresses when it is more than tolerance (relative) AND more than
+    min_delta_ms (absolute) slower than the baseline; the absolute floor keeps
+    noise on fast actions from failing the run. New errors also count.
+
+    Args:
+        results: Current results from LatencyBenchmark.run
+        baseline: Baseline results in the same format
+        tolerance: Allowed relative slowdown (0.2 = 20%)
+        min_delta_ms: Allowed absolute slowdown in milliseconds
+        metrics: Summary fields to compare
+
+    Returns:
+        List of regressions {action, metric, baseline, current}
+    """
+    regressions = []
+    for action, base_stats in baseline.get("actions", {}).items():
+        current = results.get("actions", {}).get(action)
+        if current is None:
+            continue
+        for metric in metrics:
+            if metric not in base_stats:
+                # Baseline saved before this metric existed
+                continue
+            base_value = base_stats[metric]
+            value = current.get(metric, 0.0)
+            if value > base_value * (1 + tolerance) and value - base_value > min_delta_ms:
+                regressions.append({"action": action, "metric": metric,
+                                    "baseline": base_value, "current": value})
+        if current.get("errors", 0) > base_stats.get("errors", 0):
+            regressions.append({"action": action, "metric": "errors",
+                                "baseline": base_stats.get("errors", 0), "current": current["errors"]})
+    return regressions
+
+
+def print_results(results: Dict[str, Any]):
+    """
+    Print a latency table for one results dictionary
+    """
+    print(f"Data points: {results.get('dataPoints')}  "
+          f"(iterations: {results['iterations']}, warmup: {results['warmup']})")
+    print(f"{'Action':<16} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9} {'errors':>7}")
+    for action, stats in results["actions"].items():
+        print(f"{action:<16} {stats['p50']:>9.1f} {stats['p90']:>9.1f} {stats['p99']:>9.1f} "
+              f"{stats['max']:>9.1f} {stats['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebApp latency benchmark")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed requests per action")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per action")
+    parser.add_argument("--actions", default=",".join(DEFAULT_ACTIONS), help="Comma separated GET actions")
+    parser.add_argument("--output", help="Save results to this JSON file")
+    parser.add_argument("--baseline", help="Fail if results regress against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=50.0, help="Allowed absolute slowdown")
+    parser.add_argument("--row-steps", help="Comma separated row counts to grow the sheets to")
+    parser.add_argument("--machines", type=int, default=10, help="Machines used when growing rows")
+    parser.add_argument("--local", action="store_true", help="Benchmark a local stand-in server")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in fixed latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Stand-in random latency")
+    parser.add_argument("--per-row-us", type=float, default=0.0, help="Stand-in latency per row")
+
+    args = parser.parse_args()
+
+    server = None
+    if args.local:
+        from local_gas_server import LatencyModel, start_stand_in
+        server = start_stand_in(LatencyModel(args.latency_ms, args.jitter_ms, args.per_row_us))
+        args.url = server.url
+    elif not args.url:
+        parser.error("url is required unless --local is given")
+
+    benchmark = LatencyBenchmark(GASClient(args.url, user_agent="GAS-Latency-Benchmark/1.0"),
+                                 iterations=args.iterations, warmup=args.warmup)
+    actions = [a.strip() for a in args.actions.split(",") if a.strip()]
+
+    print("WebApp Latency Benchmark")
+    print("=" * 30)
+    print(f"Testing: {args.url}")
+    print()
+
+    try:
+        if args.row_steps:
+            from async_sender import fleet_machine_ids
+            row_steps = [int(s) for s in args.row_steps.split(",")]
+            output = benchmark.run_row_growth(row_steps, fleet_machine_ids(args.machines), actions)
+            for step in output:
+                print_results(step)
+                print()
+            results = output[-1]
+        else:
+            results = output = benchmark.run(actions)
+            print_results(results)
+
+        if args.output:
+            save_results(output, args.output)
+            print(f"\nResults saved: {args.output}")
+
+        if args.baseline:
+            baseline = load_baseline(args.baseline)
+            regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+                for r in regressions:
+                    print(f"  {r['action']} {r['metric']}: {r['baseline']} -> {r['current']}")
+                sys.exit(1)
+            print(f"\n✅ No regressions against {args.baseline}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,861 @@
+#!/usr/bin/env python3
+"""
+Local GAS WebApp Stand-in Server
+Emulates the doGet/doPost actions of GAS/src/Main.gs with an in-memory
+"sheet" model and configurable latency injection, so the Python clients
+can be load-tested and benchmarked without using Apps Script quota.
+
+Usage:
+    python3 local_gas_server.py --port 8080 --latency-ms 300 --jitter-ms 200
+    python3 test_api_compatibility.py http://127.0.0.1:8080/exec
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+JST = timezone(timedelta(hours=9))
+MACHINE_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,20}$")
+TIMEOUT_MINUTES = 10
+# Idempotency keys remembered (the real backend keeps them in CacheService for 6 hours)
+IDEMPOTENCY_CACHE_SIZE = 100000
+# Rows per paginated getMachine response (CONFIG.MAX_PAGE_SIZE)
+MAX_PAGE_SIZE = 5000
+
+
+def format_iso(epoch: float) -> str:
+    """Format epoch seconds like Date.toISOString()"""
+    dt = datetime.fromtimestamp(epoch, timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dt.microsecond // 1000:03d}Z"
+
+
+def format_jst(epoch: float, pattern: str = "%Y/%m/%d %H:%M:%S") -> str:
+    """Format epoch seconds like Utilities.formatDate(..., "Asia/Tokyo", ...)"""
+    return datetime.fromtimestamp(epoch, JST).strftime(pattern)
+
+
+def sheet_time() -> float:
+    """Current time as stored in the GAS Time column (whole seconds)"""
+    return float(int(time.time()))
+
+
+def parse_float(value: Any) -> float:
+    """parseFloat(value) || 0"""
+    try:
+        return float(value) or 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_int(value: Any) -> int:
+    """parseInt(value) || 0"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_valid_machine_id(machine_id: Any) -> bool:
+    """Same rule as isValidMachineId in Utils.gs"""
+    return isinstance(machine_id, str) and bool(MACHINE_ID_PATTERN.match(machine_id))
+
+
+class StandInError(Exception):
+    """Error raised inside an action (maps to createErrorResponse)"""
+
+
+class LatencyModel:
+    def __init__(self, base_ms: float = 0.0, jitter_ms: float = 0.0,
+                 per_row_us: float = 0.0, seed: Optional[int] = None):
+        """
+        Injected latency per request
+
+        Args:
+            base_ms: Fixed latency per request
+            jitter_ms: Uniform random extra latency (0..jitter_ms)
+            per_row_us: Extra latency per sheet row read or written
+            seed: Random seed for repeatable runs (also drives fault injection)
+        """
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self.per_row_us = per_row_us
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, rows: int = 0):
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        seconds = (self.base_ms + jitter) / 1000.0 + rows * self.per_row_us / 1e6
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def chance(self, rate: float) -> bool:
+        """
+        Draw whether an event with the given rate happens, from the same seeded
+        generator as the jitter so one seed repeats the whole run
+        """
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+
+class MachineSheet:
+    """In-memory equivalent of a Machine_{ID} sheet"""
+
+    def __init__(self, machine_id: str):
+        self.machine_id = machine_id
+        self.name = f"Machine_{machine_id}"
+        self.is_active = True  # K1 checkbox defaults to TRUE
+        # Rows hold the 10 data columns; column A is stored as epoch seconds
+        self.rows: List[list] = []
+
+    @property
+    def last_row(self) -> int:
+        """Equivalent of sheet.getLastRow() (header is row 1)"""
+        return len(self.rows) + 1
+
+
+class GASStandIn:
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        """
+        In-memory emulation of the WebApp backend
+
+        Args:
+            latency: Latency model applied to every action
+        """
+        self.latency = latency or LatencyModel()
+        self.sheets: Dict[str, MachineSheet] = {}
+        self.monitor_status: Dict[str, Dict[str, Any]] = {}
+        self.idempotency_cache = OrderedDict()
+        self._lock = threading.RLock()
+        # Rows read or written by the current action (drives per-row latency)
+        self._pending_rows = 0
+
+    # ---- sheet helpers -------------------------------------------------
+
+    def _get_or_create_sheet(self, machine_id: str) -> MachineSheet:
+        sheet = self.sheets.get(machine_id)
+        if sheet is None:
+            sheet = MachineSheet(machine_id)
+            self.sheets[machine_id] = sheet
+        return sheet
+
+    def _get_sheet(self, machine_id: str) -> MachineSheet:
+        if not is_valid_machine_id(machine_id):
+            raise StandInError(f"Error: Invalid machine ID: {machine_id}")
+        sheet = self.sheets.get(machine_id)
+        if sheet is None:
+            raise StandInError(f"Error: Machine {machine_id} not found")
+        return sheet
+
+    @staticmethod
+    def _build_row(data: Dict[str, Any], gas_time: float) -> list:
+        gps = data.get("GPS")
+        if not isinstance(gps, dict):
+            raise StandInError("TypeError: Cannot read properties of undefined (reading 'LAT')")
+        return [
+            gas_time,
+            data.get("MachineTime"),
+            data.get("MachineID"),
+            data.get("DataType"),
+            gps.get("LAT"),
+            gps.get("LNG"),
+            gps.get("ALT"),
+            gps.get("SAT"),
+            data.get("BAT"),
+            data.get("CMT"),
+        ]
+
+    @staticmethod
+    def _row_to_data_point(row: list) -> Dict[str, Any]:
+        return {
+            "timestamp": format_iso(row[0]),
+            "machineTime": row[1],
+            "machineId": row[2],
+            "dataType": row[3] or "",
+            "latitude": parse_float(row[4]),
+            "longitude": parse_float(row[5]),
+            "altitude": parse_float(row[6]),
+            "satellites": parse_int(row[7]),
+            "battery": parse_float(row[8]),
+            "comment": row[9] or "",
+        }
+
+    def _machine_data(self, sheet: MachineSheet, start_row: int = 2,
+                      last_row: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Equivalent of getMachineDataFromSheet (skips empty rows, sorts by timestamp)"""
+        last_row = sheet.last_row if last_row is None else last_row
+        rows = [row for row in sheet.rows[max(start_row, 2) - 2:max(last_row - 1, 0)] if row[0] and row[1]]
+        rows.sort(key=lambda row: row[0])
+        return [self._row_to_data_point(row) for row in rows]
+
+    @staticmethod
+    def _now_iso() -> str:
+        return format_iso(time.time())
+
+    # ---- GET actions ---------------------------------------------------
+
+    def do_get(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Dispatch a GET request (doGet)
+
+        Args:
+            params: Query parameters
+
+        Returns:
+            Response dictionary
+        """
+        try:
+            action = params.get("action")
+            with self._lock:
+                if action == "getAllMachines":
+                    return self.get_all_machines(params)
+                elif action == "getMachine":
+                    machine_id = params.get("machineId")
+                    if not machine_id:
+                        raise StandInError("Error: Machine ID is required")
+                    return self.get_machine(machine_id, params)
+                elif action == "getMachineList":
+                    return self.get_machine_list()
+                elif action == "getMonitoringStats":
+                    return self.success(self.get_monitoring_stats())
+                elif action == "getMachineStats":
+                    return self.success(self.get_machine_statistics())
+                elif action == "getConfigStatus":
+                    return self.success(self.get_config_status())
+                else:
+                    return self.error("Invalid action")
+        except StandInError as e:
+            return self.error(str(e))
+
+    def get_all_machines(self, params: Dict[str, str]) -> Dict[str, Any]:
+        fingerprint, last_rows = self._machines_fingerprint()
+        if params.get("fingerprint") and params["fingerprint"] == fingerprint:
+            self._pending_rows = 0
+            return self.success({
+                "notModified": True,
+                "fingerprint": fingerprint,
+                "timestamp": self._now_iso()
+            })
+
+        machines = []
+        rows_read = 0
+        for sheet in self.sheets.values():
+            data = self._machine_data(sheet)
+            rows_read += len(sheet.rows)
+            if data:
+                machines.append({
+                    "machineId": sheet.machine_id,
+                    "data": data,
+                    "isActive": sheet.is_active
+                })
+        self._pending_rows = rows_read
+        return self.success({
+            "machines": machines,
+            "totalMachines": len(machines),
+            "fingerprint": fingerprint,
+            "lastRows": last_rows,
+            "timestamp": self._now_iso()
+        })
+
+    def _machines_fingerprint(self) -> Tuple[str, Dict[str, int]]:
+        """Equivalent of computeMachinesFingerprint (same digest as the backend)"""
+        last_rows = {}
+        parts = []
+        for sheet in self.sheets.values():
+            last_rows[sheet.machine_id] = sheet.last_row
+            parts.append(f"{sheet.machine_id}:{sheet.last_row}:{'true' if sheet.is_active else 'false'}")
+        digest = hashlib.md5("|".join(parts).encode("utf-8")).digest()
+        return base64.urlsafe_b64encode(digest).decode("ascii"), last_rows
+
+    def get_machine(self, machine_id: str, params: Dict[str, str]) -> Dict[str, Any]:
+        sheet = self._get_sheet(machine_id)
+        last_row = sheet.last_row
+        start_row = 2
+
+        if params.get("untilRow") not in (None, ""):
+            try:
+                until_row = int(params["untilRow"])
+            except ValueError:
+                until_row = 0
+            if until_row < 1:
+                raise StandInError(f"Error: Invalid untilRow: {params['untilRow']}")
+            last_row = min(last_row, until_row)
+
+        if params.get("sinceRow") not in (None, ""):
+            try:
+                since_row = int(params["sinceRow"])
+            except ValueError:
+                since_row = 0
+            if since_row < 1:
+                raise StandInError(f"Error: Invalid sinceRow: {params['sinceRow']}")
+            start_row = since_row + 1
+        elif params.get("since"):
+            try:
+                since = datetime.fromisoformat(params["since"].replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                raise StandInError(f"Error: Invalid since timestamp: {params['since']}")
+            start_row = self._first_row_after(sheet, since)
+
+        page = {}
+        end_row = last_row
+        if params.get("offset") not in (None, "") or params.get("limit") not in (None, ""):
+            offset = self._page_param(params, "offset", 0)
+            limit = self._page_param(params, "limit", MAX_PAGE_SIZE)
+            if offset < 0:
+                raise StandInError(f"Error: Invalid offset: {params['offset']}")
+            if limit < 1:
+                raise StandInError(f"Error: Invalid limit: {params['limit']}")
+
+            page_size = min(limit, MAX_PAGE_SIZE)
+            total_rows = max(last_row - max(start_row, 2) + 1, 0)
+            start_row = max(start_row, 2) + offset
+            end_row = min(last_row, start_row + page_size - 1)
+            page = {
+                "offset": offset,
+                "limit": page_size,
+                "totalRows": total_rows,
+                "nextOffset": offset + page_size if offset + page_size < total_rows else None
+            }
+
+        data = self._machine_data(sheet, start_row, end_row)
+        self._pending_rows = max(end_row - start_row + 1, 0)
+        return self.success({
+            "machineId": machine_id,
+            "data": data,
+            "dataCount": len(data),
+            "isActive": sheet.is_active,
+            "lastRow": last_row,
+            **page,
+            "timestamp": self._now_iso()
+        })
+
+    @staticmethod
+    def _page_param(params: Dict[str, str], name: str, default: int) -> int:
+        """parseInt of an optional page parameter (-1 when not a number)"""
+        if params.get(name) in (None, ""):
+            return default
+        try:
+            return int(params[name])
+        except ValueError:
+            return -1
+
+    @staticmethod
+    def _first_row_after(sheet: MachineSheet, since: float) -> int:
+        """Equivalent of findFirstRowAfter (binary search over GAS Time)"""
+        low, high = 0, len(sheet.rows)
+        while low < high:
+            mid = (low + high) // 2
+            if sheet.rows[mid][0] > since:
+                high = mid
+            else:
+                low = mid + 1
+        return low + 2
+
+    def get_machine_list(self) -> Dict[str, Any]:
+        machine_list = []
+        for sheet in self.sheets.values():
+            data_count = len(sheet.rows)
+            machine_list.append({
+                "machineId": sheet.machine_id,
+                "sheetName": sheet.name,
+                "dataCount": data_count,
+                "isActive": sheet.is_active,
+                "lastUpdate": format_iso(sheet.rows[-1][0]) if data_count > 0 else None
+            })
+        return self.success({
+            "machines": machine_list,
+            "totalMachines": len(machine_list),
+            "timestamp": self._now_iso()
+        })
+
+    def get_machine_statistics(self) -> Dict[str, Any]:
+        stats = {
+            "total_machines": len(self.sheets),
+            "active_machines": sum(1 for s in self.sheets.values() if s.is_active),
+            "inactive_machines": sum(1 for s in self.sheets.values() if not s.is_active),
+            "machines_with_data": sum(1 for s in self.sheets.values() if s.rows),
+            "total_data_points": sum(len(s.rows) for s in self.sheets.values()),
+            "last_updated": self._now_iso()
+        }
+        return stats
+
+    def _active_machines(self) -> List[MachineSheet]:
+        """Equivalent of getActiveMachines (active sheets with at least one data row)"""
+        return [s for s in self.sheets.values() if s.is_active and s.rows]
+
+    def get_monitoring_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        active = self._active_machines()
+        stats = {
+            "total_machines": len(self.sheets),
+            "active_machines": len(active),
+            "normal_machines": 0,
+            "lost_machines": 0,
+            "last_check": self._now_iso(),
+            "machines": []
+        }
+        for sheet in active:
+            last_time = sheet.rows[-1][0]
+            status = self.monitor_status.get(sheet.machine_id)
+            machine_stats = {
+                "machine_id": sheet.machine_id,
+                "status": status["status"] if status else "normal",
+                "last_data_time": format_jst(last_time),
+                "minutes_since_last_data": int((now - last_time) // 60)
+            }
+            if status and status["status"] == "lost":
+                stats["lost_machines"] += 1
+                machine_stats["notification_count"] = status["notificationCount"]
+                machine_stats["first_lost_time"] = format_jst(status["firstLostTime"])
+            else:
+                stats["normal_machines"] += 1
+            stats["machines"].append(machine_stats)
+        return stats
+
+    @staticmethod
+    def get_config_status() -> Dict[str, Any]:
+        return {
+            "discord_webhook_configured": False,
+            "timeout_minutes": TIMEOUT_MINUTES,
+            "check_interval_minutes": 1,
+            "reminder_interval_minutes": 10,
+            "notifications_enabled": True,
+            "triggers_count": 0
+        }
+
+    # ---- POST actions --------------------------------------------------
+
+    def do_post(self, data: Any) -> Dict[str, Any]:
+        """
+        Dispatch a POST request (doPost)
+
+        Args:
+            data: Parsed JSON body
+
+        Returns:
+            Response dictionary
+        """
+        try:
+            with self._lock:
+                if isinstance(data, list):
+                    return self.save_batch(data)
+                if not isinstance(data, dict):
+                    raise StandInError("Error: Invalid machine ID: undefined")
+
+                action = data.get("action")
+                if action == "registerMachine":
+                    return self.register_machine(data)
+                elif action == "registerMachines":
+                    return self.register_machines(data)
+                elif action == "setActiveStatus":
+                    return self.set_active_status(data.get("machineId"), data.get("isActive"))
+                elif action == "checkMachine":
+                    return self.check_machine(data.get("machineId"))
+                elif action == "resetMonitorStatus":
+                    return self.reset_monitor_status(data.get("machineId"))
+                elif action == "testNotification":
+                    return {"status": "success", "message": "Test notification sent"}
+                else:
+                    result = self.save(data)
+                    response = {
+                        "status": "success",
+                        "message": "Duplicate request ignored" if result.get("duplicate") else "Data saved successfully",
+                        "rowNumber": result["row"],
+                        "sheetName": result["sheetName"]
+                    }
+                    if result.get("duplicate"):
+                        response["duplicate"] = True
+                    return response
+        except StandInError as e:
+            return {"status": "error", "message": str(e)}
+
+    def save(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Equivalent of saveToSpreadsheet"""
+        machine_id = data.get("MachineID")
+        if not is_valid_machine_id(machine_id):
+            raise StandInError(f"Error: Invalid machine ID: {machine_id}")
+        key = data.get("IdempotencyKey")
+        previous = self.idempotency_cache.get(key) if key else None
+        if previous:
+            return dict(previous, duplicate=True)
+        row = self._build_row(data, sheet_time())
+        sheet = self._get_or_create_sheet(machine_id)
+        sheet.rows.append(row)
+        self._pending_rows = 1
+        result = {"sheetName": sheet.name, "row": sheet.last_row}
+        if key:
+            self._remember(key, result)
+        return result
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        self.idempotency_cache[key] = result
+        while len(self.idempotency_cache) > IDEMPOTENCY_CACHE_SIZE:
+            self.idempotency_cache.popitem(last=False)
+
+    def save_batch(self, records: List[Any]) -> Dict[str, Any]:
+        """Equivalent of saveBatchToSpreadsheet"""
+        gas_time = sheet_time()
+        results = []
+        for index, data in enumerate(records):
+            machine_id = data.get("MachineID") if isinstance(data, dict) else None
+            if not is_valid_machine_id(machine_id):
+                results.append({"index": index, "status": "error",
+                                "message": f"Invalid machine ID: {machine_id}"})
+                continue
+            if not isinstance(data.get("GPS"), dict):
+                results.append({"index": index, "status": "error", "message": "GPS data is required"})
+                continue
+            key = data.get("IdempotencyKey")
+            previous = self.idempotency_cache.get(key) if key else None
+            if previous:
+                results.append({"index": index, "status": "success", "sheetName": previous["sheetName"],
+                                "rowNumber": previous["row"], "duplicate": True})
+                continue
+            sheet = self._get_or_create_sheet(machine_id)
+            sheet.rows.append(self._build_row(data, gas_time))
+            results.append({"index": index, "status": "success",
+                            "sheetName": sheet.name, "rowNumber": sheet.last_row})
+            if key:
+                self._remember(key, {"sheetName": sheet.name, "row": sheet.last_row})
+
+        saved_count = sum(1 for r in results if r["status"] == "success")
+        self._pending_rows = len(records)
+        if saved_count == len(records):
+            status = "success"
+        else:
+            status = "partial" if saved_count > 0 else "error"
+        return {
+            "status": status,
+            "message": f"Saved {saved_count}/{len(records)} records",
+            "savedCount": saved_count,
+            "errorCount": len(records) - saved_count,
+            "results": results,
+            "timestamp": self._now_iso()
+        }
+
+    def register_machine(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        machine_id = data.get("MachineID")
+        if not machine_id or not is_valid_machine_id(machine_id):
+            return {"status": "error", "message": "Valid MachineID is required"}
+
+        sheet_name = f"Machine_{machine_id}"
+        if machine_id in self.sheets:
+            return {
+                "status": "error",
+                "message": f"Machine {machine_id} already exists",
+                "sheetName": sheet_name
+            }
+
+        sheet = self._get_or_create_sheet(machine_id)
+        if data.get("metadata"):
+            now = sheet_time()
+            sheet.rows.append([
+                now,
+                format_jst(now),
+                machine_id,
+                "REGISTRATION",
+                0, 0, 0, 0, 0,
+                json.dumps(data["metadata"], separators=(",", ":"))
+            ])
+
+        return {
+            "status": "success",
+            "message": f"Machine {machine_id} registered successfully",
+            "sheetName": sheet_name,
+            "machineId": machine_id,
+            "registeredAt": self._now_iso()
+        }
+
+    def register_machines(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Equivalent of registerMachines (bulk registration)"""
+        machines = data.get("machines") if isinstance(data.get("machines"), list) else []
+        results = []
+        for index, machine in enumerate(machines):
+            machine = machine if isinstance(machine, dict) else {}
+            result = self.register_machine(machine)
+            if result["status"] == "success":
+                result.pop("message", None)
+            result["index"] = index
+            result.setdefault("machineId", machine.get("MachineID"))
+            results.append(result)
+
+        registered_count = sum(1 for r in results if r["status"] == "success")
+        if registered_count == len(machines):
+            status = "success"
+        else:
+            status = "partial" if registered_count > 0 else "error"
+        return {
+            "status": status,
+            "message": f"Registered {registered_count}/{len(machines)} machines",
+            "registeredCount": registered_count,
+            "errorCount": len(machines) - registered_count,
+            "results": results,
+            "timestamp": self._now_iso()
+        }
+
+    def set_active_status(self, machine_id: Any, is_active: Any) -> Dict[str, Any]:
+        try:
+            sheet = self._get_sheet(machine_id)
+        except StandInError as e:
+            return {"status": "error", "message": str(e)}
+        sheet.is_active = is_active is True or is_active == "TRUE"
+        return {
+            "status": "success",
+            "message": f"Machine {machine_id} active status updated",
+            "machineId": machine_id,
+            "isActive": is_active
+        }
+
+    def check_machine(self, machine_id: Any) -> Dict[str, Any]:
+        """Equivalent of checkSpecificMachine (without Discord notifications)"""
+        if not is_valid_machine_id(machine_id):
+            return {"status": "error", "message": f"Error: Invalid machine ID: {machine_id}"}
+
+        target = next((s for s in self._active_machines() if s.machine_id == machine_id), None)
+        if target is None:
+            return {"status": "error", "message": f"Machine {machine_id} not found or not active"}
+
+        self._check_timeout(target)
+        return {
+            "status": "success",
+            "message": f"Timeout check completed for machine {machine_id}",
+            "machine_status": self._format_monitor_status(machine_id)
+        }
+
+    def _check_timeout(self, sheet: MachineSheet):
+        """Equivalent of checkMachineTimeout (lost/recovery transitions only)"""
+        now = time.time()
+        last_time = sheet.rows[-1][0]
+        diff_minutes = (now - last_time) / 60
+        current = self.monitor_status.get(sheet.machine_id, {
+            "status": "normal", "notificationCount": 0, "firstLostTime": None
+        })
+
+        if diff_minutes >= TIMEOUT_MINUTES:
+            if current["status"] != "lost":
+                self.monitor_status[sheet.machine_id] = {
+                    "status": "lost",
+                    "lastNotified": now,
+                    "lastDataReceived": last_time,
+                    "notificationCount": 1,
+                    "firstLostTime": now
+                }
+        elif current["status"] == "lost":
+            self.monitor_status[sheet.machine_id] = {
+                "status": "normal",
+                "lastNotified": now,
+                "lastDataReceived": last_time,
+                "notificationCount": 0,
+                "firstLostTime": None
+            }
+        else:
+            self.monitor_status[sheet.machine_id] = dict(current, lastDataReceived=last_time)
+
+    def _format_monitor_status(self, machine_id: str) -> Dict[str, Any]:
+        status = self.monitor_status.get(machine_id)
+        if not status:
+            return {"status": "normal"}
+        formatted = dict(status)
+        for key in ("lastNotified", "lastDataReceived", "firstLostTime"):
+            if isinstance(formatted.get(key), float):
+                formatted[key] = format_iso(formatted[key])
+        return formatted
+
+    def reset_monitor_status(self, machine_id: Any) -> Dict[str, Any]:
+        if not is_valid_machine_id(machine_id):
+            return {"status": "error", "message": f"Error: Invalid machine ID: {machine_id}"}
+        if machine_id in self.monitor_status:
+            del self.monitor_status[machine_id]
+            return {"status": "success", "message": f"Monitor status reset for machine {machine_id}"}
+        return {"status": "error", "message": f"No monitor status found for machine {machine_id}"}
+
+    # ---- responses -----------------------------------------------------
+
+    @staticmethod
+    def success(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Equivalent of createSuccessResponse"""
+        response = {"status": "success"}
+        response.update(data)
+        return response
+
+    @staticmethod
+    def error(message: str) -> Dict[str, Any]:
+        """Equivalent of createErrorResponse"""
+        return {"status": "error", "message": message, "timestamp": format_iso(time.time())}
+
+    # ---- request handling ----------------------------------------------
+
+    def handle(self, method: str, params: Dict[str, str], body: Optional[bytes]) -> Tuple[Dict[str, Any], int]:
+        """
+        Run one request through the emulated WebApp
+
+        Returns:
+            (response dictionary, rows touched for latency injection)
+        """
+        with self._lock:
+            self._pending_rows = 0
+            if method == "GET":
+                response = self.do_get(params)
+            else:
+                try:
+                    data = json.loads(body or b"")
+                except ValueError as e:
+                    response = {"status": "error", "message": f"SyntaxError: {e}"}
+                else:
+                    response = self.do_post(data)
+            return response, self._pending_rows
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    server_version = "GASStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+    # Keep-alive responses are written as headers + body; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def _respond(self, method: str, body: Optional[bytes] = None):
+        server = self.server
+        if server.max_concurrent and not server.slots.acquire(blocking=False):
+            # Apps Script refuses executions beyond its simultaneous limit
+            self._send_json(429, {"status": "error", "message": "Service invoked too many times"})
+            return
+        try:
+            if server.roll(server.error_rate):
+                self._send_json(503, {"status": "error", "message": "Service unavailable (injected)"})
+                return
+            params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+            response, rows = server.backend.handle(method, params, body)
+            server.backend.latency.delay(rows)
+            if server.roll(server.lost_response_rate):
+                # Request was processed but the client never sees the answer
+                self.close_connection = True
+                return
+            self._send_json(200, response)
+        finally:
+            if server.max_concurrent:
+                server.slots.release()
+
+    def _send_json(self, status_code: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond("GET")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._respond("POST", self.rfile.read(length))
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], backend: GASStandIn,
+                 max_concurrent: int = 0, verbose: bool = False,
+                 error_rate: float = 0.0, lost_response_rate: float = 0.0):
+        """
+        Threaded HTTP server around a GASStandIn backend
+
+        Args:
+            address: (host, port); port 0 picks a free port
+            backend: Emulated WebApp
+            max_concurrent: Simultaneous requests before answering 429 (0 = unlimited)
+            verbose: Log every request
+            error_rate: Fraction of requests answered 503 without being processed
+            lost_response_rate: Fraction of requests processed but answered by a dropped connection
+        """
+        super().__init__(address, StandInRequestHandler)
+        self.backend = backend
+        self.max_concurrent = max_concurrent
+        self.slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self.verbose = verbose
+        self.error_rate = error_rate
+        self.lost_response_rate = lost_response_rate
+
+    def roll(self, rate: float) -> bool:
+        """
+        Whether an injected fault with the given rate happens for this request
+        (drawn from the backend's latency model, so --seed covers faults too)
+        """
+        return self.backend.latency.chance(rate)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/exec"
+
+
+def start_stand_in(latency: Optional[LatencyModel] = None, host: str = "127.0.0.1",
+                   port: int = 0, max_concurrent: int = 0, error_rate: float = 0.0,
+                   lost_response_rate: float = 0.0) -> StandInServer:
+    """
+    Start a stand-in server on a background thread (for benchmarks and scripts)
+
+    Returns:
+        Running server; use server.url as the WebApp URL and server.shutdown() to stop
+    """
+    server = StandInServer((host, port), GASStandIn(latency), max_concurrent,
+                           error_rate=error_rate, lost_response_rate=lost_response_rate)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GAS WebApp stand-in server")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8080, help="Bind port")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency per request")
+    parser.add_argument("--per-row-us", type=float, default=0.0,
+                        help="Extra latency per sheet row read or written")
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="Simultaneous requests before answering 429 (Apps Script allows about 30)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered 503 without being processed")
+    parser.add_argument("--lost-response-rate", type=float, default=0.0,
+                        help="Fraction of requests processed but whose response is dropped")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable latency and fault injection")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+
+    latency = LatencyModel(args.latency_ms, args.jitter_ms, args.per_row_us, args.seed)
+    server = StandInServer((args.host, args.port), GASStandIn(latency), args.max_concurrent, args.verbose,
+                           args.error_rate, args.lost_response_rate)
+
+    print("Local GAS WebApp Stand-in")
+    print("=" * 30)
+    print(f"URL: {server.url}")
+    print(f"Latency: {args.latency_ms}ms + 0-{args.jitter_ms}ms jitter + {args.per_row_us}us/row")
+    print()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStand-in stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
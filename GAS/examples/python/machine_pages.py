@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Paginated getMachine Reader with Read-ahead (v2.0.0)
+Reads a machine's history as offset/limit pages and requests the next
+pages while the caller is still processing the current one, so the first
+records arrive after one small request instead of one huge response.
+
+Usage:
+    python3 machine_pages.py <GAS_WEBAPP_URL> 00453 --page-size 1000 --prefetch 2
+
+    from machine_pages import MachinePages
+    pages = MachinePages(GASClient(url), "00453", page_size=1000)
+    for record in pages:
+        ...
+    print(pages.last_row)   # cursor for a later sinceRow fetch
+"""
+
+import argparse
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+from gas_client import GASClient
+
+DEFAULT_PAGE_SIZE = 1000
+# Pages requested ahead of the one being processed
+DEFAULT_PREFETCH = 2
+
+
+class PageFetchError(Exception):
+    """Raised when a page request does not return status success"""
+
+
+class MachinePages:
+    def __init__(self, client: GASClient, machine_id: str, page_size: int = DEFAULT_PAGE_SIZE,
+                 prefetch: int = DEFAULT_PREFETCH, since_row: Optional[int] = None):
+        """
+        Iterator over one machine's data points, fetched page by page
+
+        The first page fixes the snapshot: later pages are requested with
+        untilRow set to its lastRow, which is also last_row, so rows appended
+        while paging are left for the next sinceRow fetch.
+
+        Args:
+            client: WebApp client
+            machine_id: Machine ID
+            page_size: Rows per page (the WebApp caps it at CONFIG.MAX_PAGE_SIZE)
+            prefetch: Pages requested ahead of the current one (at least 1)
+            since_row: Only read rows after this sheet row number
+        """
+        self.client = client
+        self.machine_id = machine_id
+        self.page_size = page_size
+        self.prefetch = max(prefetch, 1)
+        self.since_row = since_row
+        self.last_row: Optional[int] = None
+        self.total_rows: Optional[int] = None
+        self.is_active: Optional[bool] = None
+        self.pages_fetched = 0
+        self.first_page_seconds: Optional[float] = None
+
+    def _fetch(self, offset: int) -> Dict[str, Any]:
+        params = {"machineId": self.machine_id, "offset": offset, "limit": self.page_size}
+        if self.since_row is not None:
+            params["sinceRow"] = self.since_row
+        if offset and self.last_row is not None:
+            params["untilRow"] = self.last_row
+        result = self.client.get_json("getMachine", params)
+        if result.get("status") != "success":
+            raise PageFetchError(f"Page at offset {offset} of {self.machine_id}: {result.get('message')}")
+        return result
+
+    def pages(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield getMachine page responses in order
+
+        Raises:
+            PageFetchError: If a page request fails
+        """
+        start_time = time.perf_counter()
+        first = self._fetch(0)
+        self.first_page_seconds = time.perf_counter() - start_time
+        self.last_row = first.get("lastRow")
+        self.is_active = first.get("isActive")
+
+        if "totalRows" not in first:
+            # Backend without pagination answered with the whole history
+            self.total_rows = first.get("dataCount", 0)
+            self.pages_fetched = 1
+            yield first
+            return
+
+        self.total_rows = first["totalRows"]
+        limit = first.get("limit", self.page_size)
+        offsets = iter(range(limit, self.total_rows, limit))
+
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+            pending = deque()
+
+            def top_up():
+                while len(pending) < self.prefetch:
+                    offset = next(offsets, None)
+                    if offset is None:
+                        return
+                    pending.append(executor.submit(self._fetch, offset))
+
+            try:
+                top_up()
+                self.pages_fetched = 1
+                yield first
+                while pending:
+                    page = pending.popleft().result()
+                    top_up()
+                    self.pages_fetched += 1
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for page in self.pages():
+            yield from page.get("data", [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a machine's history page by page")
+    parser.add_argument("url", help="GAS WebApp URL")
+    parser.add_argument("machine_id", help="Machine ID")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Rows per page")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH, help="Pages requested ahead")
+    parser.add_argument("--since-row", type=int, help="Only read rows after this sheet row")
+
+    args = parser.parse_args()
+
+    pages = MachinePages(GASClient(args.url, user_agent="GAS-Machine-Pages/1.0"), args.machine_id,
+                         args.page_size, args.prefetch, args.since_row)
+    start_time = time.perf_counter()
+    count = 0
+    try:
+        for page in pages.pages():
+            count += page.get("dataCount", 0)
+            print(f"Page {pages.pages_fetched}: {page.get('dataCount')} records "
+                  f"(offset {page.get('offset', 0)}, {time.perf_counter() - start_time:.2f}s)")
+    except PageFetchError as e:
+        print(f"failed: {e}")
+        return
+
+    print(f"\nMachine {args.machine_id}: {count}/{pages.total_rows} rows in {pages.pages_fetched} pages")
+    print(f"First page: {pages.first_page_seconds * 1000:.1f}ms  "
+          f"Total: {time.perf_counter() - start_time:.2f}s  Last row: {pages.last_row}")
+
+
+if __name__ == "__main__":
+    main()
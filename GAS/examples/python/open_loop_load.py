@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Open-loop Constant-Arrival-Rate Load Generator (v2.0.0)
+Fires telemetry at a fixed rate per machine whether or not earlier
+responses have come back, and measures latency from the intended send
+time so backend queueing is not hidden (no coordinated omission).
+
+Usage:
+    python3 open_loop_load.py <GAS_WEBAPP_URL> --machines 100 --rate 1.0 --duration 60
+    python3 open_loop_load.py --local --latency-ms 300 --max-concurrent 30
+"""
+
+import argparse
+import heapq
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from gas_client import RetryPolicy
+from latency_benchmark import summarize
+from test_sender import GASTestSender
+
+
+class OpenLoopLoadGenerator(GASTestSender):
+    def __init__(self, webapp_url: str, machine_ids: List[str], rate_hz: float = 1.0,
+                 max_outstanding: int = 256, stagger: bool = True):
+        """
+        Initialize open-loop load generator
+
+        Args:
+            webapp_url: Google Apps Script WebApp URL
+            machine_ids: Machines to simulate
+            rate_hz: Sends per second per machine
+            max_outstanding: Worker threads (requests beyond this wait in a queue,
+                             and that wait is included in the measured latency)
+            stagger: Spread machine phases over one interval instead of firing all at once
+        """
+        super().__init__(webapp_url)
+        # One attempt per send: a retried request would count its backoff as
+        # latency and report a recovered failure as a success
+        self.client.retry_policy = RetryPolicy(max_attempts=1)
+        self.machine_ids = machine_ids
+        self.rate_hz = rate_hz
+        self.max_outstanding = max_outstanding
+        self.stagger = stagger
+        self.samples: List[Dict[str, Any]] = []
+        self._samples_lock = threading.Lock()
+        self._outstanding = 0
+        self._peak_outstanding = 0
+
+    def _schedule(self, start: float) -> List[tuple]:
+        """
+        Initial (intended time, machine index, sequence) heap
+        """
+        interval = 1.0 / self.rate_hz
+        count = len(self.machine_ids)
+        heap = []
+        for i in range(count):
+            phase = interval * i / count if self.stagger else 0.0
+            heap.append((start + phase, i, 0))
+        heapq.heapify(heap)
+        return heap
+
+    def _fire(self, machine_id: str, seq: int, intended: float, start: float):
+        sent = time.perf_counter()
+        result = self.post_data(self.create_machine_test_data(machine_id))
+        completed = time.perf_counter()
+
+        with self._samples_lock:
+            self._outstanding -= 1
+            self.samples.append({
+                "machineId": machine_id,
+                "seq": seq,
+                "intended": intended - start,
+                "sent": sent - start,
+                "completed": completed - start,
+                "status": result.get("status"),
+                "message": result.get("message") if result.get("status") != "success" else None
+            })
+
+    def run(self, duration: float) -> Dict[str, Any]:
+        """
+        Generate load for duration seconds, then wait for outstanding requests
+
+        Args:
+            duration: Seconds of scheduled sends
+
+        Returns:
+            Summary dictionary (latencies in milliseconds)
+        """
+        self.samples = []
+        self._outstanding = 0
+        self._peak_outstanding = 0
+        self.client.resize_pool(self.max_outstanding)
+
+        interval = 1.0 / self.rate_hz
+        start = time.perf_counter() + 0.1
+        end = start + duration
+        heap = self._schedule(start)
+        scheduled = 0
+        max_dispatch_lag = 0.0
+
+        with ThreadPoolExecutor(max_workers=self.max_outstanding) as executor:
+            while heap and heap[0][0] < end:
+                intended, index, seq = heapq.heappop(heap)
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                max_dispatch_lag = max(max_dispatch_lag, time.perf_counter() - intended)
+
+                with self._samples_lock:
+                    self._outstanding += 1
+                    self._peak_outstanding = max(self._peak_outstanding, self._outstanding)
+                executor.submit(self._fire, self.machine_ids[index], seq, intended, start)
+                scheduled += 1
+
+                # Next send time is fixed by the schedule, not by when this one completes
+                heapq.heappush(heap, (intended + interval, index, seq + 1))
+
+        return self.summarize(scheduled, duration, max_dispatch_lag)
+
+    def summarize(self, scheduled: int, duration: float, max_dispatch_lag: float) -> Dict[str, Any]:
+        """
+        Summarize recorded samples
+        """
+        ok = [s for s in self.samples if s["status"] == "success"]
+        errors = len(self.samples) - len(ok)
+        last_completed = max((s["completed"] for s in self.samples), default=duration)
+
+        return {
+            "machines": len(self.machine_ids),
+            "rate_hz": self.rate_hz,
+            "duration": duration,
+            "scheduled": scheduled,
+            "success": len(ok),
+            "errors": errors,
+            "target_rps": len(self.machine_ids) * self.rate_hz,
+            "achieved_rps": round(len(ok) / last_completed, 2) if last_completed > 0 else 0.0,
+            "latency": summarize([(s["completed"] - s["intended"]) * 1000 for s in ok], errors),
+            "service_time": summarize([(s["completed"] - s["sent"]) * 1000 for s in ok], errors),
+            "max_dispatch_lag_ms": round(max_dispatch_lag * 1000, 2),
+            "peak_outstanding": self._peak_outstanding
+        }
+
+
+def print_summary(summary: Dict[str, Any]):
+    """
+    Print an open-loop run summary
+    """
+    print(f"\n=== Open-loop Load Results ({summary['machines']} machines × {summary['rate_hz']} Hz, "
+          f"{summary['duration']}s) ===")
+    print(f"Scheduled: {summary['scheduled']}  Success: {summary['success']}  Errors: {summary['errors']}")
+    print(f"Target: {summary['target_rps']:.1f} req/s  Achieved: {summary['achieved_rps']:.1f} req/s")
+    print(f"Peak outstanding: {summary['peak_outstanding']}  "
+          f"Max dispatch lag: {summary['max_dispatch_lag_ms']:.1f}ms")
+    print(f"{'':<26} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+    for label, key in (("Latency (from intended)", "latency"), ("Service time (from sent)", "service_time")):
+        stats = summary[key]
+        print(f"{label:<26} {stats['p50']:>9.1f} {stats['p90']:>9.1f} {stats['p99']:>9.1f} {stats['max']:>9.1f}")
+
+
+def main():
+    from async_sender import fleet_machine_ids
+
+    parser = argparse.ArgumentParser(description="Open-loop constant-arrival-rate load generator")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL")
+    parser.add_argument("--machines", type=int, default=100, help="Number of simulated machines")
+    parser.add_argument("--rate", type=float, default=1.0, help="Sends per second per machine")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of scheduled sends")
+    parser.add_argument("--max-outstanding", type=int, default=256, help="Worker threads")
+    parser.add_argument("--burst", action="store_true", help="Fire all machines at the same instant")
+    parser.add_argument("--output", help="Save summary and raw samples to this JSON file")
+    parser.add_argument("--local", action="store_true", help="Load a local stand-in server")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in fixed latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Stand-in random latency")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Stand-in simultaneous request limit")
+
+    args = parser.parse_args()
+
+    server = None
+    if args.local:
+        from local_gas_server import LatencyModel, start_stand_in
+        server = start_stand_in(LatencyModel(args.latency_ms, args.jitter_ms),
+                                max_concurrent=args.max_concurrent)
+        args.url = server.url
+    elif not args.url:
+        parser.error("url is required unless --local is given")
+
+    generator = OpenLoopLoadGenerator(args.url, fleet_machine_ids(args.machines), args.rate,
+                                      args.max_outstanding, stagger=not args.burst)
+
+    print("Open-loop Load Generator")
+    print("=" * 30)
+    print(f"Target: {args.url}")
+
+    try:
+        summary = generator.run(args.duration)
+        print_summary(summary)
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({"summary": summary, "samples": generator.samples}, f, indent=2, ensure_ascii=False)
+            print(f"\nResults saved: {args.output}")
+    except KeyboardInterrupt:
+        print("\nLoad generation interrupted")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Fleet Dead-reckoning Prediction Engine (v2.0.0)
+Computes predicted position, speed, heading and confidence for every
+machine in one vectorized pass, using the same logic as predictPosition
+in vehicle-tracker/src/utils/prediction.ts: the most recent reference
+points, time-weighted mean speed, circular mean heading, and confidence
+from the speed and circular heading variations. Predictions can be
+computed once per ingest and shared by dashboards, monitoring and alerts.
+
+Usage:
+    python3 prediction_engine.py <GAS_WEBAPP_URL> --reference-points 5 --minutes 5
+    python3 prediction_engine.py <GAS_WEBAPP_URL> --interval 60 --output predictions.json
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from telemetry_cache import format_timestamp
+from track_analytics import Track, destination, fleet_track_metrics, track_from_records
+
+# DEFAULT_PREDICTION_CONFIG in prediction.ts
+DEFAULT_REFERENCE_POINTS = 2
+DEFAULT_PREDICTION_MINUTES = 5.0
+
+
+def usable_points(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Points predictPosition accepts (gps_error absent or GPS_ERROR:NONE)
+    """
+    return [r for r in records if r.get("gps_error") in (None, "GPS_ERROR:NONE")]
+
+
+def predict_fleet(tracks: Dict[str, Track], reference_points: Optional[int] = DEFAULT_REFERENCE_POINTS,
+                  prediction_minutes: float = DEFAULT_PREDICTION_MINUTES) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Predict every machine's position prediction_minutes after its latest point
+
+    Args:
+        tracks: {machine_id: (timestamps, latitudes, longitudes)}
+        reference_points: Most recent points to use per machine (None = all, "Unlimited")
+        prediction_minutes: Minutes into the future
+
+    Returns:
+        {machine_id: {latitude, longitude, timestamp, confidence, speed, heading}},
+        or None for machines with fewer than 2 points or no elapsed time
+        (same keys and units as PredictedPosition: km/h, degrees from north)
+    """
+    metrics = fleet_track_metrics(tracks)
+    machine_ids = metrics.machine_ids
+    count_machines = len(machine_ids)
+    if count_machines == 0:
+        return {}
+
+    lengths = np.diff(metrics.offsets)
+    owner = np.repeat(np.arange(count_machines), lengths)
+    position = np.arange(len(metrics)) - np.repeat(metrics.offsets[:-1], lengths)
+    window = lengths if reference_points is None else np.minimum(lengths, reference_points)
+
+    # Segments whose both ends are within the machine's last `window` points
+    use = ~metrics.first & (position >= np.repeat(lengths - window, lengths) + 1)
+    seg_owner = owner[use]
+    span_min = metrics.gap_s[use] / 60
+    speed = metrics.speed_kmh[use]
+    heading = np.radians(metrics.bearing_deg[use])
+
+    segments = np.bincount(seg_owner, minlength=count_machines)
+    total_span = np.bincount(seg_owner, span_min, count_machines)
+    sum_sin = np.bincount(seg_owner, np.sin(heading), count_machines)
+    sum_cos = np.bincount(seg_owner, np.cos(heading), count_machines)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_speed = np.bincount(seg_owner, speed * span_min, count_machines) / total_span
+        avg_heading = (np.degrees(np.arctan2(sum_sin / segments, sum_cos / segments)) + 360) % 360
+
+        # calculateVariation: population std / mean, capped at 1 (1 when mean <= 0)
+        mean_speed = np.bincount(seg_owner, speed, count_machines) / segments
+        variance = np.bincount(seg_owner, (speed - mean_speed[seg_owner]) ** 2, count_machines) / segments
+        speed_variation = np.where(mean_speed > 0, np.minimum(1, np.sqrt(variance) / mean_speed), 1.0)
+
+        # calculateCircularVariation: 1 - mean resultant length
+        heading_variation = 1 - np.sqrt(sum_sin ** 2 + sum_cos ** 2) / segments
+    confidence = np.maximum(0, 1 - (speed_variation + heading_variation) / 2)
+
+    latest = metrics.offsets[1:] - 1
+    valid = (segments > 0) & (total_span != 0)
+    latest = np.where(valid, latest, 0)
+    pred_lat, pred_lng = destination(metrics.latitude[latest], metrics.longitude[latest],
+                                     np.where(valid, avg_speed, 0) * prediction_minutes / 60,
+                                     np.where(valid, avg_heading, 0))
+    pred_time = metrics.timestamp[latest] + prediction_minutes * 60
+
+    predictions = {}
+    for k, machine_id in enumerate(machine_ids):
+        if not valid[k]:
+            predictions[machine_id] = None
+            continue
+        predictions[machine_id] = {
+            "latitude": float(pred_lat[k]),
+            "longitude": float(pred_lng[k]),
+            "timestamp": format_timestamp(float(pred_time[k])),
+            "confidence": float(confidence[k]),
+            "speed": float(avg_speed[k]),
+            "heading": float(avg_heading[k])
+        }
+    return predictions
+
+
+def predict_response(result: Dict[str, Any], reference_points: Optional[int] = DEFAULT_REFERENCE_POINTS,
+                     prediction_minutes: float = DEFAULT_PREDICTION_MINUTES) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Predict from a getAllMachines or getMachine response
+
+    Returns:
+        {machine_id: prediction or None} (see predict_fleet)
+    """
+    if isinstance(result.get("data"), list):
+        machines = [{"machineId": result.get("machineId"), "data": result["data"]}]
+    else:
+        machines = result.get("machines") or []
+    tracks = {m["machineId"]: track_from_records(usable_points(m.get("data", []))) for m in machines}
+    return predict_fleet(tracks, reference_points, prediction_minutes)
+
+
+def print_predictions(predictions: Dict[str, Optional[Dict[str, Any]]]):
+    """
+    Print one line per machine
+    """
+    print(f"{'Machine':<12} {'Latitude':>11} {'Longitude':>12} {'Speed(km/h)':>12} {'Heading':>8} "
+          f"{'Confidence':>11}  Predicted time")
+    for machine_id, p in predictions.items():
+        if p is None:
+            print(f"{machine_id:<12} {'(no prediction: fewer than 2 points or no elapsed time)'}")
+            continue
+        print(f"{machine_id:<12} {p['latitude']:>11.6f} {p['longitude']:>12.6f} {p['speed']:>12.1f} "
+              f"{p['heading']:>8.1f} {p['confidence']:>11.2f}  {p['timestamp']}")
+
+
+def main():
+    from gas_client import GASClient
+
+    parser = argparse.ArgumentParser(description="Fleet dead-reckoning predictions")
+    parser.add_argument("url", help="GAS WebApp URL")
+    parser.add_argument("--reference-points", default=str(DEFAULT_REFERENCE_POINTS),
+                        help="Most recent points per machine, or 'Unlimited'")
+    parser.add_argument("--minutes", type=float, default=DEFAULT_PREDICTION_MINUTES, help="Minutes into the future")
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="Poll every N seconds and recompute only when the data changed")
+    parser.add_argument("--output", help="Write the latest predictions to this JSON file")
+
+    args = parser.parse_args()
+    reference_points = None if args.reference_points.lower() == "unlimited" else int(args.reference_points)
+    client = GASClient(args.url, user_agent="GAS-Prediction-Engine/1.0")
+
+    fingerprint = None
+    try:
+        while True:
+            params = {"fingerprint": fingerprint} if fingerprint else None
+            result = client.get_json("getAllMachines", params)
+            if result.get("status") != "success":
+                print(f"failed: {result.get('message')}")
+            elif not result.get("notModified"):
+                fingerprint = result.get("fingerprint")
+                start_time = time.perf_counter()
+                predictions = predict_response(result, reference_points, args.minutes)
+                elapsed = time.perf_counter() - start_time
+                print_predictions(predictions)
+                print(f"\n{len(predictions)} machines predicted in {elapsed * 1000:.1f}ms\n")
+                if args.output:
+                    with open(args.output, "w", encoding="utf-8") as f:
+                        json.dump({"timestamp": result.get("timestamp"), "predictions": predictions},
+                                  f, indent=2, ensure_ascii=False)
+
+            if args.interval <= 0:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nPrediction stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,11 @@ WebApp endpoint to create new sheets for machines.
 """
 
 import json
-import requests
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from gas_client import GASClient
 
 
 class MachineRegistrar:
@@ -20,19 +23,17 @@ class MachineRegistrar:
             webapp_url: Google Apps Script WebApp URL
         """
         self.webapp_url = webapp_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'GAS-Machine-Registrar/1.0'
-        })
+        self.client = GASClient(webapp_url, user_agent='GAS-Machine-Registrar/1.0')
     
-    def register_machine(self, machine_id: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def register_machine(self, machine_id: str, metadata: Optional[Dict[str, Any]] = None,
+                         verbose: bool = True) -> Dict[str, Any]:
         """
         Register machine (create sheet)
         
         Args:
             machine_id: Machine ID
             metadata: Optional metadata
+            verbose: Print request and response
             
         Returns:
             Response dictionary
@@ -45,41 +46,84 @@ class MachineRegistrar:
         if metadata:
             registration_data["metadata"] = metadata
         
-        try:
+        if verbose:
             print(f"\nRegistration data: {json.dumps(registration_data, indent=2, ensure_ascii=False)}")
+        
+        result = self.client.post_json(registration_data, timeout=30)
+        
+        if verbose:
+            print(f"Response: {json.dumps(result, ensure_ascii=False)}")
+        
+        return result
+    
+    def register_machines_concurrently(self, machine_ids: List[str], max_workers: int = 8,
+                                       metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Register machines with a bounded worker pool
+        
+        Args:
+            machine_ids: List of machine IDs
+            max_workers: Registrations in flight at once
+            metadata: Optional metadata for every machine
             
-            response = self.session.post(
-                self.webapp_url,
-                json=registration_data,
-                timeout=30
-            )
-            
-            print(f"HTTP Status: {response.status_code}")
-            print(f"Response: {response.text}")
+        Returns:
+            Response dictionaries in the same order as machine_ids
+        """
+        self.client.resize_pool(max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda machine_id: self.register_machine(machine_id, metadata, verbose=False),
+                machine_ids
+            ))
+    
+    def register_machines_bulk(self, machine_ids: List[str],
+                               metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Register machines with a single registerMachines request
+        
+        Args:
+            machine_ids: List of machine IDs
+            metadata: Optional metadata for every machine
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {
-                    "status": "error",
-                    "message": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except requests.exceptions.Timeout:
-            return {
-                "status": "error",
-                "message": "Request timeout"
-            }
-        except requests.exceptions.ConnectionError:
-            return {
-                "status": "error",
-                "message": "Connection error"
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Unexpected error: {str(e)}"
-            }
+        Returns:
+            Response dictionaries in the same order as machine_ids
+        """
+        machines = []
+        for machine_id in machine_ids:
+            machine = {"MachineID": machine_id}
+            if metadata:
+                machine["metadata"] = metadata
+            machines.append(machine)
+        
+        result = self.client.post_json({"action": "registerMachines", "machines": machines}, timeout=(5.0, 360.0))
+        
+        if "results" not in result:
+            # The whole request failed: report the same error for every machine
+            return [dict(result, machineId=machine_id) for machine_id in machine_ids]
+        return result["results"]
+    
+    @staticmethod
+    def print_results_table(machine_ids: List[str], results: List[Dict[str, Any]], elapsed: float):
+        """
+        Print one line per machine and the totals
+        
+        Args:
+            machine_ids: List of machine IDs
+            results: Response dictionaries in the same order
+            elapsed: Seconds the registration took
+        """
+        print(f"\n{'Machine ID':<22} {'Status':<8} {'Sheet / Message'}")
+        print("-" * 70)
+        for machine_id, result in zip(machine_ids, results):
+            ok = result.get("status") == "success"
+            detail = result.get("sheetName") if ok else result.get("message")
+            print(f"{machine_id:<22} {'✓ OK' if ok else '✗ FAIL':<8} {detail}")
+        
+        success_count = sum(1 for r in results if r.get("status") == "success")
+        print(f"\n=== Registration Results ===")
+        print(f"Success: {success_count}/{len(machine_ids)}")
+        print(f"Failed: {len(machine_ids) - success_count}/{len(machine_ids)}")
+        print(f"Elapsed: {elapsed:.2f}s")
     
     def register_single_machine(self, machine_id: str):
         """
@@ -127,6 +171,40 @@ class MachineRegistrar:
         print(f"\n=== Registration Results ===")
         print(f"Success: {success_count}/{len(machine_ids)}")
         print(f"Failed: {failed_count}/{len(machine_ids)}")
+    
+    def register_fleet(self, machine_ids: List[str], max_workers: int = 8, bulk: bool = False):
+        """
+        Register a fleet concurrently (or in one bulk request) and print a results table
+        
+        Args:
+            machine_ids: List of machine IDs
+            max_workers: Registrations in flight at once (concurrent mode)
+            bulk: Send a single registerMachines request instead
+        """
+        mode = "bulk request" if bulk else f"{max_workers} workers"
+        print(f"\n=== Fleet Registration (Total: {len(machine_ids)}, {mode}) ===")
+        
+        start_time = time.perf_counter()
+        if bulk:
+            results = self.register_machines_bulk(machine_ids)
+        else:
+            results = self.register_machines_concurrently(machine_ids, max_workers)
+        elapsed = time.perf_counter() - start_time
+        
+        self.print_results_table(machine_ids, results, elapsed)
+
+
+def read_machine_ids() -> List[str]:
+    """
+    Read machine IDs as a comma separated list or a range "00453-00552"
+    """
+    ids_input = input("Machine IDs (comma separated or range, e.g. 00453-00552): ").strip()
+    if "-" in ids_input and "," not in ids_input:
+        start, end = [part.strip() for part in ids_input.split("-", 1)]
+        if start.isdigit() and end.isdigit():
+            width = len(start)
+            return [f"{i:0{width}d}" for i in range(int(start), int(end) + 1)]
+    return [id.strip() for id in ids_input.split(",") if id.strip()]
 
 
 def main():
@@ -156,9 +234,11 @@ def main():
             print("\nMachine Registration Menu:")
             print("1. Single Machine Registration")
             print("2. Multiple Machine Registration")
-            print("3. Exit")
+            print("3. Fleet Registration (concurrent)")
+            print("4. Fleet Registration (single bulk request)")
+            print("5. Exit")
             
-            choice = input("\nPlease select (1-3): ").strip()
+            choice = input("\nPlease select (1-5): ").strip()
             
             if choice == "1":
                 machine_id = input("Machine ID: ").strip()
@@ -178,7 +258,17 @@ def main():
                 else:
                     print("Please enter machine IDs")
             
-            elif choice == "3":
+            elif choice in ("3", "4"):
+                machine_ids = read_machine_ids()
+                if not machine_ids:
+                    print("Please enter machine IDs")
+                elif choice == "3":
+                    max_workers = int(input("Max workers (default: 8): ").strip() or "8")
+                    registrar.register_fleet(machine_ids, max_workers)
+                else:
+                    registrar.register_fleet(machine_ids, bulk=True)
+            
+            elif choice == "5":
                 print("Exiting registration tool")
                 break
             
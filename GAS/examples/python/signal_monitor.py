@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Deadline-heap Signal-loss Monitor (v2.0.0)
+Event-driven counterpart of checkMachineSignals / checkMachineTimeout in
+MachineMonitor.gs. Instead of re-reading every machine sheet each minute,
+it keeps each active machine's expiry deadline (last data + timeout) in a
+min-heap and sleeps until the earliest one, so a machine is reported lost
+within a fraction of a second of its deadline and recovered as soon as
+new data is seen. New telemetry costs O(1), an expiry O(log n).
+
+The lost/recovery transitions and status entries are the same as
+checkMachineTimeout (including the 15-minute duplicate-notification
+guard); events are emitted to a callback and printed as JSON lines.
+
+New data should reach the monitor from the telemetry path (the sender,
+spool replay, or a JSON lines feed of what was posted); getMachineList
+reads every machine sheet, so it only runs as a slow reconciliation loop
+for active flags and data the feed did not see.
+
+Usage:
+    python3 signal_monitor.py <GAS_WEBAPP_URL> --feed telemetry.jsonl --reconcile-interval 300
+    gateway | python3 signal_monitor.py <GAS_WEBAPP_URL> --feed - --events events.jsonl
+
+    from signal_monitor import SignalMonitor
+    monitor = SignalMonitor(on_event=print)
+    monitor.start()
+    result = send_data_to_gas(data, gas_url)
+    monitor.observe_payload(data, result)
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from telemetry_cache import format_timestamp, parse_timestamp
+
+# CONFIG.TIMEOUT_MINUTES
+DEFAULT_TIMEOUT_MINUTES = 10
+# lastNotificationCache: no second lost notification within this window
+DUPLICATE_WINDOW_MINUTES = 15
+
+LOST = "lost"
+NORMAL = "normal"
+
+
+class SignalMonitor:
+    def __init__(self, timeout_minutes: float = DEFAULT_TIMEOUT_MINUTES,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 clock: Callable[[], float] = time.time, history_size: int = 1000):
+        """
+        Signal-loss monitor for a fleet
+
+        Args:
+            timeout_minutes: Minutes without data before a machine is lost
+            on_event: Called with every lost/recovered event (on the
+                thread that detected it; keep it short)
+            clock: Epoch-seconds clock (replaceable for simulations)
+            history_size: Recent events kept in self.events
+        """
+        self.timeout_s = timeout_minutes * 60
+        self.on_event = on_event
+        self.clock = clock
+        self.events = deque(maxlen=history_size)
+
+        # monitorStatus entries (times as epoch seconds)
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self.last_data: Dict[str, float] = {}
+        self.active: Dict[str, bool] = {}
+        self._last_lost_notification: Dict[str, float] = {}
+
+        # (deadline, machine_id); at most one entry per machine, see _scheduled
+        self._heap: List[tuple] = []
+        self._scheduled: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # ---- input ---------------------------------------------------------
+
+    def observe(self, machine_id: str, last_data_time: float, is_active: bool = True,
+                now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Report a machine's latest data time and active flag (K1)
+
+        Cheap when nothing changed, so it can be called for every machine
+        of every getMachineList poll or for every received data point.
+
+        Args:
+            machine_id: Machine ID
+            last_data_time: GAS Time of the machine's last row (epoch seconds)
+            is_active: Whether the machine is monitored
+            now: Current time (defaults to the clock)
+
+        Returns:
+            Events caused by this report (a recovery, or a loss of a machine
+            that became active with old data)
+        """
+        with self._condition:
+            was_active = self.active.get(machine_id, False)
+            previous = self.last_data.get(machine_id)
+            self.active[machine_id] = is_active
+            if previous is None or last_data_time > previous:
+                self.last_data[machine_id] = last_data_time
+            if not is_active:
+                return []
+            if was_active and previous is not None and last_data_time <= previous:
+                return []
+
+            # New data or newly active: evaluate now, as the next check would
+            event = self._check(machine_id, self.clock() if now is None else now)
+            self._schedule(machine_id)
+            self._condition.notify()
+        return [event] if event else []
+
+    def observe_record(self, machine_id: str, record: Dict[str, Any], is_active: bool = True) -> List[Dict[str, Any]]:
+        """
+        Report a read-schema data point (its GAS Time "timestamp")
+        """
+        timestamp = parse_timestamp(record.get("timestamp"))
+        if timestamp != timestamp:
+            return []
+        return self.observe(machine_id, timestamp, is_active)
+
+    def observe_payload(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+                        result: Optional[Dict[str, Any]],
+                        now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Report telemetry as it is posted (single payload or batch array)
+
+        Only records the response says were saved are reported (a batch is
+        matched against "results"; a failed send's None reports nothing).
+
+        Args:
+            payload: POST payload (wire format) or a list of them
+            result: Response of that POST
+            now: Receive time (defaults to the clock)
+
+        Returns:
+            Events caused by the saved records
+        """
+        if not result:
+            return []
+        if isinstance(payload, list):
+            results = result.get("results") or []
+            saved = [record for record, r in zip(payload, results)
+                     if isinstance(r, dict) and r.get("status") == "success"]
+        else:
+            saved = [payload] if result.get("status") == "success" else []
+        return self.observe_saved(saved, now)
+
+    def observe_saved(self, records: List[Dict[str, Any]], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Report wire-format records known to be saved
+
+        The WebApp stamps GAS Time on receipt, so the data time is taken as
+        now; the machine's active flag is kept from the last reconciliation
+        (machines not seen yet count as active).
+        """
+        now = self.clock() if now is None else now
+        events = []
+        for record in records:
+            machine_id = record.get("MachineID") if isinstance(record, dict) else None
+            if machine_id:
+                events.extend(self.observe(machine_id, now, self.active.get(machine_id, True), now))
+        return events
+
+    def observe_machine_list(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Report every machine of a getMachineList response (isActive, lastUpdate)
+
+        Reads every machine sheet on the server, so use it to reconcile
+        active flags and missed data, not as the main data feed.
+        """
+        events = []
+        for machine in result.get("machines") or []:
+            last_update = parse_timestamp(machine.get("lastUpdate"))
+            if last_update != last_update:
+                continue
+            # Same test as getActiveMachines (K1 is true or 'TRUE')
+            is_active = machine.get("isActive") in (True, "TRUE")
+            events.extend(self.observe(machine["machineId"], last_update, is_active))
+        return events
+
+    def observe_line(self, line: str) -> List[Dict[str, Any]]:
+        """
+        Report one JSON line of a telemetry feed
+
+        Lines are POST payloads (MachineID, wire format; received now) or
+        read-schema points (machineId and GAS Time "timestamp").
+        """
+        line = line.strip()
+        if not line:
+            return []
+        try:
+            item = json.loads(line)
+        except ValueError:
+            return []
+        if isinstance(item, list):
+            return self.observe_saved(item)
+        if isinstance(item, dict) and "MachineID" in item:
+            return self.observe_saved([item])
+        if isinstance(item, dict) and item.get("machineId"):
+            machine_id = item["machineId"]
+            return self.observe_record(machine_id, item, self.active.get(machine_id, True))
+        return []
+
+    # ---- checks --------------------------------------------------------
+
+    def _schedule(self, machine_id: str):
+        # Keep one heap entry per normal, active machine; an entry that
+        # fires early (newer data arrived since) is pushed back in expire()
+        if machine_id in self._scheduled or self.status.get(machine_id, {}).get("status") == LOST:
+            return
+        deadline = self.last_data[machine_id] + self.timeout_s
+        self._scheduled[machine_id] = deadline
+        heapq.heappush(self._heap, (deadline, machine_id))
+
+    def _check(self, machine_id: str, now: float) -> Optional[Dict[str, Any]]:
+        """Equivalent of checkMachineTimeout; returns the transition event, if any"""
+        last_data_time = self.last_data[machine_id]
+        diff_minutes = (now - last_data_time) / 60
+        current = self.status.get(machine_id, {"status": NORMAL, "notificationCount": 0, "firstLostTime": None})
+
+        if diff_minutes * 60 >= self.timeout_s:
+            if current["status"] == LOST:
+                return None
+            last_notification = self._last_lost_notification.get(machine_id)
+            since_notification = (now - last_notification) / 60 if last_notification is not None else 999
+            notified = since_notification > DUPLICATE_WINDOW_MINUTES
+            if notified:
+                self._last_lost_notification[machine_id] = now
+            self.status[machine_id] = {
+                "status": LOST,
+                "lastNotified": now,
+                "lastDataReceived": last_data_time,
+                "notificationCount": 1,
+                "firstLostTime": now
+            }
+            return self._emit({
+                "type": LOST,
+                "machineId": machine_id,
+                "lastDataTime": format_timestamp(last_data_time),
+                "lostMinutes": diff_minutes,
+                "notificationCount": 1,
+                "notified": notified,
+                "timestamp": format_timestamp(now)
+            })
+
+        if current["status"] == LOST:
+            lost_minutes = (now - current["firstLostTime"]) / 60
+            self.status[machine_id] = {
+                "status": NORMAL,
+                "lastNotified": now,
+                "lastDataReceived": last_data_time,
+                "notificationCount": 0,
+                "firstLostTime": None
+            }
+            return self._emit({
+                "type": "recovered",
+                "machineId": machine_id,
+                "lastDataTime": format_timestamp(last_data_time),
+                "lostMinutes": lost_minutes,
+                "notificationCount": current["notificationCount"],
+                "notified": True,
+                "timestamp": format_timestamp(now)
+            })
+
+        if current.get("lastDataReceived") != last_data_time:
+            self.status[machine_id] = dict(current, lastDataReceived=last_data_time)
+        return None
+
+    def _emit(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        self.events.append(event)
+        if self.on_event is not None:
+            self.on_event(event)
+        return event
+
+    def expire(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Process every deadline that has passed
+
+        Returns:
+            Lost events
+        """
+        events = []
+        with self._condition:
+            now = self.clock() if now is None else now
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, machine_id = heapq.heappop(heap)
+                del self._scheduled[machine_id]
+                if not self.active.get(machine_id):
+                    continue
+                if self.last_data[machine_id] + self.timeout_s > now:
+                    # Data arrived after this entry was pushed
+                    self._schedule(machine_id)
+                    continue
+                event = self._check(machine_id, now)
+                if event:
+                    events.append(event)
+        return events
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        Earliest pending deadline (epoch seconds), or None
+        """
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    # ---- background thread ---------------------------------------------
+
+    def run(self):
+        """
+        Sleep until the next deadline (or a new observation) and expire, until stop()
+        """
+        with self._condition:
+            while not self._stopping:
+                deadline = self._heap[0][0] if self._heap else None
+                wait = None if deadline is None else max(deadline - self.clock(), 0.0)
+                if wait is None or wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                self._condition.release()
+                try:
+                    self.expire()
+                finally:
+                    self._condition.acquire()
+
+    def start(self) -> "SignalMonitor":
+        """
+        Run the monitor on a daemon thread
+        """
+        self._stopping = False
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ---- status --------------------------------------------------------
+
+    def monitor_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Status entries as stored in the Monitor sheet (ISO times)
+        """
+        with self._condition:
+            result = {}
+            for machine_id, entry in self.status.items():
+                formatted = dict(entry)
+                for key in ("lastNotified", "lastDataReceived", "firstLostTime"):
+                    if isinstance(formatted.get(key), float):
+                        formatted[key] = format_timestamp(formatted[key])
+                result[machine_id] = formatted
+            return result
+
+    def lost_machines(self) -> List[str]:
+        with self._condition:
+            return [machine_id for machine_id, entry in self.status.items() if entry["status"] == LOST]
+
+
+def follow_lines(path: str, stop: threading.Event, interval: float = 0.2) -> Iterator[str]:
+    """
+    Lines of a feed: stdin ("-") until EOF, or a file followed like tail -f
+    """
+    if path == "-":
+        yield from sys.stdin
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        f.seek(0, 2)
+        pending = ""
+        while not stop.is_set():
+            chunk = f.readline()
+            if not chunk:
+                time.sleep(interval)
+                continue
+            pending += chunk
+            if pending.endswith("\n"):
+                yield pending
+                pending = ""
+
+
+def main():
+    from gas_client import GASClient
+
+    parser = argparse.ArgumentParser(description="Event-driven machine signal-loss monitor")
+    parser.add_argument("url", help="GAS WebApp URL")
+    parser.add_argument("--feed", help="JSON lines of posted telemetry to follow ('-' for stdin)")
+    parser.add_argument("--reconcile-interval", type=float, default=300.0,
+                        help="Seconds between getMachineList reconciliations (0: only at start)")
+    parser.add_argument("--timeout-minutes", type=float, default=DEFAULT_TIMEOUT_MINUTES,
+                        help="Minutes without data before a machine is lost (CONFIG.TIMEOUT_MINUTES)")
+    parser.add_argument("--events", help="Also append events to this JSON lines file")
+
+    args = parser.parse_args()
+    client = GASClient(args.url, user_agent="GAS-Signal-Monitor/1.0")
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def on_event(event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False)
+        with lock:
+            print(line, flush=True)
+            if args.events:
+                with open(args.events, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def reconcile():
+        result = client.get_json("getMachineList")
+        if result.get("status") == "success":
+            monitor.observe_machine_list(result)
+        else:
+            print(f"failed: {result.get('message')}", flush=True)
+
+    monitor = SignalMonitor(args.timeout_minutes, on_event=on_event).start()
+    print(f"Monitoring {args.url} (timeout {args.timeout_minutes} min, feed {args.feed or 'none'}, "
+          f"reconcile every {args.reconcile_interval}s)", flush=True)
+
+    try:
+        reconcile()
+        if args.reconcile_interval > 0:
+            def reconcile_loop():
+                while not stop.wait(args.reconcile_interval):
+                    reconcile()
+            threading.Thread(target=reconcile_loop, daemon=True).start()
+
+        if args.feed:
+            for line in follow_lines(args.feed, stop):
+                monitor.observe_line(line)
+        # Feed ended (or none given): keep timing out machines until interrupted
+        while not stop.wait(3600):
+            pass
+    except KeyboardInterrupt:
+        print("\nMonitor stopped")
+    finally:
+        stop.set()
+        monitor.stop()
+
+
+if __name__ == "__main__":
+    main()
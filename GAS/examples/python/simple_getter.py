@@ -1,15 +1,18 @@
 # GASからJsonデータを取得するためのスクリプト
 
-import requests
 import json
 
-def get_data_from_gas(gas_url, action, machine_id=None):
+from gas_client import get_session
+
+def get_data_from_gas(gas_url, action, machine_id=None, params=None):
     try:
-        params = {'action': action}
+        query = {'action': action}
         if machine_id:
-            params['machineId'] = machine_id
+            query['machineId'] = machine_id
+        if params:
+            query.update(params)
         
-        response = requests.get(gas_url, params=params)
+        response = get_session().get(gas_url, params=query)
         
         if response.status_code == 200:
             result = response.json()
@@ -24,6 +27,74 @@ def get_data_from_gas(gas_url, action, machine_id=None):
         print(f"error: {e}")
         return None
 
+def get_machine_since(gas_url, machine_id, since_row=None, since=None):
+    # sinceRow（シート行番号）または since（ISO タイムスタンプ）より後の行だけを取得
+    params = {}
+    if since_row is not None:
+        params['sinceRow'] = since_row
+    elif since is not None:
+        params['since'] = since
+    return get_data_from_gas(gas_url, "getMachine", machine_id, params)
+
+class IncrementalGetter:
+    # 機体ごとのカーソル（最後に読んだシート行番号）を保持し、新しい行だけを取得する
+    def __init__(self, gas_url):
+        self.gas_url = gas_url
+        self.cursors = {}
+        self.records = {}
+
+    def poll(self, machine_id):
+        cursor = self.cursors.get(machine_id)
+        result = get_machine_since(self.gas_url, machine_id, since_row=cursor)
+        if not result or result.get('status') != 'success':
+            return []
+
+        last_row = result.get('lastRow')
+        if cursor is not None and last_row is not None and last_row < cursor:
+            # 行が削除された（シートが作り直された）場合は全件取得し直す
+            self.reset(machine_id)
+            return self.poll(machine_id)
+
+        new_records = result.get('data', [])
+        if last_row is None:
+            # lastRow を返さない（sinceRow 非対応の）バックエンドでは毎回全件が返るので置き換える
+            self.records[machine_id] = list(new_records)
+            return new_records
+
+        self.records.setdefault(machine_id, []).extend(new_records)
+        self.cursors[machine_id] = last_row
+        return new_records
+
+    def reset(self, machine_id=None):
+        if machine_id is None:
+            self.cursors.clear()
+            self.records.clear()
+        else:
+            self.cursors.pop(machine_id, None)
+            self.records.pop(machine_id, None)
+
+class ConditionalGetter:
+    # 前回の fingerprint を送り、変化がなければ notModified だけを受け取って前回の結果を再利用する
+    def __init__(self, gas_url):
+        self.gas_url = gas_url
+        self.fingerprint = None
+        self.result = None
+
+    def poll(self):
+        # 戻り値: (変化したか, 全機体データ)
+        params = {'fingerprint': self.fingerprint} if self.fingerprint else None
+        result = get_data_from_gas(self.gas_url, "getAllMachines", params=params)
+        if not result or result.get('status') != 'success':
+            return False, self.result
+
+        if result.get('notModified'):
+            return False, self.result
+
+        # fingerprint を返さない古いバックエンドでは毎回全件取得になる
+        self.fingerprint = result.get('fingerprint')
+        self.result = result
+        return True, result
+
 if __name__ == "__main__":
     # GAS WebApp URL
     gas_url = "https://script.google.com/macros/s/AKfycbys_1sl065_wV_0RusA_aIOxtA3HUuqizsItE7q8g6Qq9vyrd836MtfSKtc5oRh0PRCcA/exec"
@@ -53,6 +124,23 @@ if __name__ == "__main__":
     
     print("\n" + "="*50 + "\n")
     
+    # 差分取得（2回目以降は前回の lastRow より後の行だけを取得）
+    print(f"Polling new data for machine {machine_id}...")
+    getter = IncrementalGetter(gas_url)
+    print(f"First poll: {len(getter.poll(machine_id))} records (cursor: {getter.cursors.get(machine_id)})")
+    print(f"Next poll: {len(getter.poll(machine_id))} new records (cursor: {getter.cursors.get(machine_id)})")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # 条件付き取得（変化がなければ notModified だけが返る）
+    print("Polling all machines with fingerprint...")
+    conditional = ConditionalGetter(gas_url)
+    for i in range(2):
+        changed, result = conditional.poll()
+        print(f"Poll {i + 1}: {'modified' if changed else 'not modified'} (fingerprint: {conditional.fingerprint})")
+    
+    print("\n" + "="*50 + "\n")
+    
     # 機体リストを取得
     print("Getting machine list...")
     machine_list = get_data_from_gas(gas_url, "getMachineList")
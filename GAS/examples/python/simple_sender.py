@@ -2,17 +2,51 @@
 Google Apps Script WebApp Test Data Sender (v2.0.0)
 Made by Shintaro Matsumoto
 """
-import requests
 import json
+import threading
+import time
 from datetime import datetime
 
-def send_data_to_gas(data, gas_url):
+from gas_client import get_session, make_idempotency_key
+from telemetry_spool import delivered_prefix
+
+_sequence_lock = threading.Lock()
+_sequences = {}
+
+def assign_idempotency_key(data):
+    """
+    Stamp a record with MachineID:MachineTime:sequence (kept if already set),
+    so a replay of a POST that reached the WebApp is not saved twice.
+    """
+    if "IdempotencyKey" not in data:
+        machine_id = data.get("MachineID", "")
+        with _sequence_lock:
+            sequence = _sequences.get(machine_id, 0) + 1
+            _sequences[machine_id] = sequence
+        data["IdempotencyKey"] = make_idempotency_key(machine_id, data.get("MachineTime", ""), sequence)
+    return data["IdempotencyKey"]
+
+def send_data_to_gas(data, gas_url, spool=None):
+    """
+    Send one telemetry record. With a TelemetrySpool, records that cannot be
+    delivered are spooled instead of dropped, and while a backlog exists new
+    records are queued behind it so the sheet keeps machine order.
+    With a spool the record gets an IdempotencyKey before the first attempt,
+    so a spooled copy of a POST that did land is answered as a duplicate.
+    """
+    if spool is not None:
+        assign_idempotency_key(data)
+    if spool is not None and spool.pending:
+        spool.append(data)
+        drain_spool(spool, gas_url)
+        return None
+    
     headers = {
         'Content-Type': 'application/json'
     }
     
     try:
-        response = requests.post(
+        response = get_session().post(
             gas_url,
             data=json.dumps(data),
             headers=headers
@@ -25,12 +59,154 @@ def send_data_to_gas(data, gas_url):
         else:
             print(f"failed: {response.status_code}")
             print(f"response: {response.text}")
+            
+    except Exception as e:
+        print(f"error: {e}")
+    
+    if spool is not None:
+        spool.append(data)
+        print(f"spooled: {spool.pending} records pending")
+    return None
+
+def send_batch_to_gas(records, gas_url):
+    """
+    Send multiple telemetry records as one JSON array payload.
+    The WebApp answers with one entry per record in "results" (same order).
+    """
+    headers = {
+        'Content-Type': 'application/json'
+    }
+    
+    try:
+        response = get_session().post(
+            gas_url,
+            data=json.dumps(records),
+            headers=headers
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            print(f"batch: {result.get('status')} ({result.get('savedCount')}/{len(records)} saved)")
+            return result
+        else:
+            print(f"failed: {response.status_code}")
+            print(f"response: {response.text}")
             return None
             
     except Exception as e:
         print(f"error: {e}")
         return None
 
+def drain_spool(spool, gas_url, batch_size=50):
+    """
+    Replay spooled records as batch POSTs, oldest first.
+    Only the leading records the WebApp saved are acked; replay stops at
+    the first record that was not saved and leaves it (and the rest) spooled.
+    """
+    def send_batch(records):
+        return delivered_prefix(send_batch_to_gas(records, gas_url), len(records))
+    
+    delivered = spool.drain(send_batch, batch_size=batch_size)
+    if delivered:
+        print(f"replayed: {delivered} records ({spool.pending} pending)")
+    return delivered
+
+class TelemetryBatcher:
+    """
+    Buffer create_sensor_data records and flush them as one POST.
+    A flush happens when max_records are buffered or the oldest buffered
+    record is older than max_age seconds. on_flush(pairs) is called with
+    the (record, result) pairs of every flush, including background ones.
+    """
+    
+    def __init__(self, gas_url, max_records=50, max_age=5.0, on_flush=None):
+        self.gas_url = gas_url
+        self.max_records = max_records
+        self.max_age = max_age
+        self.on_flush = on_flush
+        self._buffer = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def add(self, record):
+        """
+        Buffer a record. Returns flush results if this record triggered a flush.
+        """
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(record)
+            should_flush = len(self._buffer) >= self.max_records
+        
+        if should_flush or self._is_expired():
+            return self.flush()
+        return None
+    
+    def _is_expired(self):
+        with self._lock:
+            return bool(self._buffer) and time.monotonic() - self._oldest >= self.max_age
+    
+    def flush(self):
+        """
+        Send buffered records. Returns a list of (record, result) pairs.
+        If the whole request fails, every record gets an error result.
+        """
+        # Serialize flushes so batches reach the sheet in buffer order
+        with self._send_lock:
+            with self._lock:
+                records = self._buffer
+                self._buffer = []
+                self._oldest = None
+            
+            if not records:
+                return []
+            
+            response = send_batch_to_gas(records, self.gas_url)
+            results = (response or {}).get('results')
+            
+            if not results or len(results) != len(records):
+                message = (response or {}).get('message', 'Batch request failed')
+                results = [{"index": i, "status": "error", "message": message} for i in range(len(records))]
+            
+            pairs = list(zip(records, results))
+            if self.on_flush:
+                self.on_flush(pairs)
+            return pairs
+    
+    def start(self):
+        """
+        Start a background thread that flushes by age even when no records arrive.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while not self._stop.wait(self.max_age / 2):
+            if self._is_expired():
+                self.flush()
+    
+    def close(self):
+        """
+        Stop the background thread and flush remaining records.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.flush()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 def create_sensor_data(machine_id, latitude, longitude, altitude, gps_satellites, battery, comment):
     return {
         "DataType": "HK",
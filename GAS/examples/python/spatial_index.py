@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Spatial Index over Telemetry Fixes (v2.0.0)
+Answers "which fixes or machines are in this area (and time window)"
+without scanning every row. Fixes are bucketed into a fixed lat/lng grid
+(geohash-style cells) as they arrive, and each machine's latest position
+is kept in a second grid for nearest-machine queries. Fixes are stored
+column-wise, so millions of them fit in a few tens of megabytes.
+
+Usage:
+    python3 spatial_index.py <GAS_WEBAPP_URL> --bbox 35.6,139.6,35.8,139.9
+    python3 spatial_index.py --cache ./cache --near 35.68,139.76 --radius-km 2
+
+    from spatial_index import SpatialIndex
+    index = SpatialIndex(cell_deg=0.01)
+    index.add_response(result)
+    index.bbox(35.6, 139.6, 35.8, 139.9, start=t0, end=t1)
+    index.bbox(-20.0, 179.0, -15.0, -179.0)   # west > east crosses the antimeridian
+    index.radius(35.68, 139.76, 2.0)
+    index.nearest_machines(35.68, 139.76, k=3)
+"""
+
+import argparse
+import heapq
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from telemetry_cache import TelemetryCache, parse_timestamp
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# About 1.1 km north-south
+DEFAULT_CELL_DEG = 0.01
+
+
+class Fix(NamedTuple):
+    machine_id: str
+    timestamp: float   # epoch seconds
+    latitude: float
+    longitude: float
+
+
+def wrap_longitude(longitude: float) -> float:
+    """
+    Normalize a longitude to [-180, 180)
+    """
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in kilometers (same formula as prediction.ts)
+    """
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = (math.sin(d_lat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2)
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class SpatialIndex:
+    def __init__(self, cell_deg: float = DEFAULT_CELL_DEG):
+        """
+        Grid index of fixes, built incrementally
+
+        Grid columns wrap at the antimeridian, so fixes at 179.9 and -179.9
+        are neighbours for nearest-machine queries.
+
+        Args:
+            cell_deg: Grid cell size in degrees; pick it near the typical query size
+        """
+        self.cell_deg = cell_deg
+        # Columns around the globe; column 0 starts at -180
+        self.columns = math.ceil(360.0 / cell_deg)
+        # Fix columns, indexed by fix id
+        self.timestamp = array("d")
+        self.latitude = array("d")
+        self.longitude = array("d")
+        self.machine = array("i")
+        self.machine_ids: List[str] = []
+        self._machine_codes: Dict[str, int] = {}
+        # cell -> fix ids
+        self.cells: Dict[Tuple[int, int], array] = {}
+        # machine code -> latest fix id, and cell -> machine codes at their latest fix
+        self.latest: Dict[int, int] = {}
+        self._latest_cells: Dict[Tuple[int, int], Set[int]] = {}
+        # (min_row, max_row, min_col, max_col) of every latest position seen
+        self._extent: Optional[Tuple[int, int, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """
+        Grid cell (row, column) of a position (column wraps at the antimeridian)
+        """
+        column = math.floor((wrap_longitude(longitude) + 180.0) / self.cell_deg)
+        return math.floor(latitude / self.cell_deg), min(column, self.columns - 1)
+
+    def _longitude_ranges(self, min_lng: float, max_lng: float) -> List[Tuple[float, float]]:
+        """
+        Split a west..east longitude span into ranges inside [-180, 180]
+
+        A span with west > east (after wrapping) crosses the antimeridian and
+        becomes two ranges; a span of 360 degrees or more covers everything.
+        """
+        if max_lng - min_lng >= 360.0:
+            return [(-180.0, 180.0)]
+        west, east = wrap_longitude(min_lng), wrap_longitude(max_lng)
+        if east == -180.0 and max_lng > min_lng:
+            east = 180.0
+        if west <= east:
+            return [(west, east)]
+        return [(west, 180.0), (-180.0, east)]
+
+    # ---- building ------------------------------------------------------
+
+    def add(self, machine_id: str, timestamp: float, latitude: float, longitude: float) -> int:
+        """
+        Add one fix
+
+        Args:
+            machine_id: Machine ID
+            timestamp: Epoch seconds
+            latitude, longitude: Degrees
+
+        Returns:
+            Fix id
+        """
+        code = self._machine_codes.get(machine_id)
+        if code is None:
+            code = self._machine_codes[machine_id] = len(self.machine_ids)
+            self.machine_ids.append(machine_id)
+
+        fix_id = len(self.timestamp)
+        self.timestamp.append(timestamp)
+        self.latitude.append(latitude)
+        self.longitude.append(longitude)
+        self.machine.append(code)
+
+        key = self.cell(latitude, longitude)
+        ids = self.cells.get(key)
+        if ids is None:
+            ids = self.cells[key] = array("i")
+        ids.append(fix_id)
+
+        previous = self.latest.get(code)
+        if previous is None or timestamp >= self.timestamp[previous]:
+            if previous is not None:
+                old_key = self.cell(self.latitude[previous], self.longitude[previous])
+                if old_key != key:
+                    members = self._latest_cells[old_key]
+                    members.discard(code)
+                    if not members:
+                        del self._latest_cells[old_key]
+            self._latest_cells.setdefault(key, set()).add(code)
+            self.latest[code] = fix_id
+            if self._extent is None:
+                self._extent = (key[0], key[0], key[1], key[1])
+            elif not (self._extent[0] <= key[0] <= self._extent[1] and self._extent[2] <= key[1] <= self._extent[3]):
+                min_row, max_row, min_col, max_col = self._extent
+                self._extent = (min(min_row, key[0]), max(max_row, key[0]),
+                                min(min_col, key[1]), max(max_col, key[1]))
+        return fix_id
+
+    def add_record(self, machine_id: str, record: Dict[str, Any]) -> Optional[int]:
+        """
+        Add one read-schema data point
+
+        Points without a timestamp or at (0, 0) (the backend's value for a
+        missing coordinate) are skipped.
+
+        Returns:
+            Fix id, or None if skipped
+        """
+        latitude = record.get("latitude") or 0.0
+        longitude = record.get("longitude") or 0.0
+        timestamp = parse_timestamp(record.get("timestamp"))
+        if math.isnan(timestamp) or (latitude == 0.0 and longitude == 0.0):
+            return None
+        return self.add(machine_id, timestamp, latitude, longitude)
+
+    def add_records(self, machine_id: str, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add a machine's data points
+
+        Returns:
+            Number of fixes added
+        """
+        return sum(1 for record in records if self.add_record(machine_id, record) is not None)
+
+    def add_response(self, result: Dict[str, Any]) -> int:
+        """
+        Add a getMachine or getAllMachines response (or a sinceRow delta)
+
+        Returns:
+            Number of fixes added
+        """
+        if isinstance(result.get("data"), list):
+            return self.add_records(result.get("machineId"), result["data"])
+        return sum(self.add_records(m["machineId"], m.get("data", [])) for m in result.get("machines") or [])
+
+    def add_cache(self, cache: TelemetryCache) -> int:
+        """
+        Add every fix of a local telemetry cache
+
+        Returns:
+            Number of fixes added
+        """
+        added = 0
+        for machine_id, track in cache.load_all().items():
+            timestamps, latitudes, longitudes = (track.column(n) for n in ("timestamp", "latitude", "longitude"))
+            for t, lat, lng in zip(timestamps, latitudes, longitudes):
+                if t == t and (lat != 0.0 or lng != 0.0):
+                    self.add(machine_id, t, lat, lng)
+                    added += 1
+        return added
+
+    # ---- queries -------------------------------------------------------
+
+    def fix(self, fix_id: int) -> Fix:
+        return Fix(self.machine_ids[self.machine[fix_id]], self.timestamp[fix_id],
+                   self.latitude[fix_id], self.longitude[fix_id])
+
+    def bbox_ids(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                 start: Optional[float] = None, end: Optional[float] = None,
+                 machine_id: Optional[str] = None) -> List[int]:
+        """
+        Ids of fixes inside a bounding box (edges included)
+
+        Args:
+            min_lat, min_lng, max_lat, max_lng: Box in degrees; min_lng > max_lng
+                (e.g. 179.0 .. -179.0) is a box across the antimeridian
+            start, end: Optional time window in epoch seconds (inclusive)
+            machine_id: Only this machine's fixes
+
+        Returns:
+            Fix ids in no particular order
+        """
+        code = None
+        if machine_id is not None:
+            code = self._machine_codes.get(machine_id)
+            if code is None:
+                return []
+
+        lo = -math.inf if start is None else start
+        hi = math.inf if end is None else end
+        result = []
+        for west, east in self._longitude_ranges(min_lng, max_lng):
+            self._collect_box(result, min_lat, west, max_lat, east, lo, hi,
+                              start is not None or end is not None, code)
+        return result
+
+    def _collect_box(self, result: List[int], min_lat: float, min_lng: float, max_lat: float,
+                     max_lng: float, lo: float, hi: float, has_time: bool, code: Optional[int]):
+        """
+        Append fix ids inside a box that does not cross the antimeridian
+        """
+        row0, col0 = self.cell(min_lat, min_lng)
+        row1 = math.floor(max_lat / self.cell_deg)
+        col1 = self.columns - 1 if max_lng >= 180.0 else self.cell(max_lat, max_lng)[1]
+        lat, lng, ts, machine = self.latitude, self.longitude, self.timestamp, self.machine
+
+        cells = self.cells
+        if (row1 - row0 + 1) * (col1 - col0 + 1) > len(cells):
+            # Box larger than the occupied grid: visit occupied cells instead
+            keys = [k for k in cells if row0 <= k[0] <= row1 and col0 <= k[1] <= col1]
+        else:
+            keys = [(r, c) for r in range(row0, row1 + 1) for c in range(col0, col1 + 1) if (r, c) in cells]
+
+        for key in keys:
+            ids = cells[key]
+            inner = row0 < key[0] < row1 and col0 < key[1] < col1
+            if inner and not has_time and code is None:
+                result.extend(ids)
+                continue
+            for i in ids:
+                if (inner or (min_lat <= lat[i] <= max_lat and min_lng <= wrap_longitude(lng[i]) <= max_lng)) and \
+                        lo <= ts[i] <= hi and (code is None or machine[i] == code):
+                    result.append(i)
+
+    def bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+             start: Optional[float] = None, end: Optional[float] = None,
+             machine_id: Optional[str] = None) -> List[Fix]:
+        """
+        Fixes inside a bounding box, sorted by (machine, time) (see bbox_ids)
+        """
+        ids = self.bbox_ids(min_lat, min_lng, max_lat, max_lng, start, end, machine_id)
+        ids.sort(key=lambda i: (self.machine[i], self.timestamp[i]))
+        return [self.fix(i) for i in ids]
+
+    def _radius_box(self, latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+        d_lat = radius_km / KM_PER_DEG_LAT
+        cos_lat = math.cos(math.radians(min(abs(latitude) + d_lat, 89.9)))
+        d_lng = min(radius_km / (KM_PER_DEG_LAT * cos_lat), 180.0)
+        return latitude - d_lat, longitude - d_lng, latitude + d_lat, longitude + d_lng
+
+    def radius(self, latitude: float, longitude: float, radius_km: float,
+               start: Optional[float] = None, end: Optional[float] = None,
+               machine_id: Optional[str] = None) -> List[Tuple[float, Fix]]:
+        """
+        Fixes within radius_km of a point
+
+        Returns:
+            [(distance_km, Fix)] sorted by distance
+        """
+        ids = self.bbox_ids(*self._radius_box(latitude, longitude, radius_km), start, end, machine_id)
+        hits = []
+        for i in ids:
+            distance = haversine_km(latitude, longitude, self.latitude[i], self.longitude[i])
+            if distance <= radius_km:
+                hits.append((distance, i))
+        hits.sort()
+        return [(distance, self.fix(i)) for distance, i in hits]
+
+    def machines_in(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                    start: Optional[float] = None, end: Optional[float] = None) -> Set[str]:
+        """
+        Machines with at least one fix inside the box (and time window)
+        """
+        codes = {self.machine[i] for i in self.bbox_ids(min_lat, min_lng, max_lat, max_lng, start, end)}
+        return {self.machine_ids[code] for code in codes}
+
+    def latest_fix(self, machine_id: str) -> Optional[Fix]:
+        code = self._machine_codes.get(machine_id)
+        return None if code is None else self.fix(self.latest[code])
+
+    def nearest_machines(self, latitude: float, longitude: float, k: int = 1,
+                         max_km: Optional[float] = None) -> List[Tuple[float, Fix]]:
+        """
+        Machines whose latest fix is nearest to a point
+
+        Searches rings of grid cells outward from the point (wrapping columns
+        at the antimeridian) and stops once no unvisited cell can hold a
+        closer machine.
+
+        Args:
+            latitude, longitude: Query point
+            k: Machines to return
+            max_km: Ignore machines farther than this
+
+        Returns:
+            [(distance_km, latest Fix)] nearest first
+        """
+        if k <= 0 or not self.latest:
+            return []
+
+        def distance(code: int) -> float:
+            i = self.latest[code]
+            return haversine_km(latitude, longitude, self.latitude[i], self.longitude[i])
+
+        if len(self.latest) <= 64:
+            candidates = [(distance(code), code) for code in self.latest]
+        else:
+            row, col = self.cell(latitude, longitude)
+            occupied = self._latest_cells
+            min_row, max_row, min_col, max_col = self._extent
+            # Columns wrap, so no occupied column is more than half the globe away
+            col_ring = min(max(abs(col - min_col), abs(col - max_col)), self.columns // 2)
+            max_ring = max(abs(row - min_row), abs(row - max_row), col_ring)
+
+            candidates = []
+            visited = set()
+            ring = 0
+            while ring <= max_ring:
+                if ring == 0:
+                    keys = [(row, col)]
+                else:
+                    keys = [(row + dr, col + dc) for dr in (-ring, ring) for dc in range(-ring, ring + 1)]
+                    keys += [(row + dr, col + dc) for dc in (-ring, ring) for dr in range(-ring + 1, ring)]
+                for r, c in keys:
+                    key = (r, c % self.columns)
+                    if key in visited:
+                        # Wide rings reach the same column from both sides
+                        continue
+                    visited.add(key)
+                    for code in occupied.get(key, ()):
+                        candidates.append((distance(code), code))
+
+                # Anything outside this ring is at least `ring` cells away, and a
+                # cell is narrowest east-west at the ring's poleward edge
+                edge_lat = min(abs(latitude) + (ring + 1) * self.cell_deg, 89.9)
+                reach = ring * self.cell_deg * KM_PER_DEG_LAT * math.cos(math.radians(edge_lat))
+                if max_km is not None and reach > max_km:
+                    break
+                if len(candidates) >= k and heapq.nsmallest(k, candidates)[-1][0] <= reach:
+                    break
+                ring += 1
+
+        if max_km is not None:
+            candidates = [c for c in candidates if c[0] <= max_km]
+        return [(d, self.fix(self.latest[code])) for d, code in heapq.nsmallest(k, candidates)]
+
+
+def _point(text: str) -> Tuple[float, ...]:
+    return tuple(float(v) for v in text.split(","))
+
+
+def main():
+    import time
+
+    from gas_client import GASClient
+
+    parser = argparse.ArgumentParser(description="Spatial queries over telemetry fixes")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL (getAllMachines)")
+    parser.add_argument("--cache", help="Index a local telemetry cache instead")
+    parser.add_argument("--cell-deg", type=float, default=DEFAULT_CELL_DEG, help="Grid cell size in degrees")
+    parser.add_argument("--bbox", help="min_lat,min_lng,max_lat,max_lng")
+    parser.add_argument("--near", help="lat,lng for radius / nearest queries")
+    parser.add_argument("--radius-km", type=float, default=1.0, help="Radius for --near")
+    parser.add_argument("--nearest", type=int, default=3, help="Nearest machines for --near")
+
+    args = parser.parse_args()
+    index = SpatialIndex(args.cell_deg)
+
+    start_time = time.perf_counter()
+    if args.cache:
+        index.add_cache(TelemetryCache(args.cache))
+    elif args.url:
+        result = GASClient(args.url, user_agent="GAS-Spatial-Index/1.0").get_json("getAllMachines")
+        if result.get("status") != "success":
+            print(f"failed: {result.get('message')}")
+            return
+        index.add_response(result)
+    else:
+        parser.error("url or --cache is required")
+    print(f"Indexed {len(index)} fixes from {len(index.machine_ids)} machines "
+          f"into {len(index.cells)} cells in {time.perf_counter() - start_time:.2f}s")
+
+    if args.bbox:
+        start_time = time.perf_counter()
+        fixes = index.bbox(*_point(args.bbox))
+        elapsed = time.perf_counter() - start_time
+        machines = sorted({f.machine_id for f in fixes})
+        print(f"\nBox: {len(fixes)} fixes from {len(machines)} machines ({elapsed * 1000:.2f}ms)")
+        for machine_id in machines:
+            print(f"  {machine_id}")
+
+    if args.near:
+        latitude, longitude = _point(args.near)
+        start_time = time.perf_counter()
+        hits = index.radius(latitude, longitude, args.radius_km)
+        elapsed = time.perf_counter() - start_time
+        print(f"\nWithin {args.radius_km} km: {len(hits)} fixes ({elapsed * 1000:.2f}ms)")
+
+        start_time = time.perf_counter()
+        nearest = index.nearest_machines(latitude, longitude, args.nearest)
+        elapsed = time.perf_counter() - start_time
+        print(f"Nearest machines ({elapsed * 1000:.2f}ms):")
+        for distance, fix in nearest:
+            print(f"  {fix.machine_id:<12} {distance:>8.3f} km  ({fix.latitude:.6f}, {fix.longitude:.6f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Streaming getAllMachines Decoder (v2.0.0)
+Parses machines[].data[] one record at a time while the response body is
+still arriving, so peak memory is bounded by the chunk size instead of the
+size of the fleet history. Only the standard library is used: the object
+structure is walked by a small scanner and every record is decoded by
+json's C decoder.
+
+Usage:
+    python3 stream_decoder.py <GAS_WEBAPP_URL>
+    python3 stream_decoder.py <GAS_WEBAPP_URL> --columns --chunk-records 5000
+
+    from stream_decoder import stream_all_machines
+    stream = stream_all_machines(GASClient(url))
+    for machine_id, record in stream:
+        ...
+    print(stream.header["totalMachines"])
+"""
+
+import argparse
+import codecs
+import json
+import re
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from gas_client import GASClient
+from telemetry_record import TelemetryBatch
+
+# Bytes requested from the socket per read
+DEFAULT_CHUNK_BYTES = 64 * 1024
+# Records per column chunk (column_chunks)
+DEFAULT_CHUNK_RECORDS = 10000
+
+READ_SCHEMA_KEYS = ("timestamp", "machineTime", "machineId", "dataType", "latitude",
+                    "longitude", "altitude", "satellites", "battery", "comment")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamReader:
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        Pull-based JSON scanner over a stream of UTF-8 byte chunks
+
+        Only the unconsumed tail of the stream is kept in memory.
+
+        Args:
+            chunks: Byte chunks (e.g. response.iter_content())
+        """
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Drop the consumed prefix and append the next chunk
+
+        Returns:
+            False once the stream is exhausted
+        """
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """
+        Next non-whitespace character without consuming it ("" at end of stream)
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        """
+        Consume char or raise json.JSONDecodeError
+        """
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode one complete JSON value, reading more chunks until it is complete
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yield the keys of an object; the caller must consume each value before resuming
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Yield the index of each array element; the caller must consume each element before resuming
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+
+class MachinesStream:
+    def __init__(self, chunks: Iterable[bytes], response=None):
+        """
+        Record-by-record view of a getAllMachines response body
+
+        Iterating yields (machineId, data point) in response order. Fields
+        outside machines[] (status, totalMachines, fingerprint, timestamp...)
+        are collected in header, and per-machine fields (machineId, isActive,
+        dataCount) in machines; both are complete once iteration has finished.
+        The WebApp writes machineId before data, so every record is tagged
+        with its machine.
+
+        Args:
+            chunks: Byte chunks of the response body
+            response: HTTP response to close when iteration ends
+        """
+        self.header: Dict[str, Any] = {}
+        self.machines: List[Dict[str, Any]] = []
+        self._reader = JSONStreamReader(chunks)
+        self._response = response
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+        if self._consumed:
+            raise RuntimeError("MachinesStream can only be iterated once")
+        self._consumed = True
+
+        reader = self._reader
+        try:
+            for key in reader.iter_object():
+                if key == "machines" and reader.peek() == "[":
+                    for _ in reader.iter_array():
+                        machine = {}
+                        for machine_key in reader.iter_object():
+                            if machine_key == "data" and reader.peek() == "[":
+                                count = 0
+                                for _ in reader.iter_array():
+                                    yield machine.get("machineId"), reader.value()
+                                    count += 1
+                                machine["dataCount"] = count
+                            else:
+                                machine[machine_key] = reader.value()
+                        self.machines.append(machine)
+                else:
+                    self.header[key] = reader.value()
+        finally:
+            self.close()
+
+    def column_chunks(self, chunk_size: int = DEFAULT_CHUNK_RECORDS
+                      ) -> Iterator[Tuple[Optional[str], Dict[str, List[Any]]]]:
+        """
+        Group streamed records into per-machine column chunks
+
+        Args:
+            chunk_size: Maximum records per chunk
+
+        Returns:
+            Iterator of (machineId, {read-schema key: values}); a chunk never
+            spans two machines
+        """
+        current_id = None
+        columns = None
+        count = 0
+        for machine_id, record in self:
+            if columns is not None and (machine_id != current_id or count >= chunk_size):
+                yield current_id, columns
+                columns = None
+            if columns is None:
+                current_id = machine_id
+                columns = {key: [] for key in READ_SCHEMA_KEYS}
+                count = 0
+            for key in READ_SCHEMA_KEYS:
+                columns[key].append(record.get(key))
+            count += 1
+        if columns is not None:
+            yield current_id, columns
+
+    def batches(self, chunk_size: int = DEFAULT_CHUNK_RECORDS
+                ) -> Iterator[Tuple[Optional[str], TelemetryBatch]]:
+        """
+        Group streamed records into per-machine TelemetryBatch chunks
+
+        Args:
+            chunk_size: Maximum records per batch
+
+        Returns:
+            Iterator of (machineId, TelemetryBatch); a batch never spans two machines
+        """
+        current_id = None
+        batch = None
+        for machine_id, record in self:
+            if batch is not None and (machine_id != current_id or len(batch) >= chunk_size):
+                yield current_id, batch
+                batch = None
+            if batch is None:
+                current_id = machine_id
+                batch = TelemetryBatch()
+            batch.append_read(record)
+        if batch is not None:
+            yield current_id, batch
+
+    def close(self):
+        """
+        Release the underlying HTTP connection
+        """
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+
+def stream_all_machines(client: GASClient, params: Optional[Dict[str, Any]] = None,
+                        chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> MachinesStream:
+    """
+    Request getAllMachines and decode the body while it downloads
+
+    HTTP and connection failures are reported the same way as get_json:
+    the stream yields nothing and header is {"status": "error", "message": ...}.
+
+    Args:
+        client: WebApp client
+        params: Additional query parameters (e.g. fingerprint)
+        chunk_bytes: Bytes read from the socket at a time
+
+    Returns:
+        MachinesStream over the response
+    """
+    try:
+        response = client.get("getAllMachines", params, stream=True)
+    except requests.exceptions.Timeout:
+        return _error_stream("Request timeout")
+    except requests.exceptions.ConnectionError:
+        return _error_stream("Connection error")
+
+    if response.status_code != 200:
+        message = f"HTTP {response.status_code}: {response.text}"
+        response.close()
+        return _error_stream(message)
+
+    return MachinesStream(response.iter_content(chunk_size=chunk_bytes), response)
+
+
+def _error_stream(message: str) -> MachinesStream:
+    stream = MachinesStream([b"{}"])
+    stream.header = {"status": "error", "message": message}
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream getAllMachines record by record")
+    parser.add_argument("url", help="GAS WebApp URL")
+    parser.add_argument("--columns", action="store_true", help="Group records into column chunks")
+    parser.add_argument("--chunk-records", type=int, default=DEFAULT_CHUNK_RECORDS,
+                        help="Records per column chunk")
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES,
+                        help="Bytes read from the socket at a time")
+
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    stream = stream_all_machines(GASClient(args.url, user_agent="GAS-Stream-Decoder/1.0"),
+                                 chunk_bytes=args.chunk_bytes)
+    counts: Dict[Optional[str], int] = {}
+    if args.columns:
+        chunks = 0
+        for machine_id, columns in stream.column_chunks(args.chunk_records):
+            counts[machine_id] = counts.get(machine_id, 0) + len(columns["timestamp"])
+            chunks += 1
+        print(f"Column chunks: {chunks}")
+    else:
+        for machine_id, _ in stream:
+            counts[machine_id] = counts.get(machine_id, 0) + 1
+    elapsed = time.perf_counter() - start_time
+
+    if stream.header.get("status") != "success":
+        print(f"failed: {stream.header.get('message')}")
+        return
+
+    for machine in stream.machines:
+        print(f"Machine {machine.get('machineId')}: {machine.get('dataCount')} records "
+              f"(active: {machine.get('isActive')})")
+    print(f"Total machines: {stream.header.get('totalMachines')}  "
+          f"Records: {sum(counts.values())}  Elapsed: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
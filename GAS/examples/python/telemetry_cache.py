@@ -0,0 +1,469 @@
+"""
+Local Columnar Telemetry Cache (v2.0.0)
+Keeps each machine's track as typed column arrays on disk and syncs only
+new rows from the WebApp (getMachine sinceRow cursor), so analysis
+scripts load a long fleet history without re-downloading it.
+
+Layout of the cache directory:
+    Machine_<ID>/meta.json          {"count", "lastRow", "vocab"/"vocabBytes": {column: size}, "byteorder"}
+    Machine_<ID>/<column>.bin       raw array bytes (numeric and code columns)
+    Machine_<ID>/<column>.vocab     JSON lines, one distinct string per line (string columns)
+"""
+
+import json
+import os
+import shutil
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from gas_client import GASClient
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; arrays work without it
+    np = None
+
+CACHE_VERSION = 1
+
+# Read-schema key -> array typecode
+NUMERIC_COLUMNS = (
+    ("timestamp", "d"),   # GAS Time as epoch seconds
+    ("latitude", "d"),
+    ("longitude", "d"),
+    ("altitude", "d"),
+    ("satellites", "i"),
+    ("battery", "d"),
+)
+# Read-schema keys stored dictionary-encoded (codes + distinct values)
+STRING_COLUMNS = ("machineTime", "dataType", "comment")
+
+
+# "YYYY-MM-DDTHH" -> epoch seconds of that UTC hour (parse_timestamp fast path)
+_hour_epochs: Dict[str, float] = {}
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Parse a read-schema timestamp (Date.toISOString) to epoch seconds
+
+    Args:
+        value: ISO 8601 timestamp such as 2025-07-24T11:29:45.000Z
+
+    Returns:
+        Epoch seconds (NaN if unparseable)
+    """
+    try:
+        # Fast path for the fixed toISOString layout: parse the hour once, then add the rest
+        if len(value) == 24 and value[19] == "." and value[23] == "Z":
+            hour = _hour_epochs.get(value[:13])
+            if hour is None:
+                dt = datetime.strptime(value[:13], "%Y-%m-%dT%H")
+                hour = _hour_epochs[value[:13]] = dt.replace(tzinfo=timezone.utc).timestamp()
+            return hour + int(value[14:16]) * 60 + int(value[17:19]) + int(value[20:23]) / 1000
+        dt = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+        return dt.replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def _cell_float(value: Any) -> float:
+    """Coerce a numeric cell to float (0 when empty or unparseable, like parseFloat(...) || 0)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if number == number else 0.0
+
+
+def _cell_int(value: Any) -> int:
+    """Coerce a numeric cell such as 8, 8.0 or "8.0" to int (0 when unparseable, like parseInt(...) || 0)"""
+    number = _cell_float(value)
+    # Out-of-range values (including inf) would not fit array("i")
+    return int(number) if -2**31 <= number < 2**31 else 0
+
+
+# Array typecode -> cell coercion used by append_points
+_CELL_COERCE = {"d": _cell_float, "i": _cell_int}
+
+
+def format_timestamp(epoch: float) -> str:
+    """Format epoch seconds back to the read-schema timestamp"""
+    dt = datetime.fromtimestamp(epoch, timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dt.microsecond // 1000:03d}Z"
+
+
+class StringColumn:
+    """Dictionary-encoded string column (codes array + distinct values)"""
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: Any):
+        value = "" if value is None else str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._index[value] = code
+        self.codes.append(code)
+
+    def load_values(self, values: List[str]):
+        self.values = values
+        self._index = {v: i for i, v in enumerate(values)}
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class MachineTrack:
+    def __init__(self, machine_id: str, directory: str):
+        """
+        Columnar track of one machine
+
+        Args:
+            machine_id: Machine ID
+            directory: Directory holding this machine's column files
+        """
+        self.machine_id = machine_id
+        self.directory = directory
+        self.last_row = 0
+        self.columns = {name: array(code) for name, code in NUMERIC_COLUMNS}
+        self._strings = {name: StringColumn() for name in STRING_COLUMNS}
+        self._strings_loaded = True
+        self._persisted = 0
+        self._persisted_vocab = {name: 0 for name in STRING_COLUMNS}
+        self._vocab_bytes = {name: 0 for name in STRING_COLUMNS}
+        self._meta = None
+
+    # ---- access ------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    def column(self, name: str):
+        """
+        Get a column by read-schema key
+
+        Numeric columns are arrays; string columns are StringColumn objects
+        (loaded from disk on first access).
+        """
+        if name in self.columns:
+            return self.columns[name]
+        if name in self._strings:
+            self._load_strings()
+            return self._strings[name]
+        raise KeyError(name)
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """
+        Zero-copy NumPy views of the numeric columns
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("NumPy is required for as_numpy()")
+        return {name: np.frombuffer(self.columns[name], dtype=self.columns[name].typecode)
+                for name, _ in NUMERIC_COLUMNS}
+
+    def to_records(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rebuild read-schema dictionaries (same keys as getMachine data)
+        """
+        self._load_strings()
+        stop = len(self) if stop is None else stop
+        records = []
+        for i in range(start, stop):
+            record = {
+                "timestamp": format_timestamp(self.columns["timestamp"][i]),
+                "machineTime": self._strings["machineTime"][i],
+                "machineId": self.machine_id,
+                "dataType": self._strings["dataType"][i],
+            }
+            for name in ("latitude", "longitude", "altitude", "satellites", "battery"):
+                record[name] = self.columns[name][i]
+            record["comment"] = self._strings["comment"][i]
+            records.append(record)
+        return records
+
+    # ---- updates -----------------------------------------------------
+
+    def append_points(self, data: List[Dict[str, Any]], last_row: Optional[int] = None):
+        """
+        Append read-schema data points
+
+        Args:
+            data: Data points from getMachine / getAllMachines
+            last_row: Sheet row the data was read up to (next cursor)
+        """
+        self._load_strings()
+        for point in data:
+            self.columns["timestamp"].append(parse_timestamp(point.get("timestamp")))
+            for name, code in NUMERIC_COLUMNS[1:]:
+                self.columns[name].append(_CELL_COERCE[code](point.get(name)))
+            for name in STRING_COLUMNS:
+                self._strings[name].append(point.get(name))
+        if last_row is not None:
+            self.last_row = last_row
+
+    def clear(self):
+        """
+        Drop all points (in memory and on disk)
+        """
+        self.last_row = 0
+        self.columns = {name: array(code) for name, code in NUMERIC_COLUMNS}
+        self._strings = {name: StringColumn() for name in STRING_COLUMNS}
+        self._strings_loaded = True
+        self._persisted = 0
+        self._persisted_vocab = {name: 0 for name in STRING_COLUMNS}
+        self._vocab_bytes = {name: 0 for name in STRING_COLUMNS}
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    # ---- persistence -------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def save(self):
+        """
+        Append points added since the last save to the column files
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        count = len(self)
+
+        if count > self._persisted:
+            # Files are cut back to the last saved size first, so bytes left by an
+            # interrupted save are overwritten instead of misaligning the columns
+            for name, _ in NUMERIC_COLUMNS:
+                self._append_array(f"{name}.bin", self.columns[name])
+            for name in STRING_COLUMNS:
+                column = self._strings[name]
+                self._append_array(f"{name}.bin", column.codes)
+                lines = "".join(json.dumps(value, ensure_ascii=False) + "\n"
+                                for value in column.values[self._persisted_vocab[name]:])
+                with open(self._path(f"{name}.vocab"), "ab") as f:
+                    f.truncate(self._vocab_bytes[name])
+                    f.write(lines.encode("utf-8"))
+                    self._vocab_bytes[name] = f.tell()
+                self._persisted_vocab[name] = len(column.values)
+            self._persisted = count
+
+        # meta.json is written last: on load, column files are truncated to its count
+        meta = {
+            "version": CACHE_VERSION,
+            "machineId": self.machine_id,
+            "count": count,
+            "lastRow": self.last_row,
+            "vocab": dict(self._persisted_vocab),
+            "vocabBytes": dict(self._vocab_bytes),
+            "byteorder": sys.byteorder
+        }
+        tmp_path = self._path("meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path("meta.json"))
+
+    def _append_array(self, filename: str, values: array):
+        with open(self._path(filename), "ab") as f:
+            f.truncate(self._persisted * values.itemsize)
+            values[self._persisted:].tofile(f)
+
+    def load(self) -> bool:
+        """
+        Load numeric columns from disk (string columns load lazily)
+
+        Returns:
+            True if a saved track was found
+        """
+        meta_path = self._path("meta.json")
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            return False
+
+        self._meta = meta
+        count = meta["count"]
+        swap = meta.get("byteorder", sys.byteorder) != sys.byteorder
+        for name, code in NUMERIC_COLUMNS:
+            self.columns[name] = self._read_array(f"{name}.bin", code, count, swap)
+
+        self.last_row = meta["lastRow"]
+        self._persisted = count
+        self._persisted_vocab = dict(meta["vocab"])
+        self._vocab_bytes = dict(meta["vocabBytes"])
+        self._strings_loaded = False
+        return True
+
+    def _read_array(self, filename: str, typecode: str, count: int, swap: bool) -> array:
+        values = array(typecode)
+        with open(self._path(filename), "rb") as f:
+            values.frombytes(f.read(count * values.itemsize))
+        if swap:
+            values.byteswap()
+        return values
+
+    def _load_strings(self):
+        if self._strings_loaded:
+            return
+        count = self._meta["count"]
+        swap = self._meta.get("byteorder", sys.byteorder) != sys.byteorder
+        for name in STRING_COLUMNS:
+            column = StringColumn()
+            column.codes = self._read_array(f"{name}.bin", "I", count, swap)
+            size = self._persisted_vocab[name]
+            values = []
+            with open(self._path(f"{name}.vocab"), "r", encoding="utf-8") as f:
+                for line in f:
+                    if len(values) >= size:
+                        break
+                    values.append(json.loads(line))
+            column.load_values(values)
+            self._strings[name] = column
+        self._strings_loaded = True
+
+
+class TelemetryCache:
+    def __init__(self, directory: str, webapp_url: Optional[str] = None,
+                 client: Optional[GASClient] = None):
+        """
+        Open (or create) a local telemetry cache
+
+        Args:
+            directory: Cache directory
+            webapp_url: Google Apps Script WebApp URL (needed for sync)
+            client: Existing client (overrides webapp_url)
+        """
+        self.directory = directory
+        self.client = client or (GASClient(webapp_url, user_agent="GAS-Telemetry-Cache/1.0") if webapp_url else None)
+        self.tracks: Dict[str, MachineTrack] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def machine_ids(self) -> List[str]:
+        """
+        Machine IDs present in the cache
+        """
+        ids = set(self.tracks)
+        for name in os.listdir(self.directory):
+            if name.startswith("Machine_") and os.path.exists(os.path.join(self.directory, name, "meta.json")):
+                ids.add(name[len("Machine_"):])
+        return sorted(ids)
+
+    def open_track(self, machine_id: str) -> MachineTrack:
+        """
+        Load a machine's track from disk without keeping it in the cache
+        """
+        track = MachineTrack(machine_id, os.path.join(self.directory, f"Machine_{machine_id}"))
+        track.load()
+        return track
+
+    def track(self, machine_id: str) -> MachineTrack:
+        """
+        Get a machine's track (loaded from disk on first access)
+        """
+        if machine_id not in self.tracks:
+            self.tracks[machine_id] = self.open_track(machine_id)
+        return self.tracks[machine_id]
+
+    def load_all(self) -> Dict[str, MachineTrack]:
+        """
+        Load every cached machine
+        """
+        return {machine_id: self.track(machine_id) for machine_id in self.machine_ids()}
+
+    def sync_machine(self, machine_id: str) -> int:
+        """
+        Fetch rows after the machine's cursor and append them
+
+        Args:
+            machine_id: Machine ID
+
+        Returns:
+            Number of new points (-1 on error)
+        """
+        if self.client is None:
+            raise ValueError("webapp_url or client is required to sync")
+
+        track = self.track(machine_id)
+        full = not track.last_row
+        params = {"machineId": machine_id}
+        if not full:
+            params["sinceRow"] = track.last_row
+
+        result = self.client.get_json("getMachine", params)
+        if result.get("status") != "success":
+            return -1
+
+        last_row = result.get("lastRow")
+        if last_row is not None and last_row < track.last_row:
+            # Rows were deleted or the sheet was recreated: start over
+            track.clear()
+            return self.sync_machine(machine_id)
+        if full or last_row is None:
+            # Full history (or a backend without cursor support) replaces the track
+            track.clear()
+
+        data = result.get("data", [])
+        track.append_points(data, last_row or 0)
+        track.save()
+        return len(data)
+
+    def sync(self, machine_ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Sync machines (all machines from getMachineList by default)
+
+        Returns:
+            {machine_id: new points (-1 on error)}
+        """
+        if self.client is None:
+            raise ValueError("webapp_url or client is required to sync")
+
+        if machine_ids is None:
+            machine_list = self.client.get_json("getMachineList")
+            machine_ids = [m["machineId"] for m in machine_list.get("machines", [])]
+        return {machine_id: self.sync_machine(machine_id) for machine_id in machine_ids}
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sync and inspect the local telemetry cache")
+    parser.add_argument("directory", help="Cache directory")
+    parser.add_argument("--url", help="GAS WebApp URL (sync before printing)")
+    parser.add_argument("--machines", help="Comma separated machine IDs to sync (default: all)")
+
+    args = parser.parse_args()
+    cache = TelemetryCache(args.directory, args.url)
+
+    if args.url:
+        machine_ids = args.machines.split(",") if args.machines else None
+        start_time = time.perf_counter()
+        synced = cache.sync(machine_ids)
+        print(f"Synced {sum(n for n in synced.values() if n > 0)} new points "
+              f"from {len(synced)} machines in {time.perf_counter() - start_time:.2f}s")
+
+    start_time = time.perf_counter()
+    tracks = cache.load_all()
+    elapsed = time.perf_counter() - start_time
+    print(f"Loaded {sum(len(t) for t in tracks.values())} points "
+          f"from {len(tracks)} machines in {elapsed * 1000:.1f}ms")
+    for machine_id, track in tracks.items():
+        print(f"  Machine {machine_id}: {len(track)} points (last row: {track.last_row})")
+
+
+if __name__ == "__main__":
+    main()
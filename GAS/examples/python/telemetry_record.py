@@ -0,0 +1,288 @@
+"""
+Compact Telemetry Record Types (v2.0.0)
+TelemetryRecord is a slotted single record and TelemetryBatch a
+struct-of-arrays container, both convertible to and from the wire JSON
+(DataType, MachineID, GPS.LAT...) and the read schema (latitude,
+longitude...). They replace per-record nested dicts wherever many records
+are generated or held at once.
+
+Usage:
+    record = TelemetryRecord("00453", "2025/07/16 00:41:41", latitude=34.12, longitude=153.13)
+    client.post_json(record.to_wire())
+
+    batch = TelemetryBatch.from_read(result["data"])
+    lat = batch.column("latitude")      # array('d')
+    client.post_json(batch.to_wire())
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from telemetry_cache import StringColumn, format_timestamp, parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; arrays work without it
+    np = None
+
+# Stored for missing satellites (missing floats are stored as NaN)
+MISSING_INT = -1
+
+FLOAT_FIELDS = ("latitude", "longitude", "altitude", "battery")
+
+
+def _float(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _int(value: Any) -> int:
+    # Through float so "8.0" and 8.0 are stored as 8
+    number = _float(value)
+    if not math.isfinite(number):
+        return MISSING_INT
+    return int(number)
+
+
+def _optional_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _optional_int(value: int) -> Optional[int]:
+    return None if value == MISSING_INT else value
+
+
+class TelemetryRecord:
+    """One telemetry record without per-record dicts"""
+
+    __slots__ = ("machine_id", "machine_time", "data_type", "latitude", "longitude", "altitude",
+                 "satellites", "battery", "comment", "timestamp", "idempotency_key")
+
+    def __init__(self, machine_id: str, machine_time: str, data_type: str = "HK",
+                 latitude: Optional[float] = None, longitude: Optional[float] = None,
+                 altitude: Optional[float] = None, satellites: Optional[int] = None,
+                 battery: Optional[float] = None, comment: str = "",
+                 timestamp: Optional[str] = None, idempotency_key: Optional[str] = None):
+        """
+        Args:
+            machine_id: MachineID
+            machine_time: MachineTime ("%Y/%m/%d %H:%M:%S")
+            data_type: DataType
+            latitude, longitude, altitude: GPS.LAT / GPS.LNG / GPS.ALT
+            satellites: GPS.SAT
+            battery: BAT
+            comment: CMT
+            timestamp: GAS Time as read back (read schema only)
+            idempotency_key: IdempotencyKey (wire format only)
+        """
+        self.machine_id = machine_id
+        self.machine_time = machine_time
+        self.data_type = data_type
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.satellites = satellites
+        self.battery = battery
+        self.comment = comment
+        self.timestamp = timestamp
+        self.idempotency_key = idempotency_key
+
+    @classmethod
+    def from_wire(cls, payload: Dict[str, Any]) -> "TelemetryRecord":
+        """
+        Build from a POST payload (DataType, MachineID, GPS{LAT, LNG, ALT, SAT}, BAT, CMT)
+        """
+        gps = payload.get("GPS") or {}
+        return cls(payload.get("MachineID"), payload.get("MachineTime"), payload.get("DataType"),
+                   gps.get("LAT"), gps.get("LNG"), gps.get("ALT"), gps.get("SAT"),
+                   payload.get("BAT"), payload.get("CMT"),
+                   idempotency_key=payload.get("IdempotencyKey"))
+
+    def to_wire(self) -> Dict[str, Any]:
+        """
+        Build the POST payload
+        """
+        payload = {
+            "DataType": self.data_type,
+            "MachineID": self.machine_id,
+            "MachineTime": self.machine_time,
+            "GPS": {
+                "LAT": self.latitude,
+                "LNG": self.longitude,
+                "ALT": self.altitude,
+                "SAT": self.satellites
+            },
+            "BAT": self.battery,
+            "CMT": self.comment
+        }
+        if self.idempotency_key:
+            payload["IdempotencyKey"] = self.idempotency_key
+        return payload
+
+    @classmethod
+    def from_read(cls, point: Dict[str, Any]) -> "TelemetryRecord":
+        """
+        Build from a getMachine / getAllMachines data point
+        """
+        return cls(point.get("machineId"), point.get("machineTime"), point.get("dataType"),
+                   point.get("latitude"), point.get("longitude"), point.get("altitude"),
+                   point.get("satellites"), point.get("battery"), point.get("comment"),
+                   timestamp=point.get("timestamp"))
+
+    def to_read(self) -> Dict[str, Any]:
+        """
+        Build a read-schema data point (same keys as getMachine data)
+        """
+        return {
+            "timestamp": self.timestamp,
+            "machineTime": self.machine_time,
+            "machineId": self.machine_id,
+            "dataType": self.data_type,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "altitude": self.altitude,
+            "satellites": self.satellites,
+            "battery": self.battery,
+            "comment": self.comment
+        }
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TelemetryRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"TelemetryRecord({self.machine_id!r}, {self.machine_time!r}, "
+                f"lat={self.latitude}, lng={self.longitude}, bat={self.battery})")
+
+
+class TelemetryBatch:
+    """Struct-of-arrays container for many records"""
+
+    def __init__(self):
+        # GAS Time as epoch seconds (NaN for records that were never saved)
+        self.timestamp = array("d")
+        self.latitude = array("d")
+        self.longitude = array("d")
+        self.altitude = array("d")
+        self.battery = array("d")
+        self.satellites = array("i")
+        self.machine_time: List[str] = []
+        self.machine_id = StringColumn()
+        self.data_type = StringColumn()
+        self.comment = StringColumn()
+
+    def __len__(self) -> int:
+        return len(self.latitude)
+
+    def _append(self, timestamp: float, machine_id: Any, machine_time: Any, data_type: Any,
+                latitude: Any, longitude: Any, altitude: Any, satellites: Any,
+                battery: Any, comment: Any):
+        self.timestamp.append(timestamp)
+        self.machine_id.append(machine_id)
+        self.machine_time.append(machine_time)
+        self.data_type.append(data_type)
+        self.latitude.append(_float(latitude))
+        self.longitude.append(_float(longitude))
+        self.altitude.append(_float(altitude))
+        self.satellites.append(_int(satellites))
+        self.battery.append(_float(battery))
+        self.comment.append(comment)
+
+    def append(self, record: TelemetryRecord):
+        """
+        Append a TelemetryRecord
+        """
+        timestamp = parse_timestamp(record.timestamp) if record.timestamp else math.nan
+        self._append(timestamp, record.machine_id, record.machine_time, record.data_type,
+                     record.latitude, record.longitude, record.altitude, record.satellites,
+                     record.battery, record.comment)
+
+    def append_wire(self, payload: Dict[str, Any]):
+        """
+        Append a POST payload
+        """
+        gps = payload.get("GPS") or {}
+        self._append(math.nan, payload.get("MachineID"), payload.get("MachineTime"),
+                     payload.get("DataType"), gps.get("LAT"), gps.get("LNG"), gps.get("ALT"),
+                     gps.get("SAT"), payload.get("BAT"), payload.get("CMT"))
+
+    def append_read(self, point: Dict[str, Any]):
+        """
+        Append a read-schema data point
+        """
+        self._append(parse_timestamp(point.get("timestamp")), point.get("machineId"),
+                     point.get("machineTime"), point.get("dataType"), point.get("latitude"),
+                     point.get("longitude"), point.get("altitude"), point.get("satellites"),
+                     point.get("battery"), point.get("comment"))
+
+    @classmethod
+    def from_wire(cls, payloads: Iterable[Dict[str, Any]]) -> "TelemetryBatch":
+        batch = cls()
+        for payload in payloads:
+            batch.append_wire(payload)
+        return batch
+
+    @classmethod
+    def from_read(cls, points: Iterable[Dict[str, Any]]) -> "TelemetryBatch":
+        batch = cls()
+        for point in points:
+            batch.append_read(point)
+        return batch
+
+    def column(self, name: str):
+        """
+        Get a column by read-schema key
+
+        Numeric columns are arrays (timestamp as epoch seconds), machineTime a
+        list and the other string columns StringColumn objects.
+        """
+        attribute = {"machineTime": "machine_time", "machineId": "machine_id",
+                     "dataType": "data_type"}.get(name, name)
+        if attribute not in ("timestamp", "latitude", "longitude", "altitude", "battery",
+                             "satellites", "machine_time", "machine_id", "data_type", "comment"):
+            raise KeyError(name)
+        return getattr(self, attribute)
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """
+        Zero-copy NumPy views of the numeric columns
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("NumPy is required for as_numpy()")
+        return {name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+                for name in ("timestamp",) + FLOAT_FIELDS + ("satellites",)}
+
+    def __getitem__(self, i: int) -> TelemetryRecord:
+        timestamp = self.timestamp[i]
+        return TelemetryRecord(
+            self.machine_id[i], self.machine_time[i], self.data_type[i],
+            _optional_float(self.latitude[i]), _optional_float(self.longitude[i]),
+            _optional_float(self.altitude[i]), _optional_int(self.satellites[i]),
+            _optional_float(self.battery[i]), self.comment[i],
+            timestamp=None if math.isnan(timestamp) else format_timestamp(timestamp)
+        )
+
+    def __iter__(self) -> Iterator[TelemetryRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_wire(self) -> List[Dict[str, Any]]:
+        """
+        Build a batch POST payload (JSON array)
+        """
+        return [self[i].to_wire() for i in range(len(self))]
+
+    def to_read(self) -> List[Dict[str, Any]]:
+        """
+        Build read-schema data points
+        """
+        return [self[i].to_read() for i in range(len(self))]
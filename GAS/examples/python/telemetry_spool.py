@@ -0,0 +1,331 @@
+"""
+Durable Store-and-Forward Spool for Telemetry (v2.0.0)
+Keeps records that could not be delivered in an append-only on-disk log
+and replays them in order once the link to the WebApp is back.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class SpoolFullError(Exception):
+    """Raised when appending would exceed the spool's disk budget"""
+
+
+def delivered_prefix(response: Optional[Dict[str, Any]], count: int) -> int:
+    """
+    Leading records of a batch POST that the WebApp saved
+
+    Only records answered with status success (duplicates included) count;
+    replay stops at the first record that was not saved, so it and every
+    record after it stay spooled in order.
+
+    Args:
+        response: Batch response ({"results": [...]}, one entry per record) or None
+        count: Records sent
+
+    Returns:
+        Number of records to ack
+    """
+    results = (response or {}).get("results") or []
+    delivered = 0
+    for result in results[:count]:
+        if not isinstance(result, dict) or result.get("status") != "success":
+            break
+        delivered += 1
+    return delivered
+
+
+class TelemetrySpool:
+    """
+    Append-only spool made of JSON-lines segment files.
+
+    Layout of the spool directory:
+        segment-000000000001.log   records, one JSON object per line
+        segment-000000000002.log   ...
+        cursor.json                {"segment": n, "offset": bytes} of the next record to replay
+
+    Appends are fsynced in batches (every fsync_every records or fsync_interval
+    seconds, whichever comes first). Fully replayed segments are deleted, and
+    appends beyond max_bytes raise SpoolFullError instead of dropping data.
+    """
+
+    SEGMENT_PREFIX = "segment-"
+    SEGMENT_SUFFIX = ".log"
+    CURSOR_FILE = "cursor.json"
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024,
+                 segment_bytes: int = 1024 * 1024, fsync_every: int = 32,
+                 fsync_interval: float = 1.0):
+        """
+        Open (or create) a spool directory
+
+        Args:
+            directory: Spool directory
+            max_bytes: Disk budget for all segment files
+            segment_bytes: Segment size before rotating to a new file
+            fsync_every: Records per fsync
+            fsync_interval: Maximum seconds between fsyncs while appending
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._writer = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        self._segments = self._list_segments()
+        self._cursor = self._load_cursor()
+        self._recover_tail()
+        self._total_bytes = sum(os.path.getsize(self._segment_path(s)) for s in self._segments)
+        self._pending = self._count_pending()
+
+    # ---- file layout -------------------------------------------------
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{self.SEGMENT_PREFIX}{segment:012d}{self.SEGMENT_SUFFIX}")
+
+    def _list_segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                segments.append(int(name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]))
+        return sorted(segments)
+
+    def _load_cursor(self) -> Dict[str, int]:
+        path = os.path.join(self.directory, self.CURSOR_FILE)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                cursor = json.load(f)
+            if cursor["segment"] in self._segments:
+                return cursor
+        first = self._segments[0] if self._segments else 1
+        return {"segment": first, "offset": 0}
+
+    def _save_cursor(self):
+        path = os.path.join(self.directory, self.CURSOR_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._cursor, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _recover_tail(self):
+        """
+        Drop a partially written last line left behind by a crash
+        """
+        if not self._segments:
+            return
+        path = self._segment_path(self._segments[-1])
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _count_pending(self) -> int:
+        count = 0
+        for segment in self._segments:
+            if segment < self._cursor["segment"]:
+                continue
+            with open(self._segment_path(segment), "rb") as f:
+                if segment == self._cursor["segment"]:
+                    f.seek(self._cursor["offset"])
+                count += sum(1 for _ in f)
+        return count
+
+    # ---- writing -----------------------------------------------------
+
+    def _open_writer(self):
+        if not self._segments:
+            self._segments.append(self._cursor["segment"])
+        elif os.path.getsize(self._segment_path(self._segments[-1])) >= self.segment_bytes:
+            self._segments.append(self._segments[-1] + 1)
+        self._writer = open(self._segment_path(self._segments[-1]), "ab")
+
+    def append(self, record: Dict[str, Any]):
+        """
+        Append a record to the spool
+
+        Args:
+            record: Telemetry payload (wire format)
+
+        Raises:
+            SpoolFullError: If the record would exceed max_bytes
+        """
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+        if self._total_bytes + len(line) > self.max_bytes:
+            raise SpoolFullError(
+                f"Spool {self.directory} is full ({self._total_bytes} bytes, {self._pending} records pending)"
+            )
+
+        if self._writer is None or self._writer.tell() >= self.segment_bytes:
+            if self._writer is not None:
+                self.sync()
+                self._writer.close()
+            self._open_writer()
+
+        self._writer.write(line)
+        self._total_bytes += len(line)
+        self._pending += 1
+        self._unsynced += 1
+
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        """
+        Flush and fsync appended records to disk
+        """
+        if self._writer is not None and self._unsynced:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # ---- replay ------------------------------------------------------
+
+    @property
+    def pending(self) -> int:
+        """Number of records waiting to be replayed"""
+        return self._pending
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes used by segment files"""
+        return self._total_bytes
+
+    def peek(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Read up to limit records from the cursor without consuming them
+
+        Args:
+            limit: Maximum number of records
+
+        Returns:
+            Records in append order
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+        records = []
+        segment = self._cursor["segment"]
+        offset = self._cursor["offset"]
+
+        while len(records) < limit and segment in self._segments:
+            with open(self._segment_path(segment), "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    records.append(json.loads(line))
+                    if len(records) >= limit:
+                        break
+            segment += 1
+            offset = 0
+
+        return records
+
+    def ack(self, count: int):
+        """
+        Mark the first count pending records as delivered
+
+        Args:
+            count: Number of records delivered (from the front of the spool)
+        """
+        if count <= 0:
+            return
+        if self._writer is not None:
+            self._writer.flush()
+
+        remaining = count
+        while remaining > 0 and self._cursor["segment"] in self._segments:
+            segment = self._cursor["segment"]
+            path = self._segment_path(segment)
+            with open(path, "rb") as f:
+                f.seek(self._cursor["offset"])
+                while remaining > 0:
+                    line = f.readline()
+                    if not line:
+                        break
+                    remaining -= 1
+                self._cursor["offset"] = f.tell()
+                at_end = not f.readline()
+
+            if at_end and segment != self._segments[-1]:
+                # Segment fully replayed and no longer written to
+                self._total_bytes -= os.path.getsize(path)
+                os.remove(path)
+                self._segments.remove(segment)
+                self._cursor = {"segment": self._segments[0], "offset": 0}
+            elif at_end:
+                break
+
+        self._pending -= count - remaining
+        self._compact_if_drained()
+        self._save_cursor()
+
+    def _compact_if_drained(self):
+        """
+        Reset the last segment once everything has been replayed
+        """
+        if self._pending or not self._segments:
+            return
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for segment in self._segments:
+            os.remove(self._segment_path(segment))
+        next_segment = self._segments[-1] + 1
+        self._segments = []
+        self._cursor = {"segment": next_segment, "offset": 0}
+        self._total_bytes = 0
+
+    def drain(self, send_batch: Callable[[List[Dict[str, Any]]], int],
+              batch_size: int = 50, max_batches: Optional[int] = None) -> int:
+        """
+        Replay pending records in order
+
+        Stops at the first batch that is not fully delivered, so a link that is
+        still unhealthy is not flooded (backpressure).
+
+        Args:
+            send_batch: Sends records and returns how many leading records were delivered
+            batch_size: Records per batch
+            max_batches: Optional limit on batches per call
+
+        Returns:
+            Number of records delivered
+        """
+        self.sync()
+        delivered = 0
+        batches = 0
+
+        while self._pending and (max_batches is None or batches < max_batches):
+            records = self.peek(batch_size)
+            if not records:
+                break
+            count = send_batch(records)
+            self.ack(count)
+            delivered += count
+            batches += 1
+            if count < len(records):
+                break
+
+        return delivered
+
+    def close(self):
+        """
+        Sync and close the spool
+        """
+        self.sync()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
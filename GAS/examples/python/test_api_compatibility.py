@@ -4,17 +4,26 @@ API Compatibility Test Script
 Tests backward compatibility with existing frontend APIs
 """
 
-import json
-import requests
+import os
 import time
 from datetime import datetime
 import sys
 
+from gas_client import GASClient
+from latency_benchmark import LatencyBenchmark, compare_to_baseline, load_baseline, save_results
+
 class APICompatibilityTester:
-    def __init__(self, gas_endpoint: str):
-        """Initialize API compatibility tester"""
+    def __init__(self, gas_endpoint: str, benchmark_iterations: int = 5, benchmark_warmup: int = 1,
+                 baseline_path: str = None, results_path: str = None, p95_threshold_ms: float = 5000.0):
+        """Initialize API compatibility tester (benchmark_iterations=0 skips the response time check)"""
         self.gas_endpoint = gas_endpoint.rstrip('/')
-        self.session = requests.Session()
+        self.client = GASClient(self.gas_endpoint, user_agent='GAS-API-Compatibility-Tester/1.0')
+        self.benchmark_iterations = benchmark_iterations
+        self.benchmark_warmup = benchmark_warmup
+        self.baseline_path = baseline_path
+        self.results_path = results_path
+        self.p95_threshold_ms = p95_threshold_ms
+        self.regressions = []
         
     def log(self, message: str, level: str = "INFO"):
         """Log with timestamp"""
@@ -34,7 +43,7 @@ class APICompatibilityTester:
         # Add getMachine test if we have machines
         try:
             # Get machine list first to test getMachine
-            response = self.session.get(f"{self.gas_endpoint}?action=getMachineList")
+            response = self.client.get("getMachineList")
             if response.status_code == 200:
                 data = response.json()
                 if data.get("status") == "success" and data.get("machines"):
@@ -47,13 +56,8 @@ class APICompatibilityTester:
         
         for endpoint, params in endpoints:
             try:
-                # Build URL
-                url = f"{self.gas_endpoint}?action={endpoint}"
-                for key, value in params.items():
-                    url += f"&{key}={value}"
-                
                 self.log(f"Testing: {endpoint}")
-                response = self.session.get(url)
+                response = self.client.get(endpoint, params)
                 
                 if response.status_code != 200:
                     self.log(f"HTTP error {response.status_code} for {endpoint}", "ERROR")
@@ -168,11 +172,7 @@ class APICompatibilityTester:
         }
         
         try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(registration_data)
-            )
+            response = self.client.post(registration_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -205,11 +205,7 @@ class APICompatibilityTester:
         }
         
         try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(telemetry_data)
-            )
+            response = self.client.post(telemetry_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -242,11 +238,7 @@ class APICompatibilityTester:
                 "isActive": False
             }
             
-            self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(cleanup_data)
-            )
+            self.client.post(cleanup_data)
             self.log(f"Test machine {test_machine_id} set to inactive", "INFO")
         except:
             pass
@@ -268,7 +260,7 @@ class APICompatibilityTester:
         for endpoint in new_endpoints:
             try:
                 self.log(f"Testing new endpoint: {endpoint}")
-                response = self.session.get(f"{self.gas_endpoint}?action={endpoint}")
+                response = self.client.get(endpoint)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -286,33 +278,41 @@ class APICompatibilityTester:
         return True  # New endpoint failures don't affect compatibility
     
     def test_response_times(self) -> bool:
-        """Test that response times are reasonable"""
-        self.log("Testing API response times...")
-        
-        endpoints = ["getAllMachines", "getMachineList"]
-        
-        for endpoint in endpoints:
-            try:
-                start_time = time.time()
-                response = self.session.get(f"{self.gas_endpoint}?action={endpoint}")
-                end_time = time.time()
-                
-                response_time = end_time - start_time
-                
-                if response.status_code == 200:
-                    if response_time < 5.0:  # 5 seconds threshold
-                        self.log(f"{endpoint} response time: {response_time:.2f}s - GOOD", "SUCCESS")
-                    else:
-                        self.log(f"{endpoint} response time: {response_time:.2f}s - SLOW", "WARNING")
-                else:
-                    self.log(f"{endpoint} failed to respond", "ERROR")
-                    return False
-                    
-            except Exception as e:
-                self.log(f"Error testing {endpoint} response time: {e}", "ERROR")
-                return False
+        """Check response time percentiles against the p95 threshold (and a baseline if given)"""
+        self.log(f"Benchmarking API response times ({self.benchmark_iterations} iterations, "
+                 f"{self.benchmark_warmup} warmup)...")
+        
+        benchmark = LatencyBenchmark(self.client, iterations=self.benchmark_iterations,
+                                     warmup=self.benchmark_warmup)
+        results = benchmark.run(["getAllMachines", "getMachineList"])
+        
+        passed = True
+        for endpoint, stats in results["actions"].items():
+            if stats["count"] == 0:
+                self.log(f"{endpoint} failed to respond", "ERROR")
+                passed = False
+                continue
+            slow = stats["p95"] >= self.p95_threshold_ms
+            if slow:
+                passed = False
+            level = "ERROR" if slow else ("WARNING" if stats["errors"] else "SUCCESS")
+            self.log(f"{endpoint}: p50 {stats['p50']:.0f}ms, p95 {stats['p95']:.0f}ms "
+                     f"(limit {self.p95_threshold_ms:.0f}ms), max {stats['max']:.0f}ms, errors {stats['errors']}", level)
+        
+        if self.results_path:
+            save_results(results, self.results_path)
+            self.log(f"Benchmark results saved: {self.results_path}")
+        
+        if self.baseline_path:
+            self.regressions = compare_to_baseline(results, load_baseline(self.baseline_path))
+            for r in self.regressions:
+                self.log(f"{r['action']} {r['metric']} regressed: {r['baseline']} -> {r['current']}", "ERROR")
+            if self.regressions:
+                passed = False
+            else:
+                self.log(f"No regressions against baseline {self.baseline_path}", "SUCCESS")
         
-        return True
+        return passed
     
     def run_compatibility_test(self) -> bool:
         """Run complete compatibility test suite"""
@@ -322,8 +322,9 @@ class APICompatibilityTester:
             ("Legacy Endpoints", self.test_legacy_endpoints),
             ("POST Endpoints", self.test_post_endpoints),
             ("New Endpoints", self.test_new_endpoints),
-            ("Response Times", self.test_response_times)
         ]
+        if self.benchmark_iterations > 0:
+            tests.append(("Response Times", self.test_response_times))
         
         passed = 0
         total = len(tests)
@@ -341,7 +342,10 @@ class APICompatibilityTester:
         
         self.log(f"\n🎯 Compatibility Test Results: {passed}/{total} test suites passed")
         
-        if passed >= 3:  # Allow new endpoints to fail
+        if self.regressions:
+            self.log("⚠️ Latency regressed against the baseline.", "WARNING")
+            return False
+        elif passed >= 3:  # Allow new endpoints to fail
             self.log("🎉 API is backward compatible! Frontend should work without changes.", "SUCCESS")
             return True
         else:
@@ -372,7 +376,14 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    tester = APICompatibilityTester(gas_endpoint)
+    # Latency check settings (a few requests per action by default; LATENCY_ITERATIONS=0 skips it)
+    tester = APICompatibilityTester(
+        gas_endpoint,
+        benchmark_iterations=int(os.environ.get("LATENCY_ITERATIONS", "5")),
+        p95_threshold_ms=float(os.environ.get("LATENCY_P95_MS", "5000")),
+        baseline_path=os.environ.get("LATENCY_BASELINE"),
+        results_path=os.environ.get("LATENCY_RESULTS")
+    )
     
     try:
         success = tester.run_compatibility_test()
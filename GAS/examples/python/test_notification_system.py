@@ -4,13 +4,13 @@ Discord WebHook Notification System Test Suite
 Tests the notification functionality and new API endpoints
 """
 
-import json
 import time
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import sys
 
+from gas_client import GASClient
+
 class NotificationSystemTester:
     def __init__(self, gas_endpoint: str):
         """
@@ -21,7 +21,7 @@ class NotificationSystemTester:
         """
         self.gas_endpoint = gas_endpoint.rstrip('/')
         self.test_machine_id = f"TEST_{int(time.time())}"
-        self.session = requests.Session()
+        self.client = GASClient(self.gas_endpoint, user_agent='GAS-Notification-Tester/1.0')
         
     def log(self, message: str, level: str = "INFO"):
         """Log message with timestamp"""
@@ -32,7 +32,7 @@ class NotificationSystemTester:
         """Test basic connection to GAS endpoint"""
         try:
             self.log("Testing basic connection to GAS endpoint...")
-            response = self.session.get(f"{self.gas_endpoint}?action=getMachineList")
+            response = self.client.get("getMachineList")
             
             if response.status_code == 200:
                 data = response.json()
@@ -63,7 +63,7 @@ class NotificationSystemTester:
         for endpoint in endpoints:
             try:
                 self.log(f"Testing endpoint: {endpoint}")
-                response = self.session.get(f"{self.gas_endpoint}?action={endpoint}")
+                response = self.client.get(endpoint)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -98,11 +98,7 @@ class NotificationSystemTester:
                 }
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(registration_data)
-            )
+            response = self.client.post(registration_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -141,11 +137,7 @@ class NotificationSystemTester:
                 "CMT": f"Test telemetry data - {minutes_ago} minutes ago"
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(telemetry_data)
-            )
+            response = self.client.post(telemetry_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -174,11 +166,7 @@ class NotificationSystemTester:
                 "isActive": is_active
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(status_data)
-            )
+            response = self.client.post(status_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -212,11 +200,7 @@ class NotificationSystemTester:
                     "testType": notification_type
                 }
                 
-                response = self.session.post(
-                    self.gas_endpoint,
-                    headers={"Content-Type": "application/json"},
-                    data=json.dumps(test_data)
-                )
+                response = self.client.post(test_data)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -249,11 +233,7 @@ class NotificationSystemTester:
                 "machineId": self.test_machine_id
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(check_data)
-            )
+            response = self.client.post(check_data)
             
             if response.status_code == 200:
                 data = response.json()
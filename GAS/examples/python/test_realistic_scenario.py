@@ -5,20 +5,25 @@ Simulates real-world machine operation using the exact telemetry format
 Based on: GAS/example_json/telemetry_data.json
 """
 
-import json
+import os
 import time
-import requests
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 import sys
 import random
 import math
 
+from gas_client import GASClient, make_idempotency_key
+from telemetry_spool import TelemetrySpool, SpoolFullError, delivered_prefix
+
 class RealisticTelemetrySimulator:
-    def __init__(self, gas_endpoint: str = "https://script.google.com/macros/s/AKfycbxWyEBGpdm09R5UdVqiYUrUiZ1FbeB4PU9KKKJJjLhI__Ged3_5oSfmRjLaBx2KHy4QUQ/exec"):
-        """Initialize realistic telemetry simulator"""
+    def __init__(self, gas_endpoint: str = "https://script.google.com/macros/s/AKfycbxWyEBGpdm09R5UdVqiYUrUiZ1FbeB4PU9KKKJJjLhI__Ged3_5oSfmRjLaBx2KHy4QUQ/exec",
+                 spool_dir: Optional[str] = None):
+        """Initialize realistic telemetry simulator (undelivered telemetry is spooled to spool_dir if set)"""
         self.gas_endpoint = gas_endpoint.rstrip('/')
-        self.session = requests.Session()
+        self.client = GASClient(self.gas_endpoint, user_agent='GAS-Realistic-Simulator/1.0')
+        self.spool = TelemetrySpool(spool_dir) if spool_dir else None
+        self.sequence = 0
         
         # Base telemetry data from example_json/telemetry_data.json
         self.base_telemetry = {
@@ -150,25 +155,79 @@ class RealisticTelemetrySimulator:
         return ",".join(comments)
     
     def send_telemetry(self, telemetry_data: dict) -> bool:
-        """Send telemetry data to GAS endpoint"""
-        try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(telemetry_data)
+        """Send telemetry data to GAS endpoint (spooled on failure when a spool is configured)"""
+        self.assign_idempotency_key(telemetry_data)
+        
+        if self.spool is not None and self.spool.pending:
+            # Keep order: queue behind the backlog and replay it first
+            self.spool_telemetry(telemetry_data)
+            self.replay_spool()
+            return self.spool.pending == 0
+        
+        if self._post_telemetry(telemetry_data):
+            return True
+        
+        if self.spool is not None:
+            self.spool_telemetry(telemetry_data)
+        return False
+    
+    def assign_idempotency_key(self, telemetry_data: dict) -> str:
+        """Stamp telemetry with MachineID:MachineTime:sequence so retries and replays are not saved twice"""
+        if "IdempotencyKey" not in telemetry_data:
+            self.sequence += 1
+            telemetry_data["IdempotencyKey"] = make_idempotency_key(
+                telemetry_data["MachineID"], telemetry_data["MachineTime"], self.sequence
             )
+        return telemetry_data["IdempotencyKey"]
+    
+    def spool_telemetry(self, telemetry_data: dict) -> bool:
+        """Store telemetry in the on-disk spool for later replay"""
+        self.assign_idempotency_key(telemetry_data)
+        try:
+            self.spool.append(telemetry_data)
+            self.log(f"Telemetry spooled ({self.spool.pending} pending)", "WARNING")
+            return True
+        except SpoolFullError as e:
+            self.log(f"Telemetry dropped: {e}", "ERROR")
+            return False
+    
+    def replay_spool(self, batch_size: int = 50) -> int:
+        """Replay spooled telemetry in order as batch POSTs"""
+        if self.spool is None or not self.spool.pending:
+            return 0
+        
+        delivered = self.spool.drain(self._post_telemetry_batch, batch_size=batch_size)
+        if delivered:
+            self.log(f"Replayed {delivered} spooled records ({self.spool.pending} pending)", "SIGNAL")
+        return delivered
+    
+    def _post_telemetry_batch(self, records: List[dict]) -> int:
+        """Send a batch and return how many leading records the endpoint saved"""
+        try:
+            response = self.client.post(records)
             
             if response.status_code == 200:
-                result = response.json()
-                if result.get("status") == "success":
-                    return True
+                delivered = delivered_prefix(response.json(), len(records))
+                if delivered < len(records):
+                    self.log(f"Replay stopped after {delivered}/{len(records)} records", "ERROR")
+                return delivered
             
-            self.log(f"Failed to send telemetry: {response.status_code}", "ERROR")
-            return False
+            self.log(f"Failed to replay spool: {response.status_code}", "ERROR")
+            return 0
             
         except Exception as e:
-            self.log(f"Error sending telemetry: {e}", "ERROR")
-            return False
+            self.log(f"Error replaying spool: {e}", "ERROR")
+            return 0
+    
+    def _post_telemetry(self, telemetry_data: dict) -> bool:
+        """Post a single telemetry record (transport failures are retried with backoff)"""
+        result = self.client.post_idempotent(telemetry_data)
+        
+        if result.get("status") == "success":
+            return True
+        
+        self.log(f"Failed to send telemetry: {result.get('message')}", "ERROR")
+        return False
     
     def set_machine_active(self, is_active: bool) -> bool:
         """Set machine active status"""
@@ -179,11 +238,7 @@ class RealisticTelemetrySimulator:
                 "isActive": is_active
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -207,11 +262,7 @@ class RealisticTelemetrySimulator:
                 }
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -284,11 +335,17 @@ class RealisticTelemetrySimulator:
         # Show a countdown for dramatic effect
         for remaining in [15, 10, 5, 3, 2, 1]:
             self.log(f"⏰ Signal recovery in {remaining} minutes...", "WARNING")
+            if self.spool is not None:
+                # Link is down: the machine keeps logging into the local spool
+                telemetry = self.generate_realistic_telemetry(0)
+                telemetry["CMT"] = f"{telemetry['CMT']},NOTE:BLACKOUT_T-{remaining}min"
+                self.spool_telemetry(telemetry)
             time.sleep(2)  # Shortened for demo
         
         # Phase 3: Signal recovery
         self.log("Phase 3: Signal Recovery", "MISSION")
         self.log("📡 Communication restored!", "SUCCESS")
+        self.replay_spool()
         
         # Send recovery telemetry data
         recovery_timeline = [
@@ -445,13 +502,16 @@ def main():
         print("   Or run: python3 test_realistic_scenario.py https://script.google.com/.../exec")
         sys.exit(1)
     
-    simulator = RealisticTelemetrySimulator(gas_endpoint)
+    # Optional store-and-forward spool (keeps telemetry across link loss and restarts)
+    simulator = RealisticTelemetrySimulator(gas_endpoint, os.environ.get("TELEMETRY_SPOOL_DIR"))
     
     print("Realistic Telemetry Mission Simulator")
     print("=" * 40)
     print(f"Endpoint: {gas_endpoint}")
     print(f"Machine ID: {simulator.base_telemetry['MachineID']}")
     print(f"Based on: example_json/telemetry_data.json")
+    if simulator.spool is not None:
+        print(f"Spool: {simulator.spool.directory} ({simulator.spool.pending} pending)")
     print()
     
     # Show available scenarios
@@ -488,6 +548,9 @@ def main():
             print("\n⚠️ Scenario interrupted by user")
         except Exception as e:
             print(f"\n❌ Scenario error: {e}")
+        finally:
+            if simulator.spool is not None:
+                simulator.spool.close()
     else:
         print("❌ Invalid scenario selection")
         sys.exit(1)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Client Self-check Script
+Checks the client-side building blocks (spool ack/replay, LTTB, Kalman,
+spatial index, stream decoder, k-way merge, Papa-compatible CSV, deadline
+heap) and the batch/single append race without a live WebApp: backend
+checks run against local_gas_server.py, started in-process unless a URL
+is given.
+
+Usage:
+    python3 test_self_check.py
+    python3 test_self_check.py http://127.0.0.1:8080/exec
+"""
+
+import json
+import math
+import random
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from downsample import lttb_indices
+from export_fleet import csv_field
+from fleet_merge import UnsortedTrackError, merge_tracks
+from gas_client import GASClient, make_idempotency_key
+from kalman_tracker import FleetKalmanTracker
+from local_gas_server import LatencyModel, start_stand_in
+from signal_monitor import LOST, SignalMonitor
+from simple_sender import drain_spool
+from spatial_index import SpatialIndex, haversine_km
+from stream_decoder import MachinesStream
+from telemetry_spool import TelemetrySpool, delivered_prefix
+
+
+def _wire_record(machine_id: str, sequence: int, keyed: bool = False) -> Dict[str, Any]:
+    """Telemetry payload in the same format as create_test_data"""
+    machine_time = f"2025/07/16 00:{sequence // 60 % 60:02d}:{sequence % 60:02d}"
+    record = {
+        "DataType": "HK",
+        "MachineID": machine_id,
+        "MachineTime": machine_time,
+        "GPS": {"LAT": 35.681236, "LNG": 139.767125, "ALT": 40.0, "SAT": 8},
+        "BAT": 3.7,
+        "CMT": f"SELF_CHECK,SEQ:{sequence}"
+    }
+    if keyed:
+        record["IdempotencyKey"] = make_idempotency_key(machine_id, machine_time, sequence)
+    return record
+
+
+class SelfChecker:
+    def __init__(self, gas_endpoint: Optional[str] = None):
+        """Initialize self-checker (backend checks start a stand-in if gas_endpoint is None)"""
+        self.gas_endpoint = gas_endpoint
+        self.server = None
+        self.client = None
+
+    def log(self, message: str, level: str = "INFO"):
+        """Log with timestamp"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        symbol = {"INFO": "ℹ️", "SUCCESS": "✅", "ERROR": "❌", "WARNING": "⚠️"}.get(level, "ℹ️")
+        print(f"[{timestamp}] {symbol} {message}")
+
+    def expect(self, condition: bool, message: str) -> bool:
+        """Log a failed expectation"""
+        if not condition:
+            self.log(message, "ERROR")
+        return condition
+
+    def _backend(self) -> GASClient:
+        if self.client is None:
+            if self.gas_endpoint is None:
+                self.server = start_stand_in(LatencyModel(0.0, 0.0, 0.0, seed=0))
+                self.gas_endpoint = self.server.url
+                self.log(f"Started stand-in at {self.gas_endpoint}")
+            self.client = GASClient(self.gas_endpoint, user_agent='GAS-Self-Check/1.0')
+        return self.client
+
+    # ---- store-and-forward ---------------------------------------------
+
+    def test_spool_ack_replay(self) -> bool:
+        """Partial-failure ack keeps the failed record and everything after it, then replays in order"""
+        ok = True
+        ok &= self.expect(delivered_prefix(None, 3) == 0, "delivered_prefix(None) should be 0")
+        ok &= self.expect(delivered_prefix({"results": [{"status": "success"}, {"status": "error"},
+                                                        {"status": "success"}]}, 3) == 1,
+                          "delivered_prefix should stop at the first failed record")
+
+        directory = tempfile.mkdtemp(prefix="spool-self-check-")
+        try:
+            machine_id = "SCSP1"
+            records = [_wire_record(machine_id, i, keyed=True) for i in range(5)]
+            spool = TelemetrySpool(directory, segment_bytes=512)
+            for record in records:
+                spool.append(record)
+
+            # Records 0-1 saved (1 as a duplicate), record 2 rejected, 3-4 saved
+            partial = {"status": "partial", "results": [
+                {"index": 0, "status": "success"},
+                {"index": 1, "status": "success", "duplicate": True},
+                {"index": 2, "status": "error", "message": "Lock timeout"},
+                {"index": 3, "status": "success"},
+                {"index": 4, "status": "success"},
+            ]}
+            delivered = spool.drain(lambda batch: delivered_prefix(partial, len(batch)), batch_size=5)
+            ok &= self.expect(delivered == 2 and spool.pending == 3,
+                              f"partial batch acked {delivered} (pending {spool.pending}), expected 2 (pending 3)")
+            spool.close()
+
+            # The cursor survives a restart
+            spool = TelemetrySpool(directory, segment_bytes=512)
+            pending = [r["CMT"] for r in spool.peek(10)]
+            ok &= self.expect(pending == [r["CMT"] for r in records[2:]],
+                              f"spool should replay records 2-4 in order, got {pending}")
+
+            client = self._backend()
+            replayed = drain_spool(spool, self.gas_endpoint, batch_size=2)
+            ok &= self.expect(replayed == 3 and spool.pending == 0,
+                              f"replay delivered {replayed} (pending {spool.pending}), expected 3 (pending 0)")
+            spool.close()
+
+            # Replaying a record the WebApp already saved is answered as a duplicate
+            again = client.post_json(records[4])
+            ok &= self.expect(again.get("duplicate") is True, f"re-sent keyed record not deduplicated: {again}")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        return ok
+
+    def test_append_race(self, singles: int = 40, batches: int = 8, batch_size: int = 10) -> bool:
+        """Concurrent single and batch appends to one sheet get distinct, contiguous row numbers"""
+        client = self._backend()
+        machine_id = f"SCRC{random.randint(0, 9999):04d}"
+        rows: List[int] = []
+        errors: List[str] = []
+        rows_lock = threading.Lock()
+
+        def send_single(sequence: int):
+            result = client.post_json(_wire_record(machine_id, sequence))
+            with rows_lock:
+                if result.get("status") == "success":
+                    rows.append(result["rowNumber"])
+                else:
+                    errors.append(str(result.get("message")))
+
+        def send_batch(first: int):
+            result = client.post_json([_wire_record(machine_id, first + i) for i in range(batch_size)])
+            with rows_lock:
+                for entry in result.get("results") or []:
+                    if entry.get("status") == "success":
+                        rows.append(entry["rowNumber"])
+                    else:
+                        errors.append(str(entry.get("message")))
+
+        threads = [threading.Thread(target=send_single, args=(i,)) for i in range(singles)]
+        threads += [threading.Thread(target=send_batch, args=(1000 + i * batch_size,)) for i in range(batches)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = singles + batches * batch_size
+        ok = self.expect(not errors, f"{len(errors)} appends failed: {errors[:3]}")
+        ok &= self.expect(len(rows) == total and len(set(rows)) == total,
+                          f"{len(rows)} row numbers for {total} appends ({len(set(rows))} distinct)")
+        if rows:
+            ok &= self.expect(max(rows) - min(rows) + 1 == total,
+                              f"row numbers {min(rows)}..{max(rows)} are not contiguous for {total} appends")
+
+        saved = client.get_json("getMachine", {"machineId": machine_id})
+        ok &= self.expect(saved.get("dataCount") == total,
+                          f"getMachine returned {saved.get('dataCount')} rows, expected {total}")
+        return ok
+
+    # ---- analytics ---------------------------------------------------------
+
+    def test_lttb(self) -> bool:
+        """LTTB keeps the end points and a lone spike, and returns ascending indices"""
+        n = 1000
+        x = list(range(n))
+        y = [math.sin(i / 50.0) for i in range(n)]
+        y[517] = 25.0
+        indices = lttb_indices(x, y, 100)
+
+        ok = self.expect(len(indices) == 100, f"LTTB kept {len(indices)} points, expected 100")
+        ok &= self.expect(indices[0] == 0 and indices[-1] == n - 1, "LTTB must keep the first and last point")
+        ok &= self.expect(all(a < b for a, b in zip(indices, indices[1:])), "LTTB indices must be ascending")
+        ok &= self.expect(517 in indices, "LTTB dropped the spike")
+        ok &= self.expect(lttb_indices(x[:50], y[:50], 100) == list(range(50)),
+                          "LTTB should keep every point below the threshold")
+        return ok
+
+    def test_kalman(self) -> bool:
+        """A constant-velocity track converges to its speed and heading; stale fixes are skipped"""
+        tracker = FleetKalmanTracker(measurement_noise_m=5.0, history_size=5)
+        latitude, longitude = 35.0, 139.0
+        metres_per_deg_lng = math.radians(1) * 6371000.0 * math.cos(math.radians(latitude))
+        estimate = None
+        # 10 m/s due east, one fix every 10 s
+        for i in range(60):
+            estimate = tracker.update_fix("SCKF1", 1_700_000_000 + i * 10, latitude,
+                                          longitude + i * 100.0 / metres_per_deg_lng)
+
+        ok = self.expect(abs(estimate["speed"] - 36.0) < 1.0, f"speed {estimate['speed']:.2f} km/h, expected 36")
+        ok &= self.expect(abs(estimate["heading"] - 90.0) < 2.0, f"heading {estimate['heading']:.1f}, expected 90")
+        ok &= self.expect(estimate["positionSigma"] < 5.0,
+                          f"position sigma {estimate['positionSigma']:.2f} m did not shrink below the GPS noise")
+        ok &= self.expect(tracker.update_fix("SCKF1", 1_700_000_000, latitude, longitude) is None,
+                          "a fix older than the track should be skipped")
+        ok &= self.expect(len(tracker.smoothed("SCKF1")) == 5, "history should keep the last 5 estimates")
+
+        ahead = tracker.predict("SCKF1", 60)
+        expected_lng = longitude + 65 * 100.0 / metres_per_deg_lng
+        ok &= self.expect(abs(ahead["longitude"] - expected_lng) * metres_per_deg_lng < 20.0,
+                          "60 s prediction is more than 20 m off the straight-line position")
+        return ok
+
+    def test_spatial_ring(self) -> bool:
+        """Ring search matches brute force, terminates outside the extent and wraps at ±180"""
+        rng = random.Random(7)
+        index = SpatialIndex(cell_deg=0.5)
+        for i in range(200):
+            index.add(f"M{i:03d}", 0.0, rng.uniform(30.0, 40.0), rng.uniform(135.0, 145.0))
+        index.add("EAST", 0.0, -17.0, 179.9)
+        index.add("WEST", 0.0, -17.0, -179.9)
+
+        def brute(latitude: float, longitude: float, k: int) -> List[str]:
+            distances = sorted((haversine_km(latitude, longitude, index.latitude[i], index.longitude[i]),
+                                index.machine_ids[code]) for code, i in index.latest.items())
+            return [machine_id for _, machine_id in distances[:k]]
+
+        ok = True
+        queries = [(rng.uniform(30.0, 40.0), rng.uniform(135.0, 145.0)) for _ in range(50)]
+        queries += [(-60.0, -30.0), (80.0, 0.0), (-17.0, 179.95)]
+        for latitude, longitude in queries:
+            got = [fix.machine_id for _, fix in index.nearest_machines(latitude, longitude, k=3)]
+            if got != brute(latitude, longitude, 3):
+                ok = self.expect(False, f"nearest_machines({latitude:.2f}, {longitude:.2f}) = {got}, "
+                                        f"expected {brute(latitude, longitude, 3)}")
+
+        ok &= self.expect(index.nearest_machines(-60.0, -30.0, k=3, max_km=100.0) == [],
+                          "max_km should stop the ring search with no machines in reach")
+        ok &= self.expect({f.machine_id for _, f in index.nearest_machines(-17.0, 179.95, k=2)} == {"EAST", "WEST"},
+                          "machines on both sides of the antimeridian should be nearest")
+        crossing = {f.machine_id for f in index.bbox(-18.0, 179.0, -16.0, -179.0)}
+        ok &= self.expect(crossing == {"EAST", "WEST"}, f"antimeridian bbox returned {sorted(crossing)}")
+        return ok
+
+    # ---- decoding and export -------------------------------------------
+
+    def test_stream_decoder(self) -> bool:
+        """Byte-at-a-time decoding matches json.loads, including multi-byte text and escapes"""
+        body = {
+            "status": "success",
+            "machines": [
+                {"machineId": "00453", "isActive": True, "data": [
+                    {"timestamp": "2025-07-24T11:29:45.000Z", "latitude": 35.1, "comment": "通常運転"},
+                    {"timestamp": "2025-07-24T11:30:45.000Z", "latitude": -0.0, "comment": "say \"hi\"\n\\"},
+                ]},
+                {"machineId": "00454", "isActive": False, "data": []},
+                {"machineId": "00455", "data": [{"timestamp": "2025-07-24T11:31:45.000Z", "battery": 1e-7}]},
+            ],
+            "totalMachines": 3,
+            "fingerprint": "abc"
+        }
+        encoded = json.dumps(body, ensure_ascii=False, indent=1).encode("utf-8")
+        stream = MachinesStream(encoded[i:i + 1] for i in range(len(encoded)))
+        records = list(stream)
+
+        expected = [(m["machineId"], r) for m in body["machines"] for r in m["data"]]
+        ok = self.expect(records == expected, "streamed records differ from json.loads")
+        ok &= self.expect(stream.header == {"status": "success", "totalMachines": 3, "fingerprint": "abc"},
+                          f"stream header {stream.header}")
+        ok &= self.expect([m.get("dataCount") for m in stream.machines] == [2, 0, 1],
+                          f"per-machine counts {[m.get('dataCount') for m in stream.machines]}")
+        return ok
+
+    def test_kway_merge(self) -> bool:
+        """merge_tracks yields one time-ordered stream and flags unsorted tracks"""
+        rng = random.Random(3)
+        tracks = {}
+        for machine_id in ("A", "B", "C"):
+            seconds = sorted(rng.sample(range(3600), 50))
+            tracks[machine_id] = [{"machineId": machine_id,
+                                   "timestamp": f"2025-07-24T11:{s // 60:02d}:{s % 60:02d}.000Z"}
+                                  for s in seconds]
+        merged = list(merge_tracks({k: iter(v) for k, v in tracks.items()}, check=True))
+        expected = sorted((r for rows in tracks.values() for r in rows), key=lambda r: r["timestamp"])
+
+        ok = self.expect(merged == expected, "merged stream is not time-ordered")
+        try:
+            list(merge_tracks({"A": tracks["A"][::-1]}, check=True))
+            ok = self.expect(False, "an unsorted track should raise UnsortedTrackError")
+        except UnsortedTrackError:
+            pass
+        return ok
+
+    def test_csv_quoting(self) -> bool:
+        """csv_field quotes and formats values like Papa.unparse"""
+        cases = [
+            ("plain", "plain"),
+            ("a,b", '"a,b"'),
+            ('say "hi"', '"say ""hi"""'),
+            ("line\nbreak", '"line\nbreak"'),
+            (" padded", '" padded"'),
+            ("﻿bom", '"﻿bom"'),
+            (None, ""),
+            (True, "true"),
+            (8.0, "8"),
+            (1e-7, "1e-7"),
+            (1e21, "1e+21"),
+            (float("nan"), "NaN"),
+            ({"a": 1}, '"{""a"":1}"'),
+        ]
+        ok = True
+        for value, expected in cases:
+            got = csv_field(value)
+            if got != expected:
+                ok = self.expect(False, f"csv_field({value!r}) = {got!r}, expected {expected!r}")
+        return ok
+
+    # ---- signal monitor ------------------------------------------------
+
+    def test_deadline_heap(self) -> bool:
+        """Deadlines fire once per loss, move with new data, and recover on new data"""
+        now = [1_700_000_000.0]
+        monitor = SignalMonitor(timeout_minutes=10, clock=lambda: now[0])
+        monitor.observe("A", now[0])
+        monitor.observe("B", now[0] + 60)
+        monitor.observe("C", now[0], is_active=False)
+
+        ok = self.expect(monitor.next_deadline() == now[0] + 600, f"next deadline {monitor.next_deadline()}")
+        # New data for A pushes its deadline back without a loss
+        monitor.observe("A", now[0] + 300)
+        lost = monitor.expire(now[0] + 600)
+        ok &= self.expect(lost == [], f"no machine should be lost at +600s, got {lost}")
+
+        lost = [e["machineId"] for e in monitor.expire(now[0] + 660)]
+        ok &= self.expect(lost == ["B"], f"expected B lost at +660s, got {lost}")
+        lost = [e["machineId"] for e in monitor.expire(now[0] + 900)]
+        ok &= self.expect(lost == ["A"], f"expected A lost at +900s, got {lost}")
+        ok &= self.expect(monitor.expire(now[0] + 3600) == [], "lost machines must not be reported twice")
+        ok &= self.expect(monitor.lost_machines() == ["A", "B"], f"lost machines {monitor.lost_machines()}")
+
+        events = monitor.observe("B", now[0] + 3600, now=now[0] + 3600)
+        ok &= self.expect([e["type"] for e in events] == ["recovered"], f"B recovery events {events}")
+        ok &= self.expect(monitor.status["B"]["status"] != LOST, "B should be normal after new data")
+        ok &= self.expect(monitor.next_deadline() == now[0] + 4200, f"B rescheduled at {monitor.next_deadline()}")
+        return ok
+
+    def run_self_check(self) -> bool:
+        """Run all self-checks"""
+        checks = [
+            ("Spool Ack/Replay", self.test_spool_ack_replay),
+            ("Batch/Single Append Race", self.test_append_race),
+            ("LTTB Downsampling", self.test_lttb),
+            ("Kalman Tracker", self.test_kalman),
+            ("Spatial Index Ring Search", self.test_spatial_ring),
+            ("Stream Decoder", self.test_stream_decoder),
+            ("K-way Merge", self.test_kway_merge),
+            ("Papa CSV Quoting", self.test_csv_quoting),
+            ("Deadline Heap", self.test_deadline_heap),
+        ]
+
+        results = []
+        try:
+            for name, check in checks:
+                self.log(f"Checking: {name}")
+                try:
+                    passed = check()
+                except Exception as e:
+                    self.log(f"{name} raised {type(e).__name__}: {e}", "ERROR")
+                    passed = False
+                self.log(f"{name} - {'PASSED' if passed else 'FAILED'}", "SUCCESS" if passed else "ERROR")
+                results.append((name, passed))
+        finally:
+            if self.server is not None:
+                self.server.shutdown()
+                self.server.server_close()
+
+        passed_count = sum(1 for _, passed in results if passed)
+        print()
+        print("=" * 30)
+        print(f"Self-check: {passed_count}/{len(results)} passed")
+        for name, passed in results:
+            print(f"  {'✅' if passed else '❌'} {name}")
+        return passed_count == len(results)
+
+
+def main():
+    gas_endpoint = sys.argv[1] if len(sys.argv) == 2 else None
+
+    print("Client Self-check")
+    print("=" * 30)
+    print(f"Backend: {gas_endpoint or 'in-process stand-in'}")
+    print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        success = SelfChecker(gas_endpoint).run_self_check()
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        print("\n⚠️ Self-check interrupted")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
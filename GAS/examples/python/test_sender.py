@@ -4,10 +4,13 @@ Made by Shintaro Matsumoto
 """
 
 import json
-import requests
+import threading
 import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from gas_client import GASClient, make_idempotency_key
+from telemetry_record import TelemetryRecord
 
 
 class GASTestSender:
@@ -19,11 +22,32 @@ class GASTestSender:
             webapp_url: Google Apps Script WebApp URL
         """
         self.webapp_url = webapp_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'GAS-Test-Sender/1.0'
-        })
+        self.client = GASClient(webapp_url, user_agent='GAS-Test-Sender/1.0')
+        self._sequences = {}
+        self._sequence_lock = threading.Lock()
+    
+    def create_test_record(self, machine_id: str = "00453", data_type: str = "HK") -> TelemetryRecord:
+        """
+        Generate a test record (slotted, no per-record dicts)
+        
+        Args:
+            machine_id: Machine ID
+            data_type: Data type
+            
+        Returns:
+            TelemetryRecord
+        """
+        current_time = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+        
+        return TelemetryRecord(
+            machine_id, current_time, data_type,
+            latitude=34.124125,
+            longitude=153.131241,
+            altitude=342.5,
+            satellites=43,
+            battery=3.45,
+            comment="MODE:NORMAL,COMM:OK,GPS:LOCKED,SENSOR:TEMP_OK,PRESSURE:STABLE,ERROR:NONE"
+        )
     
     def create_test_data(self, machine_id: str = "00453", data_type: str = "HK") -> Dict[str, Any]:
         """
@@ -36,21 +60,36 @@ class GASTestSender:
         Returns:
             Test data dictionary
         """
-        current_time = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+        return self.create_test_record(machine_id, data_type).to_wire()
+    
+    def create_machine_test_record(self, machine_id: str) -> TelemetryRecord:
+        """
+        Generate a test record with a per-machine position offset
         
-        return {
-            "DataType": data_type,
-            "MachineID": machine_id,
-            "MachineTime": current_time,
-            "GPS": {
-                "LAT": 34.124125,
-                "LNG": 153.131241,
-                "ALT": 342.5,
-                "SAT": 43
-            },
-            "BAT": 3.45,
-            "CMT": "MODE:NORMAL,COMM:OK,GPS:LOCKED,SENSOR:TEMP_OK,PRESSURE:STABLE,ERROR:NONE"
-        }
+        Args:
+            machine_id: Machine ID
+            
+        Returns:
+            TelemetryRecord
+        """
+        record = self.create_test_record(machine_id)
+        # Change position for each machine
+        id_num = int(machine_id) if machine_id.isdigit() else hash(machine_id) % 1000
+        record.latitude += (id_num % 100) * 0.01
+        record.longitude += (id_num % 100) * 0.01
+        return record
+    
+    def create_machine_test_data(self, machine_id: str) -> Dict[str, Any]:
+        """
+        Generate test data with a per-machine position offset
+        
+        Args:
+            machine_id: Machine ID
+            
+        Returns:
+            Test data dictionary
+        """
+        return self.create_machine_test_record(machine_id).to_wire()
     
     def send_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -62,41 +101,48 @@ class GASTestSender:
         Returns:
             Response dictionary
         """
-        try:
-            print(f"Sending data: {json.dumps(data, indent=2, ensure_ascii=False)}")
-            
-            response = self.session.post(
-                self.webapp_url,
-                json=data,
-                timeout=30
-            )
+        self.assign_idempotency_key(data)
+        print(f"Sending data: {json.dumps(data, indent=2, ensure_ascii=False)}")
+        return self.post_data(data, verbose=True)
+    
+    def assign_idempotency_key(self, data: Dict[str, Any]) -> str:
+        """
+        Stamp data with MachineID:MachineTime:sequence (kept if already present,
+        so resending the same record reuses its key)
+        
+        Args:
+            data: Data to send
             
-            print(f"HTTP Status: {response.status_code}")
-            print(f"Response: {response.text}")
+        Returns:
+            Idempotency key
+        """
+        if "IdempotencyKey" not in data:
+            machine_id = data.get("MachineID", "")
+            with self._sequence_lock:
+                sequence = self._sequences.get(machine_id, 0) + 1
+                self._sequences[machine_id] = sequence
+            data["IdempotencyKey"] = make_idempotency_key(machine_id, data.get("MachineTime", ""), sequence)
+        return data["IdempotencyKey"]
+    
+    def post_data(self, data: Dict[str, Any], verbose: bool = False, url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Post data to GAS WebApp, retrying transport failures without duplicate rows
+        
+        Args:
+            data: Data to send
+            verbose: Print the response
+            url: Endpoint override (defaults to webapp_url)
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {
-                    "status": "error",
-                    "message": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except requests.exceptions.Timeout:
-            return {
-                "status": "error",
-                "message": "Request timeout"
-            }
-        except requests.exceptions.ConnectionError:
-            return {
-                "status": "error",
-                "message": "Connection error"
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Unexpected error: {str(e)}"
-            }
+        Returns:
+            Response dictionary
+        """
+        self.assign_idempotency_key(data)
+        result = self.client.post_idempotent(data, timeout=30, url=url)
+        
+        if verbose:
+            print(f"Response: {json.dumps(result, ensure_ascii=False)}")
+        
+        return result
     
     def test_single_send(self, machine_id: str = "00453"):
         """
@@ -171,11 +217,7 @@ class GASTestSender:
         for machine_id in machine_ids:
             print(f"\n--- Machine {machine_id} ---")
             
-            test_data = self.create_test_data(machine_id)
-            # Change position for each machine
-            id_num = int(machine_id) if machine_id.isdigit() else hash(machine_id) % 1000
-            test_data["GPS"]["LAT"] += (id_num % 100) * 0.01
-            test_data["GPS"]["LNG"] += (id_num % 100) * 0.01
+            test_data = self.create_machine_test_data(machine_id)
             
             result = self.send_data(test_data)
             
@@ -215,9 +257,12 @@ def main():
             print("1. Single Data Send Test")
             print("2. Multiple Data Send Test")
             print("3. Multiple Machines Send Test")
-            print("4. Exit")
+            print("4. Fleet Send Test (async)")
+            print("5. Fleet Concurrency Sweep (async)")
+            print("6. Open-loop Load Test (constant arrival rate)")
+            print("7. Exit")
             
-            choice = input("\nPlease select (1-4): ").strip()
+            choice = input("\nPlease select (1-7): ").strip()
             
             if choice == "1":
                 machine_id = input("Machine ID (default: 00453): ").strip() or "00453"
@@ -239,6 +284,35 @@ def main():
                 sender.test_multiple_machines(machine_ids, interval)
             
             elif choice == "4":
+                from async_sender import AsyncFleetSender, fleet_machine_ids
+                count = int(input("Machine count (default: 100): ").strip() or "100")
+                max_in_flight = int(input("Max in-flight requests (default: 8): ").strip() or "8")
+                rounds = int(input("Rounds (default: 1): ").strip() or "1")
+                fleet_sender = AsyncFleetSender(webapp_url, max_in_flight=max_in_flight)
+                try:
+                    fleet_sender.test_fleet_send(fleet_machine_ids(count), rounds)
+                finally:
+                    fleet_sender.close()
+            
+            elif choice == "5":
+                from async_sender import AsyncFleetSender, fleet_machine_ids
+                count = int(input("Machine count (default: 100): ").strip() or "100")
+                fleet_sender = AsyncFleetSender(webapp_url)
+                try:
+                    fleet_sender.test_concurrency_sweep(fleet_machine_ids(count))
+                finally:
+                    fleet_sender.close()
+            
+            elif choice == "6":
+                from async_sender import fleet_machine_ids
+                from open_loop_load import OpenLoopLoadGenerator, print_summary
+                count = int(input("Machine count (default: 100): ").strip() or "100")
+                rate = float(input("Sends per second per machine (default: 1.0): ").strip() or "1.0")
+                duration = float(input("Duration (seconds) (default: 60): ").strip() or "60")
+                generator = OpenLoopLoadGenerator(webapp_url, fleet_machine_ids(count), rate)
+                print_summary(generator.run(duration))
+            
+            elif choice == "7":
                 print("Exiting test")
                 break
             
@@ -4,14 +4,14 @@ Machine Timeout Simulation Script
 Simulates various timeout scenarios for Discord notification testing
 """
 
-import json
 import time
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List
 import sys
 import argparse
 
+from gas_client import GASClient
+
 class TimeoutSimulator:
     def __init__(self, gas_endpoint: str, machine_id: str = None):
         """
@@ -23,7 +23,7 @@ class TimeoutSimulator:
         """
         self.gas_endpoint = gas_endpoint.rstrip('/')
         self.machine_id = machine_id or f"SIM_{int(time.time())}"
-        self.session = requests.Session()
+        self.client = GASClient(self.gas_endpoint, user_agent='GAS-Timeout-Simulator/1.0')
         
     def log(self, message: str, level: str = "INFO"):
         """Log with timestamp"""
@@ -50,11 +50,7 @@ class TimeoutSimulator:
         }
         
         try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -78,11 +74,7 @@ class TimeoutSimulator:
         }
         
         try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -106,11 +98,7 @@ class TimeoutSimulator:
         }
         
         try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -139,11 +127,7 @@ class TimeoutSimulator:
         }
         
         try:
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -242,11 +226,7 @@ class TimeoutSimulator:
                 "CMT": description
             }
             
-            response = self.session.post(
-                self.gas_endpoint,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(data)
-            )
+            response = self.client.post(data)
             
             self.log(f"📊 {machine_time}: {battery}V - {description}")
             time.sleep(1)
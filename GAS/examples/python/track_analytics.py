@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Vectorized Track Analytics (v2.0.0)
+Segment distance, bearing, speed, cumulative distance and time gaps for
+whole tracks as NumPy array operations. The formulas match
+vehicle-tracker/src/utils/prediction.ts (haversine on a 6371 km sphere,
+initial great-circle bearing), and a whole fleet is processed in one
+batched call: all tracks are concatenated and machine boundaries are
+masked instead of looping per machine.
+
+Usage:
+    python3 track_analytics.py <GAS_WEBAPP_URL>
+    python3 track_analytics.py --cache ./cache
+
+    from track_analytics import fleet_track_metrics, tracks_from_response
+    metrics = fleet_track_metrics(tracks_from_response(result))
+    metrics.machine("00453")["speed_kmh"]
+    metrics.summary()
+"""
+
+import argparse
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from telemetry_cache import TelemetryCache, parse_timestamp
+
+EARTH_RADIUS_KM = 6371.0
+
+# (timestamps as epoch seconds, latitudes, longitudes)
+Track = Tuple[Sequence[float], Sequence[float], Sequence[float]]
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in kilometers (calculateDistance)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bearing_deg(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Initial bearing in degrees from north, 0-360 (calculateBearing)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    d_lon = lon2 - lon1
+    y = np.sin(d_lon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(d_lon)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def destination(lat, lon, distance_km, bearing) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Point reached from (lat, lon) after distance_km along bearing (calculateDestination)
+
+    Returns:
+        (latitudes, longitudes) in degrees
+    """
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    bearing = np.radians(np.asarray(bearing, dtype=float))
+    angular = np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM
+
+    new_lat = np.arcsin(np.sin(lat) * np.cos(angular) + np.cos(lat) * np.sin(angular) * np.cos(bearing))
+    new_lon = lon + np.arctan2(np.sin(bearing) * np.sin(angular) * np.cos(lat),
+                               np.cos(angular) - np.sin(lat) * np.sin(new_lat))
+    return np.degrees(new_lat), np.degrees(new_lon)
+
+
+class FleetTrackMetrics:
+    def __init__(self, machine_ids: List[str], offsets: np.ndarray, timestamp: np.ndarray,
+                 latitude: np.ndarray, longitude: np.ndarray):
+        """
+        Per-point metrics of a whole fleet in flat arrays
+
+        Points of machine k are [offsets[k], offsets[k + 1]), sorted by time.
+        Segment metrics are stored on the point that ends the segment; the
+        first point of each machine has distance, time gap and speed 0 and
+        bearing NaN.
+
+        Args:
+            machine_ids: Machine IDs in offset order
+            offsets: Point offsets (len(machine_ids) + 1)
+            timestamp: Epoch seconds
+            latitude, longitude: Degrees
+        """
+        self.machine_ids = machine_ids
+        self.offsets = offsets
+        self.timestamp = timestamp
+        self.latitude = latitude
+        self.longitude = longitude
+        self._index = {machine_id: k for k, machine_id in enumerate(machine_ids)}
+
+        n = len(timestamp)
+        lengths = np.diff(offsets)
+        self.first = np.zeros(n, dtype=bool)
+        self.first[offsets[:-1][lengths > 0]] = True
+
+        prev = np.maximum(np.arange(n) - 1, 0)
+        self.distance_km = haversine_km(latitude[prev], longitude[prev], latitude, longitude)
+        self.distance_km[self.first] = 0.0
+        self.bearing_deg = bearing_deg(latitude[prev], longitude[prev], latitude, longitude)
+        self.bearing_deg[self.first] = np.nan
+        self.gap_s = timestamp - timestamp[prev]
+        self.gap_s[self.first] = 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.speed_kmh = np.where(self.gap_s > 0, self.distance_km / self.gap_s * 3600, 0.0)
+
+        # Running total restarted at each machine's first point
+        total = np.cumsum(self.distance_km)
+        before = np.concatenate(([0.0], total))[offsets[:-1]]
+        self.cumulative_km = total - np.repeat(before, lengths)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def machine(self, machine_id: str) -> Dict[str, np.ndarray]:
+        """
+        Views of one machine's arrays
+
+        Returns:
+            {timestamp, latitude, longitude, distance_km, bearing_deg, gap_s,
+             speed_kmh, cumulative_km}
+        """
+        k = self._index[machine_id]
+        window = slice(self.offsets[k], self.offsets[k + 1])
+        return {name: getattr(self, name)[window]
+                for name in ("timestamp", "latitude", "longitude", "distance_km", "bearing_deg",
+                             "gap_s", "speed_kmh", "cumulative_km")}
+
+    def gaps(self, threshold_s: float) -> Dict[str, np.ndarray]:
+        """
+        Indices (within each machine) of points that follow a gap longer than threshold_s
+        """
+        hits = np.flatnonzero(self.gap_s > threshold_s)
+        owners = np.searchsorted(self.offsets, hits, side="right") - 1
+        return {self.machine_ids[k]: hits[owners == k] - self.offsets[k] for k in np.unique(owners)}
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-machine totals computed with segmented reductions
+
+        Returns:
+            {machine_id: {points, total_km, duration_s, mean_speed_kmh,
+                          max_speed_kmh, max_gap_s}}
+        """
+        lengths = np.diff(self.offsets)
+        nonempty = np.flatnonzero(lengths > 0)
+        starts = self.offsets[:-1][nonempty]
+        ends = self.offsets[1:][nonempty]
+
+        result = {machine_id: {"points": 0, "total_km": 0.0, "duration_s": 0.0, "mean_speed_kmh": 0.0,
+                               "max_speed_kmh": 0.0, "max_gap_s": 0.0}
+                  for machine_id in self.machine_ids}
+        if len(starts) == 0:
+            return result
+
+        total_km = np.add.reduceat(self.distance_km, starts)
+        max_speed = np.maximum.reduceat(self.speed_kmh, starts)
+        max_gap = np.maximum.reduceat(self.gap_s, starts)
+        duration = self.timestamp[ends - 1] - self.timestamp[starts]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_speed = np.where(duration > 0, total_km / duration * 3600, 0.0)
+
+        for i, k in enumerate(nonempty):
+            result[self.machine_ids[k]] = {
+                "points": int(lengths[k]),
+                "total_km": float(total_km[i]),
+                "duration_s": float(duration[i]),
+                "mean_speed_kmh": float(mean_speed[i]),
+                "max_speed_kmh": float(max_speed[i]),
+                "max_gap_s": float(max_gap[i])
+            }
+        return result
+
+
+def fleet_track_metrics(tracks: Dict[str, Track], sort: bool = True) -> FleetTrackMetrics:
+    """
+    Compute metrics for every track in one batched pass
+
+    Args:
+        tracks: {machine_id: (timestamps, latitudes, longitudes)}
+        sort: Sort each track by time first (tracks from the WebApp already are)
+
+    Returns:
+        FleetTrackMetrics
+    """
+    machine_ids = list(tracks)
+    lengths = np.array([len(tracks[m][0]) for m in machine_ids], dtype=np.int64)
+    offsets = np.zeros(len(machine_ids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(lengths)
+
+    def column(i: int) -> np.ndarray:
+        parts = [np.asarray(tracks[m][i], dtype=float) for m in machine_ids]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    timestamp, latitude, longitude = column(0), column(1), column(2)
+    if sort and len(timestamp):
+        owner = np.repeat(np.arange(len(machine_ids)), lengths)
+        order = np.lexsort((timestamp, owner))
+        timestamp, latitude, longitude = timestamp[order], latitude[order], longitude[order]
+
+    return FleetTrackMetrics(machine_ids, offsets, timestamp, latitude, longitude)
+
+
+def track_from_records(records: List[Dict[str, Any]]) -> Track:
+    """
+    Track arrays from read-schema data points
+    """
+    timestamp = np.fromiter((parse_timestamp(r.get("timestamp")) for r in records), dtype=float, count=len(records))
+    latitude = np.fromiter((r.get("latitude") or 0.0 for r in records), dtype=float, count=len(records))
+    longitude = np.fromiter((r.get("longitude") or 0.0 for r in records), dtype=float, count=len(records))
+    return timestamp, latitude, longitude
+
+
+def tracks_from_response(result: Dict[str, Any]) -> Dict[str, Track]:
+    """
+    Tracks from a getAllMachines or getMachine response
+    """
+    if isinstance(result.get("data"), list):
+        return {result.get("machineId"): track_from_records(result["data"])}
+    return {m["machineId"]: track_from_records(m.get("data", [])) for m in result.get("machines") or []}
+
+
+def tracks_from_cache(cache: TelemetryCache) -> Dict[str, Track]:
+    """
+    Tracks from a local columnar cache (zero-copy views of its columns)
+    """
+    tracks = {}
+    for machine_id, track in cache.load_all().items():
+        columns = track.as_numpy()
+        tracks[machine_id] = (columns["timestamp"], columns["latitude"], columns["longitude"])
+    return tracks
+
+
+def tracks_from_batches(batches: Dict[str, Any]) -> Dict[str, Track]:
+    """
+    Tracks from {machine_id: TelemetryBatch}
+    """
+    return {machine_id: (batch.timestamp, batch.latitude, batch.longitude) for machine_id, batch in batches.items()}
+
+
+def main():
+    import time
+
+    from gas_client import GASClient
+
+    parser = argparse.ArgumentParser(description="Fleet track analytics")
+    parser.add_argument("url", nargs="?", help="GAS WebApp URL (getAllMachines)")
+    parser.add_argument("--cache", help="Read tracks from a local telemetry cache instead")
+    parser.add_argument("--gap-minutes", type=float, default=10.0, help="Report gaps longer than this")
+
+    args = parser.parse_args()
+
+    if args.cache:
+        tracks = tracks_from_cache(TelemetryCache(args.cache))
+    elif args.url:
+        result = GASClient(args.url, user_agent="GAS-Track-Analytics/1.0").get_json("getAllMachines")
+        if result.get("status") != "success":
+            print(f"failed: {result.get('message')}")
+            return
+        tracks = tracks_from_response(result)
+    else:
+        parser.error("url or --cache is required")
+
+    start_time = time.perf_counter()
+    metrics = fleet_track_metrics(tracks)
+    summary = metrics.summary()
+    gaps = metrics.gaps(args.gap_minutes * 60)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{'Machine':<12} {'Points':>8} {'Distance(km)':>13} {'Hours':>7} {'Avg(km/h)':>10} "
+          f"{'Max(km/h)':>10} {'Max gap(min)':>13} {'Gaps':>5}")
+    for machine_id, stats in summary.items():
+        print(f"{machine_id:<12} {stats['points']:>8} {stats['total_km']:>13.2f} {stats['duration_s'] / 3600:>7.2f} "
+              f"{stats['mean_speed_kmh']:>10.1f} {stats['max_speed_kmh']:>10.1f} {stats['max_gap_s'] / 60:>13.1f} "
+              f"{len(gaps.get(machine_id, [])):>5}")
+    print(f"\n{len(metrics)} points from {len(summary)} machines analyzed in {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,10 @@ const CONFIG = {
   REMINDER_INTERVAL_MINUTES: parseInt(getScriptProperty('REMINDER_INTERVAL_MINUTES') || '10'), // Deprecated in v1.1.0 - no longer used
   ENABLE_NOTIFICATIONS: getScriptProperty('ENABLE_NOTIFICATIONS') === 'true',
   MAX_RETRY_COUNT: 3,
-  RETRY_DELAY_MS: 1000
+  RETRY_DELAY_MS: 1000,
+  IDEMPOTENCY_TTL_SECONDS: 21600, // CacheService maximum (6 hours)
+  WRITE_LOCK_TIMEOUT_MS: 10000, // Wait for the sheet write lock before answering a retryable error
+  MAX_PAGE_SIZE: 5000 // Rows per paginated getMachine response
 };
 
 /**
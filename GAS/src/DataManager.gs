@@ -7,6 +7,12 @@
  * @returns {Object} Save result
  */
 function saveToSpreadsheet(data) {
+  const idempotencyKey = data.IdempotencyKey;
+  // Every append to a machine sheet holds the script lock: saveBatchToSpreadsheet
+  // writes at getLastRow() + 1, which an unlocked appendRow could overwrite
+  const lock = LockService.getScriptLock();
+  let locked = false;
+
   try {
     const spreadsheet = SpreadsheetApp.getActiveSpreadsheet();
     const machineId = data.MachineID;
@@ -18,38 +24,52 @@ function saveToSpreadsheet(data) {
     // Determine sheet name based on MachineID
     const sheetName = `Machine_${machineId}`;
 
+    // Get GAS timestamp (same format as Machine Time)
+    const gasTimestamp = Utilities.formatDate(new Date(), "Asia/Tokyo", "yyyy/MM/dd H:mm:ss");
+    
+    // Convert data to row format
+    const rowData = buildRowData(data, gasTimestamp);
+
+    // Only the duplicate check, the append and remembering its row are serialized
+    acquireWriteLock(lock);
+    locked = true;
+
+    // Retried request: return the original result instead of appending again
+    if (idempotencyKey) {
+      const previous = getIdempotentResults([idempotencyKey])[idempotencyKey];
+      if (previous) {
+        console.log(`Duplicate request ignored: ${idempotencyKey}`);
+        return {
+          sheetName: previous.sheetName,
+          row: previous.row,
+          duplicate: true,
+        };
+      }
+    }
+
     // Get or create sheet
     let sheet = spreadsheet.getSheetByName(sheetName);
     if (!sheet) {
       sheet = createNewSheet(spreadsheet, sheetName);
     }
 
-    // Get GAS timestamp (same format as Machine Time)
-    const gasTimestamp = Utilities.formatDate(new Date(), "Asia/Tokyo", "yyyy/MM/dd H:mm:ss");
-    
-    // Convert data to row format
-    const rowData = [
-      gasTimestamp,      // GAS Time (YYYY/MM/DD H:MM:SS)
-      data.MachineTime,  // Machine Time
-      data.MachineID,
-      data.DataType,
-      data.GPS.LAT,
-      data.GPS.LNG,
-      data.GPS.ALT,
-      data.GPS.SAT,
-      data.BAT,
-      data.CMT,
-    ];
-
     // Add data row
     sheet.appendRow(rowData);
 
-    // Auto-resize columns
-    sheet.autoResizeColumns(1, 10);
-
     // Get added row number
     const lastRow = sheet.getLastRow();
 
+    if (idempotencyKey) {
+      rememberIdempotentResults({ [idempotencyKey]: { sheetName: sheetName, row: lastRow } });
+    }
+
+    SpreadsheetApp.flush();
+    lock.releaseLock();
+    locked = false;
+
+    // Auto-resize columns (cosmetic, outside the lock)
+    sheet.autoResizeColumns(1, 10);
+
     console.log(`Data saved to sheet: ${sheetName}, row: ${lastRow}`);
 
     return {
@@ -59,9 +79,186 @@ function saveToSpreadsheet(data) {
   } catch (error) {
     logError("saveToSpreadsheet", error);
     throw error;
+  } finally {
+    if (locked) {
+      lock.releaseLock();
+    }
   }
 }
 
+/**
+ * Convert telemetry data to sheet row format
+ * @param {Object} data - Telemetry data object
+ * @param {string} gasTimestamp - GAS receive time (yyyy/MM/dd H:mm:ss)
+ * @returns {Array} Row values (10 columns)
+ */
+function buildRowData(data, gasTimestamp) {
+  return [
+    gasTimestamp,      // GAS Time (YYYY/MM/DD H:MM:SS)
+    data.MachineTime,  // Machine Time
+    data.MachineID,
+    data.DataType,
+    data.GPS.LAT,
+    data.GPS.LNG,
+    data.GPS.ALT,
+    data.GPS.SAT,
+    data.BAT,
+    data.CMT,
+  ];
+}
+
+/**
+ * Save a batch of telemetry records with one write per machine sheet
+ * @param {Array} records - Telemetry data objects
+ * @returns {Object} Batch result with one entry per record (same order)
+ */
+function saveBatchToSpreadsheet(records) {
+  const results = new Array(records.length);
+  const keyIndexes = {};  // idempotency key -> index of its first record
+  const repeats = [];     // [index, first index] for keys repeated within the batch
+  const written = [];     // sheets appended to (resized after the lock is released)
+  const lock = LockService.getScriptLock();
+
+  try {
+    const spreadsheet = SpreadsheetApp.getActiveSpreadsheet();
+    const gasTimestamp = Utilities.formatDate(new Date(), "Asia/Tokyo", "yyyy/MM/dd H:mm:ss");
+
+    // Group valid records by sheet, keeping request order within each sheet
+    const groups = {};
+    records.forEach((data, index) => {
+      if (!data || !isValidMachineId(data.MachineID)) {
+        results[index] = {
+          index: index,
+          status: "error",
+          message: `Invalid machine ID: ${data ? data.MachineID : data}`
+        };
+        return;
+      }
+      if (!data.GPS) {
+        results[index] = { index: index, status: "error", message: "GPS data is required" };
+        return;
+      }
+
+      const key = data.IdempotencyKey;
+      if (key && keyIndexes[key] !== undefined) {
+        repeats.push([index, keyIndexes[key]]);
+        return;
+      }
+      if (key) {
+        keyIndexes[key] = index;
+      }
+
+      const sheetName = `Machine_${data.MachineID}`;
+      if (!groups[sheetName]) {
+        groups[sheetName] = { indexes: [], rows: [] };
+      }
+      groups[sheetName].indexes.push(index);
+      groups[sheetName].rows.push(buildRowData(data, gasTimestamp));
+    });
+
+    // Row numbers are computed from getLastRow; every other writer to a machine
+    // sheet (saveToSpreadsheet, registerMachine) appends under this lock too
+    acquireWriteLock(lock);
+
+    // Records saved by an earlier attempt are answered from the cache, not appended
+    const previous = getIdempotentResults(Object.keys(keyIndexes));
+    Object.keys(previous).forEach((key) => {
+      const index = keyIndexes[key];
+      results[index] = {
+        index: index,
+        status: "success",
+        sheetName: previous[key].sheetName,
+        rowNumber: previous[key].row,
+        duplicate: true
+      };
+    });
+
+    const saved = {};
+    Object.keys(groups).forEach((sheetName) => {
+      const group = groups[sheetName];
+      const pending = group.indexes
+        .map((index, i) => ({ index: index, row: group.rows[i] }))
+        .filter((entry) => !results[entry.index]);
+      group.indexes = pending.map((entry) => entry.index);
+      group.rows = pending.map((entry) => entry.row);
+      if (group.rows.length === 0) {
+        return;
+      }
+
+      try {
+        let sheet = spreadsheet.getSheetByName(sheetName);
+        if (!sheet) {
+          sheet = createNewSheet(spreadsheet, sheetName);
+        }
+
+        const firstRow = sheet.getLastRow() + 1;
+        sheet.getRange(firstRow, 1, group.rows.length, 10).setValues(group.rows);
+        written.push(sheet);
+
+        group.indexes.forEach((index, i) => {
+          results[index] = {
+            index: index,
+            status: "success",
+            sheetName: sheetName,
+            rowNumber: firstRow + i
+          };
+          if (records[index].IdempotencyKey) {
+            saved[records[index].IdempotencyKey] = { sheetName: sheetName, row: firstRow + i };
+          }
+        });
+
+        console.log(`Batch saved to sheet: ${sheetName}, rows: ${firstRow}-${firstRow + group.rows.length - 1}`);
+      } catch (error) {
+        logError(`saveBatchToSpreadsheet-${sheetName}`, error);
+        group.indexes.forEach((index) => {
+          results[index] = { index: index, status: "error", message: error.toString() };
+        });
+      }
+    });
+
+    rememberIdempotentResults(saved);
+    // Commit the writes before another execution reads getLastRow
+    SpreadsheetApp.flush();
+  } catch (error) {
+    logError("saveBatchToSpreadsheet", error);
+    for (let i = 0; i < results.length; i++) {
+      if (!results[i]) {
+        results[i] = { index: i, status: "error", message: error.toString() };
+      }
+    }
+  } finally {
+    lock.releaseLock();
+  }
+
+  // Auto-resize columns (cosmetic, outside the lock)
+  written.forEach((sheet) => {
+    try {
+      sheet.autoResizeColumns(1, 10);
+    } catch (error) {
+      logError("saveBatchToSpreadsheet-autoResize", error);
+    }
+  });
+
+  // Records repeating a key earlier in the same batch share its result
+  repeats.forEach(([index, firstIndex]) => {
+    const first = results[firstIndex];
+    results[index] = first.status === "success"
+      ? Object.assign({}, first, { index: index, duplicate: true })
+      : Object.assign({}, first, { index: index });
+  });
+
+  const savedCount = results.filter((r) => r.status === "success").length;
+
+  return {
+    status: savedCount === records.length ? "success" : (savedCount > 0 ? "partial" : "error"),
+    message: `Saved ${savedCount}/${records.length} records`,
+    savedCount: savedCount,
+    errorCount: records.length - savedCount,
+    results: results,
+    timestamp: new Date().toISOString()
+  };
+}
+
 /**
  * Create new machine sheet with headers and active status
  * @param {Spreadsheet} spreadsheet - Target spreadsheet
@@ -125,6 +322,8 @@ function createNewSheet(spreadsheet, sheetName) {
  * @returns {Object} Registration result
  */
 function registerMachine(data) {
+  const lock = LockService.getScriptLock();
+
   try {
     const spreadsheet = SpreadsheetApp.getActiveSpreadsheet();
     const machineId = data.MachineID;
@@ -139,6 +338,9 @@ function registerMachine(data) {
     // Determine sheet name based on MachineID
     const sheetName = `Machine_${machineId}`;
     
+    // Same lock as the telemetry writers (the metadata row is appended)
+    acquireWriteLock(lock);
+
     // Check if sheet already exists
     let sheet = spreadsheet.getSheetByName(sheetName);
     if (sheet) {
@@ -154,20 +356,9 @@ function registerMachine(data) {
     
     // Record metadata if provided
     if (data.metadata) {
-      const metadataRow = [
-        Utilities.formatDate(new Date(), "Asia/Tokyo", "yyyy/MM/dd H:mm:ss"),  // GAS Time
-        Utilities.formatDate(new Date(), "Asia/Tokyo", "yyyy/MM/dd H:mm:ss"),  // Machine Time
-        machineId,
-        "REGISTRATION",
-        0, // Latitude
-        0, // Longitude
-        0, // Altitude
-        0, // Satellites
-        0, // Battery
-        JSON.stringify(data.metadata)
-      ];
-      sheet.appendRow(metadataRow);
+      sheet.appendRow(buildMetadataRow(machineId, data.metadata));
     }
+    SpreadsheetApp.flush();
     
     return {
       status: "success",
@@ -183,19 +374,149 @@ function registerMachine(data) {
       status: "error",
       message: error.toString()
     };
+  } finally {
+    lock.releaseLock();
   }
 }
 
+/**
+ * Build the REGISTRATION row recorded for machine metadata
+ * @param {string} machineId - Machine ID
+ * @param {Object} metadata - Registration metadata
+ * @returns {Array} Row values (10 columns)
+ */
+function buildMetadataRow(machineId, metadata) {
+  const now = Utilities.formatDate(new Date(), "Asia/Tokyo", "yyyy/MM/dd H:mm:ss");
+  return [
+    now,  // GAS Time
+    now,  // Machine Time
+    machineId,
+    "REGISTRATION",
+    0, // Latitude
+    0, // Longitude
+    0, // Altitude
+    0, // Satellites
+    0, // Battery
+    JSON.stringify(metadata)
+  ];
+}
+
+/**
+ * Register several machines in one request
+ * @param {Object} data - {machines: [{MachineID, metadata}]}
+ * @returns {Object} Bulk result with one entry per machine (same order)
+ */
+function registerMachines(data) {
+  const machines = Array.isArray(data.machines) ? data.machines : [];
+  const results = new Array(machines.length);
+  const startTime = new Date();
+  const lock = LockService.getScriptLock();
+
+  try {
+    const spreadsheet = SpreadsheetApp.getActiveSpreadsheet();
+
+    // One sheet listing instead of a getSheetByName lookup per machine
+    acquireWriteLock(lock);
+    const existing = {};
+    spreadsheet.getSheets().forEach((sheet) => {
+      existing[sheet.getName()] = true;
+    });
+
+    machines.forEach((machine, index) => {
+      const machineId = machine ? machine.MachineID : undefined;
+
+      if (!machineId || !isValidMachineId(machineId)) {
+        results[index] = { index: index, machineId: machineId, status: "error", message: "Valid MachineID is required" };
+        return;
+      }
+
+      const sheetName = `Machine_${machineId}`;
+      if (existing[sheetName]) {
+        results[index] = {
+          index: index,
+          machineId: machineId,
+          status: "error",
+          message: `Machine ${machineId} already exists`,
+          sheetName: sheetName
+        };
+        return;
+      }
+
+      // Leave the rest for a follow-up request rather than hitting the execution limit
+      if (isApproachingTimeLimit(startTime)) {
+        results[index] = {
+          index: index,
+          machineId: machineId,
+          status: "error",
+          message: "Execution time limit approaching, retry this machine"
+        };
+        return;
+      }
+
+      try {
+        const sheet = createNewSheet(spreadsheet, sheetName);
+        if (machine.metadata) {
+          sheet.appendRow(buildMetadataRow(machineId, machine.metadata));
+        }
+        existing[sheetName] = true;
+        results[index] = {
+          index: index,
+          machineId: machineId,
+          status: "success",
+          sheetName: sheetName,
+          registeredAt: new Date().toISOString()
+        };
+      } catch (error) {
+        logError(`registerMachines-${machineId}`, error);
+        results[index] = { index: index, machineId: machineId, status: "error", message: error.toString() };
+      }
+    });
+    SpreadsheetApp.flush();
+  } catch (error) {
+    logError("registerMachines", error);
+    for (let i = 0; i < results.length; i++) {
+      if (!results[i]) {
+        results[i] = { index: i, status: "error", message: error.toString() };
+      }
+    }
+  } finally {
+    lock.releaseLock();
+  }
+
+  const registeredCount = results.filter((r) => r.status === "success").length;
+
+  return {
+    status: registeredCount === machines.length ? "success" : (registeredCount > 0 ? "partial" : "error"),
+    message: `Registered ${registeredCount}/${machines.length} machines`,
+    registeredCount: registeredCount,
+    errorCount: machines.length - registeredCount,
+    results: results,
+    timestamp: new Date().toISOString()
+  };
+}
+
 /**
  * Get all machine data
+ * @param {Object} options - Options
+ * @param {string} options.fingerprint - Fingerprint from a previous response; when it still matches, only notModified is returned
  * @returns {ContentService.TextOutput} All machine data response
  */
-function getAllMachinesData() {
+function getAllMachinesData(options = {}) {
   try {
     const spreadsheet = SpreadsheetApp.getActiveSpreadsheet();
     const sheets = spreadsheet.getSheets();
     const machines = [];
 
+    // Computed before the rows are read, so rows appended meanwhile only make the next poll re-fetch
+    const state = computeMachinesFingerprint(sheets);
+    if (options.fingerprint && options.fingerprint === state.fingerprint) {
+      return createSuccessResponse({
+        notModified: true,
+        fingerprint: state.fingerprint,
+        timestamp: new Date().toISOString(),
+      });
+    }
+
     // Process each sheet (only Machine_ prefixed sheets)
     sheets.forEach((sheet) => {
       const sheetName = sheet.getName();
@@ -216,6 +537,8 @@ function getAllMachinesData() {
     return createSuccessResponse({
       machines: machines,
       totalMachines: machines.length,
+      fingerprint: state.fingerprint,
+      lastRows: state.lastRows,
       timestamp: new Date().toISOString(),
     });
   } catch (error) {
@@ -224,12 +547,50 @@ function getAllMachinesData() {
   }
 }
 
+/**
+ * Fingerprint the getAllMachines payload without reading any data rows
+ * Machine sheets are append-only through the WebApp, so each sheet's last
+ * row and K1 active flag identify its contribution to the payload.
+ * @param {Sheet[]} sheets - Spreadsheet sheets
+ * @returns {Object} {fingerprint, lastRows: {machineId: lastRow}}
+ */
+function computeMachinesFingerprint(sheets) {
+  const lastRows = {};
+  const parts = [];
+
+  sheets.forEach((sheet) => {
+    const sheetName = sheet.getName();
+    if (sheetName.startsWith("Machine_")) {
+      const machineId = sheetName.replace("Machine_", "");
+      const lastRow = sheet.getLastRow();
+      lastRows[machineId] = lastRow;
+      parts.push(`${machineId}:${lastRow}:${getMachineActiveStatus(sheet)}`);
+    }
+  });
+
+  const digest = Utilities.computeDigest(
+    Utilities.DigestAlgorithm.MD5,
+    parts.join("|"),
+    Utilities.Charset.UTF_8
+  );
+  return {
+    fingerprint: Utilities.base64EncodeWebSafe(digest),
+    lastRows: lastRows,
+  };
+}
+
 /**
  * Get specific machine data
  * @param {string} machineId - Machine ID
+ * @param {Object} options - Optional cursor {sinceRow, since, untilRow} and page {offset, limit}
+ *   sinceRow: return only rows after this sheet row number
+ *   since: return only rows whose GAS Time is after this ISO timestamp
+ *   untilRow: ignore rows after this sheet row number (snapshot of an earlier page)
+ *   offset: rows to skip after the cursor (pagination)
+ *   limit: rows per page (at most CONFIG.MAX_PAGE_SIZE)
  * @returns {ContentService.TextOutput} Machine data response
  */
-function getMachineData(machineId) {
+function getMachineData(machineId, options = {}) {
   try {
     if (!isValidMachineId(machineId)) {
       throw new Error(`Invalid machine ID: ${machineId}`);
@@ -243,13 +604,65 @@ function getMachineData(machineId) {
       throw new Error(`Machine ${machineId} not found`);
     }
 
-    const machineData = getMachineDataFromSheet(sheet);
+    // Last row is fixed before reading so it can be used as the next cursor
+    let lastRow = sheet.getLastRow();
+    if (isSet(options.untilRow)) {
+      const untilRow = parseInt(options.untilRow);
+      if (isNaN(untilRow) || untilRow < 1) {
+        throw new Error(`Invalid untilRow: ${options.untilRow}`);
+      }
+      lastRow = Math.min(lastRow, untilRow);
+    }
+    let startRow = 2;
+
+    if (isSet(options.sinceRow)) {
+      const sinceRow = parseInt(options.sinceRow);
+      if (isNaN(sinceRow) || sinceRow < 1) {
+        throw new Error(`Invalid sinceRow: ${options.sinceRow}`);
+      }
+      startRow = sinceRow + 1;
+    } else if (options.since) {
+      const since = new Date(options.since);
+      if (isNaN(since.getTime())) {
+        throw new Error(`Invalid since timestamp: ${options.since}`);
+      }
+      startRow = findFirstRowAfter(sheet, since, lastRow);
+    }
+
+    // offset/limit page over the rows after the cursor (offset counts sheet rows, not returned points)
+    let page = null;
+    let endRow = lastRow;
+    if (isSet(options.offset) || isSet(options.limit)) {
+      const offset = isSet(options.offset) ? parseInt(options.offset) : 0;
+      const limit = isSet(options.limit) ? parseInt(options.limit) : CONFIG.MAX_PAGE_SIZE;
+      if (isNaN(offset) || offset < 0) {
+        throw new Error(`Invalid offset: ${options.offset}`);
+      }
+      if (isNaN(limit) || limit < 1) {
+        throw new Error(`Invalid limit: ${options.limit}`);
+      }
+
+      const pageSize = Math.min(limit, CONFIG.MAX_PAGE_SIZE);
+      const totalRows = Math.max(lastRow - Math.max(startRow, 2) + 1, 0);
+      startRow = Math.max(startRow, 2) + offset;
+      endRow = Math.min(lastRow, startRow + pageSize - 1);
+      page = {
+        offset: offset,
+        limit: pageSize,
+        totalRows: totalRows,
+        nextOffset: offset + pageSize < totalRows ? offset + pageSize : null,
+      };
+    }
+
+    const machineData = getMachineDataFromSheet(sheet, startRow, endRow);
 
     return createSuccessResponse({
       machineId: machineId,
       data: machineData,
       dataCount: machineData.length,
       isActive: getMachineActiveStatus(sheet),
+      lastRow: lastRow,
+      ...page,
       timestamp: new Date().toISOString(),
     });
   } catch (error) {
@@ -258,6 +671,37 @@ function getMachineData(machineId) {
   }
 }
 
+/**
+ * Find the first row whose GAS Time is after a given time
+ * Rows are appended in receive order, so column A is non-decreasing and
+ * only that column is read (binary search in memory).
+ * @param {Sheet} sheet - Target sheet
+ * @param {Date} since - Exclusive lower bound
+ * @param {number} lastRow - Last row to consider
+ * @returns {number} Row number (lastRow + 1 if no row is newer)
+ */
+function findFirstRowAfter(sheet, since, lastRow) {
+  if (lastRow <= 1) {
+    return 2;
+  }
+
+  const times = sheet.getRange(2, 1, lastRow - 1, 1).getValues();
+  const sinceTime = since.getTime();
+  let low = 0;
+  let high = times.length;
+
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (new Date(times[mid][0]).getTime() > sinceTime) {
+      high = mid;
+    } else {
+      low = mid + 1;
+    }
+  }
+
+  return low + 2;
+}
+
 /**
  * Get machine list
  * @returns {ContentService.TextOutput} Machine list response
@@ -299,17 +743,19 @@ function getMachineList() {
 /**
  * Get machine data from specific sheet
  * @param {Sheet} sheet - Target sheet
+ * @param {number} startRow - First row to read (default: 2, first data row)
+ * @param {number} lastRow - Last row to read (default: sheet.getLastRow())
  * @returns {Array} Machine data array
  */
-function getMachineDataFromSheet(sheet) {
+function getMachineDataFromSheet(sheet, startRow = 2, lastRow = sheet.getLastRow()) {
   try {
-    const lastRow = sheet.getLastRow();
-    if (lastRow <= 1) {
-      return []; // Header only or empty sheet
+    startRow = Math.max(startRow, 2);
+    if (lastRow < startRow) {
+      return []; // Header only, empty sheet or no rows after the cursor
     }
 
     // Get data range (excluding header row)
-    const dataRange = sheet.getRange(2, 1, lastRow - 1, 10); // 10 columns of data
+    const dataRange = sheet.getRange(startRow, 1, lastRow - startRow + 1, 10); // 10 columns of data
     const values = dataRange.getValues();
 
     const machineData = [];
@@ -14,14 +14,20 @@ function doGet(e) {
 
     switch (action) {
       case "getAllMachines":
-        return getAllMachinesData();
+        return getAllMachinesData({ fingerprint: e.parameter.fingerprint });
 
       case "getMachine":
         const machineId = e.parameter.machineId;
         if (!machineId) {
           throw new Error("Machine ID is required");
         }
-        return getMachineData(machineId);
+        return getMachineData(machineId, {
+          sinceRow: e.parameter.sinceRow,
+          since: e.parameter.since,
+          untilRow: e.parameter.untilRow,
+          offset: e.parameter.offset,
+          limit: e.parameter.limit,
+        });
 
       case "getMachineList":
         return getMachineList();
@@ -58,12 +64,24 @@ function doPost(e) {
     const data = JSON.parse(e.postData.contents);
 
     // Check action type
-    if (data.action === "registerMachine") {
+    if (Array.isArray(data)) {
+      // Batched telemetry data save (one result per record)
+      const result = saveBatchToSpreadsheet(data);
+      return ContentService.createTextOutput(
+        JSON.stringify(result)
+      ).setMimeType(ContentService.MimeType.JSON);
+    } else if (data.action === "registerMachine") {
       // Machine registration
       const result = registerMachine(data);
       return ContentService.createTextOutput(
         JSON.stringify(result)
       ).setMimeType(ContentService.MimeType.JSON);
+    } else if (data.action === "registerMachines") {
+      // Bulk machine registration (one result per machine)
+      const result = registerMachines(data);
+      return ContentService.createTextOutput(
+        JSON.stringify(result)
+      ).setMimeType(ContentService.MimeType.JSON);
     } else if (data.action === "setActiveStatus") {
       // Set machine active status
       const result = setMachineActiveStatus(data.machineId, data.isActive);
@@ -96,23 +114,32 @@ function doPost(e) {
       const result = saveToSpreadsheet(data);
 
       // Return response
+      const response = {
+        status: "success",
+        message: result.duplicate ? "Duplicate request ignored" : "Data saved successfully",
+        rowNumber: result.row,
+        sheetName: result.sheetName,
+      };
+      if (result.duplicate) {
+        response.duplicate = true;
+      }
       return ContentService.createTextOutput(
-        JSON.stringify({
-          status: "success",
-          message: "Data saved successfully",
-          rowNumber: result.row,
-          sheetName: result.sheetName,
-        })
+        JSON.stringify(response)
       ).setMimeType(ContentService.MimeType.JSON);
     }
   } catch (error) {
     console.error("doPost Error:", error.toString());
 
+    const response = {
+      status: "error",
+      message: error.toString(),
+    };
+    if (isLockTimeout(error)) {
+      // Nothing was written; the client may resend the same request
+      response.retryable = true;
+    }
     return ContentService.createTextOutput(
-      JSON.stringify({
-        status: "error",
-        message: error.toString(),
-      })
+      JSON.stringify(response)
     ).setMimeType(ContentService.MimeType.JSON);
   }
 }
@@ -256,6 +256,88 @@ function isValidMachineId(machineId) {
   return /^[a-zA-Z0-9_-]{1,20}$/.test(machineId);
 }
 
+/**
+ * Check whether an optional query parameter was given
+ * @param {*} value - Parameter value
+ * @returns {boolean} True unless undefined, null or empty string
+ */
+function isSet(value) {
+  return value !== undefined && value !== null && value !== "";
+}
+
+/**
+ * Build the CacheService key for a client idempotency key
+ * @param {string} idempotencyKey - Client key (MachineID:MachineTime:sequence)
+ * @returns {string} Cache key (at most 250 characters)
+ */
+function idempotencyCacheKey(idempotencyKey) {
+  const key = `idem:${idempotencyKey}`;
+  if (key.length <= 250) {
+    return key;
+  }
+  const digest = Utilities.computeDigest(Utilities.DigestAlgorithm.SHA_256, idempotencyKey);
+  return `idem:${Utilities.base64Encode(digest)}`;
+}
+
+/**
+ * Look up save results of already-saved telemetry records (no sheet access)
+ * @param {Array<string>} idempotencyKeys - Client idempotency keys
+ * @returns {Object} Map of idempotency key to {sheetName, row}
+ */
+function getIdempotentResults(idempotencyKeys) {
+  if (idempotencyKeys.length === 0) {
+    return {};
+  }
+  const cached = CacheService.getScriptCache().getAll(idempotencyKeys.map(idempotencyCacheKey));
+  const results = {};
+  idempotencyKeys.forEach((idempotencyKey) => {
+    const value = cached[idempotencyCacheKey(idempotencyKey)];
+    if (value) {
+      results[idempotencyKey] = JSON.parse(value);
+    }
+  });
+  return results;
+}
+
+/**
+ * Remember save results so retried records are not appended twice
+ * @param {Object} results - Map of idempotency key to {sheetName, row}
+ */
+function rememberIdempotentResults(results) {
+  const values = {};
+  Object.keys(results).forEach((idempotencyKey) => {
+    values[idempotencyCacheKey(idempotencyKey)] = JSON.stringify(results[idempotencyKey]);
+  });
+  if (Object.keys(values).length > 0) {
+    CacheService.getScriptCache().putAll(values, CONFIG.IDEMPOTENCY_TTL_SECONDS);
+  }
+}
+
+/**
+ * Message of the error thrown when the sheet write lock is busy (retryable)
+ */
+const LOCK_TIMEOUT_MESSAGE = "Lock timeout";
+
+/**
+ * Acquire the script lock that serializes machine sheet writes
+ * @param {Lock} lock - Lock from LockService.getScriptLock()
+ * @throws {Error} LOCK_TIMEOUT_MESSAGE when the lock is not free within CONFIG.WRITE_LOCK_TIMEOUT_MS
+ */
+function acquireWriteLock(lock) {
+  if (!lock.tryLock(CONFIG.WRITE_LOCK_TIMEOUT_MS)) {
+    throw new Error(`${LOCK_TIMEOUT_MESSAGE}: sheet write lock busy for ${CONFIG.WRITE_LOCK_TIMEOUT_MS}ms`);
+  }
+}
+
+/**
+ * Check if an error is a write lock timeout (safe to retry)
+ * @param {Error} error - Caught error
+ * @returns {boolean} True if the lock was not acquired
+ */
+function isLockTimeout(error) {
+  return String(error).indexOf(LOCK_TIMEOUT_MESSAGE) !== -1;
+}
+
 /**
  * Check if execution time is approaching limit
  * @param {Date} startTime - Function start time
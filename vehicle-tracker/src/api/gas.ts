@@ -55,8 +55,18 @@ async function fetchGAS<T>(action: string, params: Record<string, string> = {}):
   }
 }
 
+// Fingerprint and tracks of the last full getAllMachines response
+let lastFingerprint: string | null = null;
+let lastTracks: MachineTracks | null = null;
+
 export async function getAllMachines(): Promise<MachineTracks> {
-  const response = await fetchGAS<{ machines: MachineData[] }>('getAllMachines');
+  const params: Record<string, string> = lastFingerprint && lastTracks ? { fingerprint: lastFingerprint } : {};
+  const response = await fetchGAS<{ machines: MachineData[] }>('getAllMachines', params);
+
+  // Nothing changed since the last poll: reuse the same object so nothing re-renders
+  if (response.notModified && lastTracks) {
+    return lastTracks;
+  }
   
   const tracks: MachineTracks = {};
   
@@ -66,6 +76,8 @@ export async function getAllMachines(): Promise<MachineTracks> {
     });
   }
   
+  lastFingerprint = response.fingerprint ?? null;
+  lastTracks = tracks;
   return tracks;
 }
 
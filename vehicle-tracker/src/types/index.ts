@@ -41,6 +41,9 @@ export interface GASResponse {
   machineId?: string;
   data?: TelemetryDataPoint[];
   dataCount?: number;
+  fingerprint?: string;
+  notModified?: boolean;
+  lastRows?: Record<string, number>;
 }
 
 export interface ConnectionStatus {